@@ -0,0 +1,56 @@
+"""Rapid quantity edits on a 10k-row catalog: old full rescan vs the Basket running total.
+
+Runs without a database (rows are generated in memory) on the offscreen Qt platform:
+    python -m benchmarks.basket_benchmark --rows 10000 --edits 20000
+"""
+import argparse
+import os
+import random
+import time
+from decimal import Decimal
+
+def rescan_total(rows, quantities):
+    # dating calculate_total: float() ng price text ng bawat row sa bawat edit
+    total = 0
+    for product_id, _, price_text, _ in rows:
+        total += float(price_text) * quantities.get(product_id, 0)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--edits", type=int, default=20_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from controls.product_table_model import OrderTableModel
+
+    app = QApplication([])
+    rows = [(i, f"Product {i}", Decimal(random.randrange(100, 100_000)) / 100, 1_000) for i in range(1, args.rows + 1)]
+    edits = [(random.randrange(args.rows), random.randrange(0, 50)) for _ in range(args.edits)]
+
+    text_rows = [(pid, name, str(price), stock) for pid, name, price, stock in rows]
+    quantities = {}
+    t0 = time.perf_counter()
+    for row, quantity in edits:
+        quantities[text_rows[row][0]] = quantity
+        rescan_total(text_rows, quantities)
+    rescan = time.perf_counter() - t0
+
+    model = OrderTableModel(db=None, user_id=0)
+    model.rows = rows
+    model.exhausted = True  # naka-load na lahat, walang database
+    t0 = time.perf_counter()
+    for row, quantity in edits:
+        model.setData(model.index(row, OrderTableModel.QUANTITY), quantity)
+        model.basket.total  # yung binabasa ng total label
+    incremental = time.perf_counter() - t0
+
+    print(f"{args.edits} edits on {args.rows} rows")
+    print(f"rescan:      {rescan / args.edits * 1e6:9.1f} us/edit")
+    print(f"basket/model:{incremental / args.edits * 1e6:9.1f} us/edit ({rescan / incremental:.0f}x faster)")
+    app.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Applying 1k price changes in Show Products: one UPDATE + full reload each vs one batched save.
+
+    python -m benchmarks.batch_edit_benchmark --database dailysales_bench --products 10000 --changes 1000
+"""
+import os
+import random
+import time
+from decimal import Decimal
+from benchmarks.common import bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user
+from db.catalog_cache import catalog_cache
+from db.product_repository import ProductRepository
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--changes", type=int, default=1000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QTableView
+    from controls.product_table_model import EditableProductTableModel
+
+    app = QApplication([])
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        seed_products(db, user_id, args.products)
+        model = EditableProductTableModel(db, user_id)
+        view = QTableView()
+        view.setModel(model)
+        view.resize(640, 400)
+        view.show()
+        while model.canFetchMore() and model.rowCount() < args.changes:
+            model.fetchMore()
+        rows = random.sample(range(model.rowCount()), min(args.changes, model.rowCount()))
+        products = ProductRepository(db)
+
+        #dati: isang transaction at buong reload ng table kada click
+        start = time.perf_counter()
+        for row in rows:
+            product_id = model.product_id(row)
+            price = Decimal(random.randrange(100, 100_000)) / 100
+            products.update_price(user_id, product_id, price)
+            catalog_cache.update_product(user_id, product_id, price=price)
+            model.reload()
+            while model.canFetchMore() and model.rowCount() <= row:
+                model.fetchMore()
+            app.processEvents()
+        one_by_one = time.perf_counter() - start
+
+        #ngayon: pending edits, isang executemany sa isang transaction, in-place na refresh
+        resets = []
+        model.modelReset.connect(lambda: resets.append(1))
+        start = time.perf_counter()
+        for row in rows:
+            model.setData(model.index(row, model.PRICE), random.randrange(100, 100_000) / 100)
+        staged = time.perf_counter() - start
+        saved = model.save_changes()
+        app.processEvents()
+        batched = time.perf_counter() - start
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+    print(f"one by one: {len(rows)} changes in {one_by_one * 1000:.0f} ms")
+    print(f"batched:    {saved} changes in {batched * 1000:.0f} ms "
+          f"({staged * 1000:.0f} ms editing, {(batched - staged) * 1000:.0f} ms saving), {len(resets)} table resets")
+    print(f"speedup:    {one_by_one / batched:.1f}x")
+    app.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Catalog load from the database vs a warm catalog cache hit, plus write-through cost.
+
+    python -m benchmarks.catalog_cache_benchmark --database dailysales_bench --products 10000
+"""
+import time
+from benchmarks.common import bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user, summarize
+from db.catalog_cache import Catalog, CatalogCache
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        product_ids = seed_products(db, user_id, args.products)
+        cache = CatalogCache(max_users=1, ttl=3600)
+
+        loads = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            Catalog.load(db, user_id)
+            loads.append(time.perf_counter() - start)
+
+        cache.get(db, user_id)
+        hits = []
+        for _ in range(args.iterations * 100):
+            start = time.perf_counter()
+            cache.get(db, user_id)
+            hits.append(time.perf_counter() - start)
+
+        #write-through (gaya ng checkout) dapat hindi nagre-reload ng catalog
+        writes = []
+        for product_id in product_ids[:args.iterations * 100]:
+            start = time.perf_counter()
+            cache.adjust_stock(user_id, {product_id: -1})
+            writes.append(time.perf_counter() - start)
+        cache.get(db, user_id)
+
+        for name, samples in (("db load", loads), ("cache hit", hits), ("write-through", writes)):
+            stats = summarize(samples)
+            print(f"{name:>13}: mean {stats['mean_ms']:.3f} ms, p95 {stats['p95_ms']:.3f} ms ({stats['count']} samples)")
+        print(cache.stats())
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+if __name__ == "__main__":
+    main()
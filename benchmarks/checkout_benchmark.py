@@ -0,0 +1,43 @@
+"""Sales/sec of db.checkout for 1, 10 and 100-line baskets.
+
+Run from the repo root against a scratch copy of dailysales.sql:
+    python -m benchmarks.checkout_benchmark --database dailysales_bench --sales 200
+"""
+import time
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user, summarize
+)
+from db.checkout import checkout
+
+def run(db, user_id, product_ids, basket_size, sales):
+    latencies = []
+    start = time.perf_counter()
+    for sale in range(sales):
+        offset = (sale * basket_size) % len(product_ids)
+        basket = [(product_ids[(offset + i) % len(product_ids)], 1) for i in range(basket_size)]
+        t0 = time.perf_counter()
+        checkout(db, user_id, basket)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    return dict(summarize(latencies), basket_size=basket_size, sales_per_sec=sales / elapsed)
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--sales", type=int, default=200)
+    parser.add_argument("--products", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        product_ids = seed_products(db, user_id, args.products)
+        for basket_size in (1, 10, 100):
+            result = run(db, user_id, product_ids, basket_size, args.sales)
+            print(f"{basket_size:>3}-line basket: {result['sales_per_sec']:8.1f} sales/sec "
+                  f"(p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms)")
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+if __name__ == "__main__":
+    main()
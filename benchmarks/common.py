@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import statistics
+import time
+import uuid
+from db.config import db_config
+from db.db_functions import Database
+
+# shared helpers para sa benchmarks; gumamit ng hiwalay na database (default: dailysales_bench)
+# na galing sa dailysales.sql para hindi magalaw yung totoong data
+def bench_arg_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--host", default=db_config["host"])
+    parser.add_argument("--user", default=db_config["user"])
+    parser.add_argument("--password", default=db_config["password"])
+    parser.add_argument("--database", default="dailysales_bench")
+    return parser
+
+def bench_database(args, max_size=5):
+    config = dict(db_config, host=args.host, user=args.user, password=args.password, database=args.database)
+    return Database(config, {"min_size": 1, "max_size": max_size, "acquire_timeout": 30,
+                             "idle_timeout": 300, "health_check_interval": 30})
+
+def create_bench_user(db):
+    username = f"bench_{uuid.uuid4().hex[:12]}"
+    with db.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO user (name, username, password, gender) VALUES (?, ?, ?, ?)",
+            ("Benchmark", username, "x:00", "Other")
+        )
+        return cursor.lastrowid
+
+def seed_products(db, user_id, count, price="10.00", stock=1_000_000, batch_size=5000):
+    rows = [(f"Product {i:06d}", price, stock, user_id) for i in range(count)]
+    with db.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(
+                "INSERT INTO products (productName, price, stock, userId) VALUES (?, ?, ?, ?)",
+                rows[start:start + batch_size]
+            )
+        cursor.execute("SELECT productId FROM products WHERE userId = ? ORDER BY productId", (user_id,))
+        return [row[0] for row in cursor.fetchall()]
+
+def cleanup_user(db, user_id):
+    with db.cursor() as cursor:
+        cursor.execute("DELETE FROM orders WHERE userId = ?", (user_id,))  # cascade sa order_details
+        cursor.execute("DELETE FROM products WHERE userId = ?", (user_id,))
+        cursor.execute("DELETE FROM user WHERE userId = ?", (user_id,))
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def summarize(samples):
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+def seed_orders(db, user_id, orders, days=365, lines_per_order=1, end_date=None):
+    # bulk insert gamit yung Sequence engine ng MariaDB (seq_1_to_N), walang Python loop
+    end_date = end_date or time.strftime("%Y-%m-%d 23:59:59")
+    with db.cursor() as cursor:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS bench_products")
+        cursor.execute("""
+            CREATE TEMPORARY TABLE bench_products (PRIMARY KEY (n))
+            SELECT ROW_NUMBER() OVER (ORDER BY productId) - 1 AS n, productId, price, purchasePrice
+            FROM products WHERE userId = ?
+        """, (user_id,))
+        cursor.execute("SELECT COUNT(*) FROM bench_products")
+        product_count = cursor.fetchone()[0]
+        if not product_count:
+            raise ValueError("Seed products for the user before seeding orders.")
+
+        cursor.execute(f"""
+            INSERT INTO orders (userId, totalPrice, totalMoney, changeAmount, orderDateTime)
+            SELECT ?, 0.00, 0.00, 0.00,
+                   CAST(? AS DATETIME) - INTERVAL (seq % ?) DAY - INTERVAL (seq % 86400) SECOND
+            FROM seq_1_to_{int(orders)}
+        """, (user_id, end_date, days))
+
+        cursor.execute(f"""
+            INSERT INTO order_details (orderId, productId, quantity, totalPrice, unitCost)
+            SELECT o.orderId, bp.productId, 1 + (o.orderId % 3), bp.price * (1 + (o.orderId % 3)), bp.purchasePrice
+            FROM orders o
+            JOIN seq_0_to_{max(0, int(lines_per_order) - 1)} s
+            JOIN bench_products bp ON bp.n = (o.orderId + s.seq) % ?
+            WHERE o.userId = ?
+        """, (product_count, user_id))
+
+        cursor.execute("""
+            UPDATE orders o
+            JOIN (SELECT orderId, SUM(totalPrice) AS total FROM order_details GROUP BY orderId) t
+              ON t.orderId = o.orderId
+            SET o.totalPrice = t.total, o.totalMoney = t.total
+            WHERE o.userId = ?
+        """, (user_id,))
+        cursor.execute("DROP TEMPORARY TABLE bench_products")
+
+def check_baseline(result, path, tolerance=0.25, update=False):
+    # result: {name: ms}; mas mataas = mas mabagal. Nagbabalik ng listahan ng regressions.
+    if update or not os.path.exists(path):
+        baseline = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                baseline = json.load(f)  # papalitan lang yung mga sinukat ngayon
+        baseline.update(result)
+        with open(path, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {path}")
+        return []
+
+    with open(path) as f:
+        baseline = json.load(f)
+    failures = []
+    for key, value in result.items():
+        if key not in baseline:
+            print(f"  {key}: {value:.1f} (not in baseline)")
+            continue
+        limit = baseline[key] * (1 + tolerance)
+        status = "REGRESSION" if value > limit else "ok"
+        print(f"  {key}: {value:.1f} vs baseline {baseline[key]:.1f} (limit {limit:.1f}) {status}")
+        if value > limit:
+            failures.append(f"{key} regressed: {value:.1f} ms > {limit:.1f} ms")
+    return failures
@@ -0,0 +1,197 @@
+"""Several terminals selling the same products at once: throughput, latency, lock retries and stock checks.
+
+    python -m benchmarks.concurrency_load_test --database dailysales_bench --terminals 8 --sales 500
+
+Each terminal is its own process with its own connection pool, like separate
+tills on one store account. Baskets come from a few hot products with limited
+stock, so sales collide on the same rows and the stock runs out partway. After
+the run it checks that:
+  - no product stock went below zero,
+  - initial stock - quantity sold == final stock for every product,
+  - daily_sales_summary quantities match order_details,
+  - every order has lines and its total is the sum of its lines,
+  - the number of orders equals the sales the terminals reported, minus
+    journaled sales the flush marked failed.
+Exits 1 if any check fails.
+
+--mode journal sells through each terminal's own order journal, as tills do
+while the database is unreachable. Those sales are accepted against the
+terminal's catalog snapshot. When they are flushed, the ones that no longer
+fit the stock are marked failed instead of being written.
+"""
+import multiprocessing
+import os
+import queue
+import random
+import tempfile
+import time
+import mariadb
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user, percentile, summarize
+)
+from db.catalog_cache import catalog_cache
+from db.checkout import CheckoutError, checkout
+from db.order_journal import OrderJournal
+
+def terminal(args, index, user_id, product_ids, start_at, results):
+    rng = random.Random(args.seed + index)
+    db = bench_database(args, max_size=2)
+    journal = None
+    if args.mode == "journal":
+        journal = OrderJournal(db, os.path.join(args.journal_dir, f"terminal{index}.sqlite3"),
+                               batch_size=args.batch_size, flush_interval=0.2, max_backoff=2)
+        journal.start()
+
+    latencies = []
+    sold = rejected = 0
+    errors = []
+    time.sleep(max(0.0, start_at - time.time()))  # sabay-sabay magsimula lahat ng terminal
+    for _ in range(args.sales):
+        lines = rng.randint(1, min(args.lines, len(product_ids)))
+        items = [(product_id, rng.randint(1, 3)) for product_id in rng.sample(product_ids, lines)]
+        t0 = time.perf_counter()
+        try:
+            if journal is not None:
+                journal.record(user_id, items, catalog_cache.get(db, user_id))
+            else:
+                checkout(db, user_id, items)
+            sold += 1
+            latencies.append(time.perf_counter() - t0)
+        except CheckoutError:
+            rejected += 1  # ubos na yung stock; tama lang na tanggihan
+        except mariadb.Error as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    finished = time.time()
+
+    journal_stats = None
+    if journal is not None:
+        #hintayin ma-flush lahat bago i-check yung database
+        deadline = time.time() + args.drain_timeout
+        while journal.stats()["pending"] and time.time() < deadline:
+            time.sleep(0.1)
+        journal_stats = journal.stats()
+        journal.close()
+
+    results.put({
+        "latencies": latencies, "sold": sold, "rejected": rejected, "errors": errors,
+        "finished": finished, "db": db.stats(), "journal": journal_stats,
+    })
+    db.close()
+
+def check_stock(db, user_id, initial_stock, sold):
+    failures = []
+    with db.cursor() as cursor:
+        cursor.execute("""
+            SELECT p.productId, p.stock,
+                   (SELECT COALESCE(SUM(od.quantity), 0) FROM order_details od WHERE od.productId = p.productId),
+                   (SELECT COALESCE(SUM(s.quantity), 0) FROM daily_sales_summary s
+                    WHERE s.userId = p.userId AND s.productId = p.productId)
+            FROM products p WHERE p.userId = ?
+            ORDER BY p.productId
+        """, (user_id,))
+        for product_id, stock, quantity, summary_quantity in cursor.fetchall():
+            if stock < 0:
+                failures.append(f"product {product_id}: stock is {stock}")
+            if stock + quantity != initial_stock:
+                failures.append(f"product {product_id}: stock {stock} + sold {quantity} != initial {initial_stock}")
+            if summary_quantity != quantity:
+                failures.append(f"product {product_id}: daily_sales_summary has {summary_quantity}, order_details {quantity}")
+
+        cursor.execute("""
+            SELECT o.orderId, o.totalPrice, SUM(od.totalPrice)
+            FROM orders o LEFT JOIN order_details od ON od.orderId = o.orderId
+            WHERE o.userId = ?
+            GROUP BY o.orderId, o.totalPrice
+            HAVING SUM(od.totalPrice) IS NULL OR SUM(od.totalPrice) <> o.totalPrice
+        """, (user_id,))
+        for order_id, total, lines_total in cursor.fetchall():
+            failures.append(f"order {order_id}: total {total} but lines add up to {lines_total}")
+
+        cursor.execute("SELECT COUNT(*) FROM orders WHERE userId = ?", (user_id,))
+        orders = cursor.fetchone()[0]
+    if orders != sold:
+        failures.append(f"{orders} orders in the database but the terminals sold {sold}")
+    return failures
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--terminals", type=int, default=8)
+    parser.add_argument("--sales", type=int, default=500, help="sales per terminal")
+    parser.add_argument("--products", type=int, default=20, help="few products = more contention")
+    parser.add_argument("--stock", type=int, default=500, help="initial stock per product")
+    parser.add_argument("--lines", type=int, default=4, help="max lines per basket")
+    parser.add_argument("--mode", choices=["checkout", "journal"], default="checkout")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--drain-timeout", type=float, default=60, help="seconds to wait for journals to flush")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    failures = []
+    try:
+        product_ids = seed_products(db, user_id, args.products, stock=args.stock)
+        context = multiprocessing.get_context("spawn")  # bawat terminal may sariling pool at caches
+        results = context.Queue()
+        with tempfile.TemporaryDirectory() as tmp:
+            args.journal_dir = tmp
+            start_at = time.time() + 2  # oras para mag-start yung mga process
+            processes = [
+                context.Process(target=terminal, args=(args, index, user_id, product_ids, start_at, results))
+                for index in range(args.terminals)
+            ]
+            for process in processes:
+                process.start()
+            reports = []
+            while len(reports) < len(processes):
+                try:
+                    reports.append(results.get(timeout=1))
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        break
+            for process in processes:
+                process.join()
+
+        if len(reports) < len(processes):
+            failures.append(f"{len(processes) - len(reports)} terminals crashed")
+        latencies = [latency for report in reports for latency in report["latencies"]]
+        sold = sum(report["sold"] for report in reports)
+        elapsed = max((report["finished"] for report in reports), default=start_at) - start_at
+        errors = [error for report in reports for error in report["errors"]]
+        retries = sum(report["db"]["lock_retries"] for report in reports)
+        gave_up = sum(report["db"]["lock_failures"] for report in reports)
+
+        stats = summarize(latencies)
+        print(f"{args.terminals} terminals x {args.sales} sales, {args.products} products, mode {args.mode}")
+        print(f"sold {sold}, rejected (out of stock) {sum(report['rejected'] for report in reports)}, "
+              f"errors {len(errors)}")
+        print(f"throughput {sold / elapsed if elapsed > 0 else 0:.1f} sales/s, "
+              f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+              f"max {percentile(latencies, 100) * 1000:.2f} ms")
+        print(f"lock retries {retries}, gave up after retries {gave_up}")
+        for error in sorted(set(errors))[:10]:
+            print(f"  error: {error}")
+        flush_failed = 0
+        if args.mode == "journal":
+            journals = [report["journal"] for report in reports]
+            flush_failed = sum(j["failed"] for j in journals)
+            pending = sum(j["pending"] for j in journals)
+            print(f"journal: flushed {sum(j['flushed'] for j in journals)}, pending {pending}, "
+                  f"failed at flush (short stock) {flush_failed}, flush retries {sum(j['retries'] for j in journals)}")
+            if pending:
+                failures.append(f"{pending} journaled sales still pending after --drain-timeout")
+
+        #yung na-failed sa flush ay hindi naisulat, nasa journal para ma-review
+        failures.extend(check_stock(db, user_id, args.stock, sold - flush_failed))
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+    for failure in failures[:50]:
+        print(f"  FAIL {failure}")
+    print("stock invariants:", "FAIL" if failures else "PASS")
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Streaming Excel export of ~1M line items: wall time and peak memory.
+
+    python -m benchmarks.excel_export_benchmark --database dailysales_bench --line-items 1000000
+"""
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, seed_orders, cleanup_user
+)
+from reports.excel_export import export_sales_excel
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--line-items", type=int, default=1_000_000)
+    parser.add_argument("--lines-per-order", type=int, default=4)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        seed_products(db, user_id, 1000)
+        seed_orders(db, user_id, args.line_items // args.lines_per_order,
+                    days=args.days, lines_per_order=args.lines_per_order)
+
+        end = date.today() + timedelta(days=1)
+        start = end - timedelta(days=args.days + 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "export.xlsx")
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            rows = export_sales_excel(db, user_id, start, end, path)
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size_mb = os.path.getsize(path) / 1e6
+
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"exported {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s), file {size_mb:.1f} MB")
+        print(f"python heap peak {peak / 1e6:.1f} MB, process max RSS {max_rss_mb:.1f} MB")
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+if __name__ == "__main__":
+    main()
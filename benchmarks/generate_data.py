@@ -0,0 +1,167 @@
+"""Fill user, products, orders and order_details with synthetic data for benchmarks.
+
+Everything is inserted with set-based INSERT ... SELECT over MariaDB's
+Sequence engine (seq_1_to_N), in chunks of --chunk-orders orders per
+transaction, so 10M line items load without a Python loop per row:
+    python -m benchmarks.generate_data --database dailysales_bench \\
+        --users 100 --products 50000 --line-items 10000000
+
+Generated users are named <prefix>_<n> and all share --user-password. Remove them with:
+    python -m benchmarks.generate_data --database dailysales_bench --cleanup
+"""
+import time
+from benchmarks.common import bench_arg_parser, bench_database, cleanup_user
+from db import passwords, rollup
+
+def create_users(db, prefix, count, password):
+    # iisang hash para sa lahat, mabilis gawin at pwede pa ring mag-login
+    password_hash = passwords.hash_secret(password, 1000)
+    with db.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO user (name, username, password, gender)
+            SELECT CONCAT('Generated ', seq), CONCAT(?, '_', seq), ?, ELT(1 + seq % 3, 'Male', 'Female', 'Other')
+            FROM seq_1_to_{int(count)}
+        """, (prefix, password_hash))
+    return user_ids(db, prefix)
+
+def user_ids(db, prefix):
+    with db.cursor() as cursor:
+        cursor.execute("SELECT userId FROM user WHERE username LIKE ? ORDER BY userId", (f"{prefix}\\_%",))
+        return [row[0] for row in cursor.fetchall()]
+
+def create_products(db, users, count):
+    # products na hati-hati sa users; may sku, price at purchasePrice para sa reports
+    with db.cursor() as cursor:
+        _create_user_table(cursor, users)
+        cursor.execute(f"""
+            INSERT INTO products (productName, sku, price, purchasePrice, stock, userId)
+            SELECT CONCAT('Product ', LPAD(seq, 7, '0')), CONCAT('SKU', LPAD(seq, 9, '0')),
+                   5 + seq % 500, (5 + seq % 500) * 0.6, 1000000, gu.userId
+            FROM seq_1_to_{int(count)} s
+            JOIN gen_users gu ON gu.n = s.seq % ?
+        """, (len(users),))
+        cursor.execute("DROP TEMPORARY TABLE gen_users")
+
+def create_orders(db, users, orders, lines_per_order, days, chunk_orders, progress=print):
+    end_date = time.strftime("%Y-%m-%d 23:59:59")
+    with db.cursor() as cursor:
+        _create_user_table(cursor, users)
+        #numbering ng products per user para mapili sa order_details nang walang random lookups
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS gen_products")
+        cursor.execute("""
+            CREATE TEMPORARY TABLE gen_products (PRIMARY KEY (userId, n))
+            SELECT p.userId, ROW_NUMBER() OVER (PARTITION BY p.userId ORDER BY p.productId) - 1 AS n,
+                   p.productId, p.price, p.purchasePrice
+            FROM products p JOIN gen_users gu ON gu.userId = p.userId
+        """)
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS gen_counts")
+        cursor.execute("""
+            CREATE TEMPORARY TABLE gen_counts (PRIMARY KEY (userId))
+            SELECT userId, COUNT(*) AS products FROM gen_products GROUP BY userId
+        """)
+
+        done = 0
+        while done < orders:
+            size = min(chunk_orders, orders - done)
+            cursor.execute("SELECT COALESCE(MAX(orderId), 0) FROM orders")
+            first_id = cursor.fetchone()[0] + 1
+            #orders.productId/quantity ay legacy columns na walang default, 0 gaya ng app
+            cursor.execute(f"""
+                INSERT INTO orders (productId, userId, quantity, totalPrice, totalMoney, changeAmount, orderDateTime)
+                SELECT 0, gu.userId, 0, 0.00, 0.00, 0.00,
+                       CAST(? AS DATETIME) - INTERVAL (s.seq % ?) DAY - INTERVAL (s.seq * 7919 % 86400) SECOND
+                FROM seq_{done + 1}_to_{done + size} s
+                JOIN gen_users gu ON gu.n = s.seq % ?
+            """, (end_date, days, len(users)))
+            cursor.execute("SELECT MAX(orderId) FROM orders")
+            last_id = cursor.fetchone()[0]
+
+            cursor.execute(f"""
+                INSERT INTO order_details (orderId, productId, quantity, totalPrice, unitCost)
+                SELECT o.orderId, gp.productId, 1 + (o.orderId % 3), gp.price * (1 + (o.orderId % 3)), gp.purchasePrice
+                FROM orders o
+                JOIN gen_counts gc ON gc.userId = o.userId
+                JOIN seq_0_to_{max(0, int(lines_per_order) - 1)} s
+                JOIN gen_products gp ON gp.userId = o.userId AND gp.n = (o.orderId * 31 + s.seq) % gc.products
+                WHERE o.orderId BETWEEN ? AND ?
+            """, (first_id, last_id))
+
+            cursor.execute("""
+                UPDATE orders o
+                JOIN (SELECT orderId, SUM(totalPrice) AS total FROM order_details
+                      WHERE orderId BETWEEN ? AND ? GROUP BY orderId) t ON t.orderId = o.orderId
+                SET o.totalPrice = t.total, o.totalMoney = t.total
+            """, (first_id, last_id))
+            cursor.connection.commit()  # isang transaction per chunk
+
+            done += size
+            progress(f"  {done}/{orders} orders ({done * lines_per_order} line items)")
+
+        cursor.execute("DROP TEMPORARY TABLE gen_products")
+        cursor.execute("DROP TEMPORARY TABLE gen_counts")
+        cursor.execute("DROP TEMPORARY TABLE gen_users")
+
+def _create_user_table(cursor, users):
+    cursor.execute("DROP TEMPORARY TABLE IF EXISTS gen_users")
+    cursor.execute("CREATE TEMPORARY TABLE gen_users (n INT PRIMARY KEY, userId INT NOT NULL)")
+    cursor.executemany("INSERT INTO gen_users (n, userId) VALUES (?, ?)", list(enumerate(users)))
+
+def generate(db, prefix="gen", users=100, products=50_000, line_items=10_000_000, lines_per_order=4,
+             days=365, chunk_orders=250_000, password="password", progress=print):
+    timings = {}
+    t0 = time.perf_counter()
+    ids = create_users(db, prefix, users, password)
+    timings["users_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    create_products(db, ids, products)
+    timings["products_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    create_orders(db, ids, max(1, line_items // lines_per_order), lines_per_order, days, chunk_orders, progress)
+    timings["orders_s"] = time.perf_counter() - t0
+
+    #rollup para sa sales history at reports
+    t0 = time.perf_counter()
+    for user_id in ids:
+        rollup.rebuild(db, user_id)
+    timings["rollup_s"] = time.perf_counter() - t0
+    return ids, timings
+
+def cleanup(db, prefix="gen"):
+    ids = user_ids(db, prefix)
+    for user_id in ids:
+        with db.cursor() as cursor:
+            cursor.execute("DELETE FROM daily_sales_summary WHERE userId = ?", (user_id,))
+        cleanup_user(db, user_id)
+    return len(ids)
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--prefix", default="gen")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--line-items", type=int, default=10_000_000)
+    parser.add_argument("--lines-per-order", type=int, default=4)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--chunk-orders", type=int, default=250_000)
+    parser.add_argument("--user-password", default="password", help="password of the generated users")
+    parser.add_argument("--cleanup", action="store_true", help="delete the generated users and their data")
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    try:
+        if args.cleanup:
+            print(f"removed {cleanup(db, args.prefix)} generated users")
+            return
+        ids, timings = generate(
+            db, args.prefix, args.users, args.products, args.line_items, args.lines_per_order,
+            args.days, args.chunk_orders, args.user_password
+        )
+        print(f"generated {len(ids)} users (userId {ids[0]}..{ids[-1]}): "
+              + ", ".join(f"{name} {seconds:.1f}" for name, seconds in timings.items()))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
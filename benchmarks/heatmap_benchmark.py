@@ -0,0 +1,67 @@
+"""Calendar heatmap for one month: daily_sales_summary query + painting the QCalendarWidget.
+
+Seeds five years of dense history, then times random months:
+    python -m benchmarks.heatmap_benchmark --database dailysales_bench --orders 2000000
+
+Exits with status 1 if the p95 of query + paint is above --budget-ms.
+"""
+import os
+import random
+from datetime import date
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, seed_orders, cleanup_user, summarize, timed
+)
+from db import rollup
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--orders", type=int, default=2_000_000)
+    parser.add_argument("--days", type=int, default=5 * 365)
+    parser.add_argument("--lines-per-order", type=int, default=3)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QCalendarWidget
+    from controls.sales_history import heatmap_range, paint_heatmap
+
+    app = QApplication([])
+    calendar = QCalendarWidget()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        seed_products(db, user_id, 500)
+        seed_orders(db, user_id, args.orders, days=args.days, lines_per_order=args.lines_per_order)
+        rows = rollup.rebuild(db, user_id)
+        print(f"seeded {args.orders} orders, {rows} rollup rows")
+
+        today = date.today()
+        current = today.year * 12 + today.month - 1
+        offsets = [random.randrange(args.days // 31) for _ in range(args.months)]
+        months = [((current - offset) // 12, (current - offset) % 12 + 1) for offset in offsets]
+
+        def load_and_paint(year, month):
+            start, end = heatmap_range(year, month)
+            with db.cursor() as cursor:
+                totals = rollup.daily_totals(cursor, user_id, start, end)
+            calendar.setCurrentPage(year, month)
+            paint_heatmap(calendar, totals)
+            return totals
+
+        samples = []
+        for year, month in months:
+            elapsed, totals = timed(load_and_paint, year, month)
+            samples.append(elapsed)
+    finally:
+        cleanup_user(db, user_id)
+
+    result = summarize(samples)
+    print("query + paint:", result, f"({len(totals)} days in the last month)")
+    if result["p95_ms"] > args.budget_ms:
+        print(f"FAIL: p95 {result['p95_ms']:.1f} ms is above the {args.budget_ms:.0f} ms budget")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
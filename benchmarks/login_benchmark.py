@@ -0,0 +1,63 @@
+"""Login latency percentiles with N concurrent logins through the auth worker pool.
+
+    python -m benchmarks.login_benchmark --database dailysales_bench --concurrency 1 4 16 --logins 64
+
+Latency is measured from submit to result, so it includes time queued
+behind other logins; "submit" is how long the calling (Qt) thread is blocked.
+"""
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import bench_arg_parser, bench_database, cleanup_user, summarize
+from db.auth import AuthService
+from db.config import auth_config
+
+def run_logins(service, username, password, concurrency, logins):
+    latencies = []
+    submits = []
+
+    def client(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            future = service.submit_login(username, password)
+            submits.append(time.perf_counter() - start)
+            if not future.result():
+                raise RuntimeError("Benchmark login failed.")
+            latencies.append(time.perf_counter() - start)
+
+    per_client = [logins // concurrency + (1 if i < logins % concurrency else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        for future in [clients.submit(client, count) for count in per_client]:
+            future.result()
+    return latencies, submits, time.perf_counter() - start
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=auth_config["iterations"])
+    parser.add_argument("--workers", type=int, default=auth_config["workers"])
+    args = parser.parse_args()
+
+    db = bench_database(args, max_size=max(5, args.workers))
+    service = AuthService(db, iterations=args.iterations, workers=args.workers)
+    username = f"bench_{uuid.uuid4().hex[:12]}"
+    password = "bench-password"
+    service.register("Benchmark", username, password, "Other", "adobo")
+    user_id = service.login(username, password)["userId"]
+    try:
+        print(f"PBKDF2 iterations {args.iterations}, {args.workers} workers")
+        for concurrency in args.concurrency:
+            latencies, submits, elapsed = run_logins(service, username, password, concurrency, args.logins)
+            stats = summarize(latencies)
+            print(f"{concurrency:>3} concurrent: p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms, "
+                  f"p99 {stats['p99_ms']:.0f} ms, {len(latencies) / elapsed:.1f} logins/s, "
+                  f"submit max {max(submits) * 1000:.2f} ms")
+    finally:
+        service.close()
+        cleanup_user(db, user_id)
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Navigation soak test: switch between the shell's screens many times and watch RSS.
+
+    python -m benchmarks.navigation_soak --database dailysales_bench --navigations 10000
+
+Exits with status 1 if RSS grows by more than --max-growth-mb between the end
+of the warm-up and the end of the run (it should stay flat once every screen
+is cached).
+"""
+import os
+import time
+from benchmarks.common import bench_arg_parser, bench_database, create_bench_user, seed_products, seed_orders, cleanup_user
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--navigations", type=int, default=10_000)
+    parser.add_argument("--warmup", type=int, default=1_000)
+    parser.add_argument("--sample-every", type=int, default=1_000)
+    parser.add_argument("--max-growth-mb", type=float, default=5.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from controls.shell_window import ShellWindow, current_rss_mb
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        seed_products(db, user_id, 1_000)
+        seed_orders(db, user_id, 200, days=1)  # may benta ngayong araw, kaya walang "No Data" na modal
+
+        app = QApplication([])
+        user_data = {"userId": user_id, "name": "Benchmark", "username": "bench", "password": "",
+                     "gender": "Other", "accountDateCreated": "N/A", "favoriteFood": ""}
+        shell = ShellWindow(user_data, db.config, idle_timeout=24 * 3600)
+        shell.show()
+        dashboard = shell.dashboard
+        route = [
+            dashboard.open_make_order_section, dashboard.show_dashboard_again,
+            dashboard.open_sales_report_section, dashboard.show_dashboard_again,
+            dashboard.open_products_section, dashboard.show_dashboard_again,
+            dashboard.redirect_to_account, dashboard.show_dashboard_again,
+        ]
+
+        def settle():
+            app.processEvents()
+            sales = shell.screens.get("sales_report")
+            while sales is not None and sales.is_busy():
+                sales.loader_pool.waitForDone(10)
+                app.processEvents()
+
+        start = time.perf_counter()
+        baseline = None
+        for i in range(args.navigations):
+            route[i % len(route)]()
+            settle()
+            if i + 1 == args.warmup:
+                baseline = current_rss_mb()
+            if (i + 1) % args.sample_every == 0:
+                print(f"{i + 1:>7} navigations: RSS {current_rss_mb():.1f} MB, screens {list(shell.screens)}")
+        elapsed = time.perf_counter() - start
+        final = current_rss_mb()
+        shell.close()
+    finally:
+        cleanup_user(db, user_id)
+
+    print(f"{args.navigations} navigations in {elapsed:.1f} s "
+          f"({elapsed / args.navigations * 1000:.2f} ms each), released {shell.released} screens")
+    if baseline is None or final is None:
+        print("RSS not available on this platform; nothing to check")
+        return
+    growth = final - baseline
+    print(f"RSS after warm-up {baseline:.1f} MB, at the end {final:.1f} MB, growth {growth:+.1f} MB "
+          f"(limit {args.max_growth_mb:.1f} MB)")
+    if growth > args.max_growth_mb:
+        print("FAIL: RSS keeps growing while navigating")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
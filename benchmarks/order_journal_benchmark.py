@@ -0,0 +1,61 @@
+"""Till latency of journaled vs direct checkout, and flush throughput.
+
+    python -m benchmarks.order_journal_benchmark --database dailysales_bench --sales 5000
+
+Dedup, crash recovery and failed-sale handling are checked in
+benchmarks/order_journal_checks.py.
+"""
+import os
+import random
+import tempfile
+import time
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user, summarize, timed
+)
+from db.catalog_cache import catalog_cache
+from db.checkout import checkout
+from db.order_journal import OrderJournal
+
+def random_items(product_ids, lines):
+    return [(product_id, random.randint(1, 3)) for product_id in random.sample(product_ids, lines)]
+
+def record_sales(journal, db, user_id, product_ids, count, lines):
+    catalog = catalog_cache.get(db, user_id)
+    return [timed(journal.record, user_id, random_items(product_ids, lines), catalog)[0] for _ in range(count)]
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--sales", type=int, default=5000)
+    parser.add_argument("--direct-sales", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        product_ids = seed_products(db, user_id, 500)
+        with tempfile.TemporaryDirectory() as tmp:
+            #till latency: diretso sa database vs journal lang
+            direct = [
+                timed(checkout, db, user_id, random_items(product_ids, args.lines))[0]
+                for _ in range(args.direct_sales)
+            ]
+            journal = OrderJournal(db, os.path.join(tmp, "bench.sqlite3"), batch_size=args.batch_size)
+            journaled = record_sales(journal, db, user_id, product_ids, args.sales, args.lines)
+
+            start = time.perf_counter()
+            while journal.flush():
+                pass
+            flush_s = time.perf_counter() - start
+            journal.close()
+            print("direct checkout:", summarize(direct))
+            print("journaled:      ", summarize(journaled))
+            print(f"flush: {args.sales} sales in {flush_s:.1f}s ({args.sales / flush_s:.0f} sales/s, "
+                  f"batch size {args.batch_size})")
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+if __name__ == "__main__":
+    main()
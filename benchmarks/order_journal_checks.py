@@ -0,0 +1,234 @@
+"""Correctness checks for the order journal against a scratch database.
+
+    python -m benchmarks.order_journal_checks --database dailysales_bench
+
+Each check seeds its own products for a throwaway user and prints PASS/FAIL:
+  - dedup: writing the same batch twice records every sale once (clientOrderKey),
+  - replay: a batch committed but not yet marked flushed is not written again,
+  - crash: SIGKILL right after journaling, and after a committed flush, loses
+    and duplicates nothing,
+  - permanent error: a sale the database rejects is marked failed and the rest
+    of the batch is still written,
+  - short stock: a journaled sale that no longer fits the stock is marked
+    failed and stock never goes below zero,
+  - deleted product: marked failed, and retry-failed puts it back to pending,
+  - held stock: a reloaded catalog does not free stock still in the journal.
+Exits 1 if any check fails. The timings live in order_journal_benchmark.py.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import uuid
+from benchmarks.common import bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user
+from db.catalog_cache import catalog_cache
+from db.checkout import CheckoutError
+from db.order_journal import OrderJournal
+
+def order_counts(db, user_id):
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT clientOrderKey) FROM orders WHERE userId = ? AND clientOrderKey IS NOT NULL",
+            (user_id,)
+        )
+        return cursor.fetchone()
+
+def stock_of(db, product_id):
+    with db.cursor() as cursor:
+        cursor.execute("SELECT stock FROM products WHERE productId = ?", (product_id,))
+        return cursor.fetchone()[0]
+
+def fresh_catalog(db, user_id):
+    catalog_cache.invalidate(user_id)
+    return catalog_cache.get(db, user_id)
+
+def drain(journal):
+    while journal.flush():
+        pass
+    return journal.stats()
+
+def check_dedup(db, user_id, tmp, args):
+    product_id, = seed_products(db, user_id, 1, stock=100)
+    journal = OrderJournal(db, os.path.join(tmp, "dedup.sqlite3"))
+    catalog = fresh_catalog(db, user_id)
+    for _ in range(3):
+        journal.record(user_id, [(product_id, 2)], catalog)
+    entries = journal.pending()
+    first = journal._apply(entries)
+    second = journal._apply(entries)  # parang na-retry yung buong batch
+    journal.close()
+    total, distinct = order_counts(db, user_id)
+    stock = stock_of(db, product_id)
+    ok = total == distinct == 3 and first == second and stock == 94
+    return ok, f"{total} orders ({distinct} distinct keys), stock {stock} of expected 94"
+
+def check_replay(db, user_id, tmp, args):
+    product_id, = seed_products(db, user_id, 1, stock=100)
+    path = os.path.join(tmp, "replay.sqlite3")
+    journal = OrderJournal(db, path)
+    catalog = fresh_catalog(db, user_id)
+    for _ in range(4):
+        journal.record(user_id, [(product_id, 1)], catalog)
+    journal._apply(journal.pending())  # committed sa MariaDB, hindi pa na-delete sa journal
+    journal.close()
+
+    reopened = OrderJournal(db, path)
+    stats = drain(reopened)
+    held = reopened.held(user_id, product_id)
+    reopened.close()
+    total, distinct = order_counts(db, user_id)
+    stock = stock_of(db, product_id)
+    ok = total == distinct == 4 and stock == 96 and stats["pending"] == stats["failed"] == held == 0
+    return ok, f"{total} orders ({distinct} distinct keys), stock {stock}, {stats['pending']} pending, held {held}"
+
+def check_crash(db, user_id, tmp, args):
+    seed_products(db, user_id, 20, stock=1_000)
+    path = os.path.join(tmp, "crash.sqlite3")
+    run_child(args, "record", user_id, path, 200)
+    run_child(args, "flush", user_id, path, 0)
+    recovered = OrderJournal(db, path, batch_size=args.batch_size)
+    stats = drain(recovered)
+    recovered.close()
+    total, distinct = order_counts(db, user_id)
+    ok = total == distinct == 200 and stats["pending"] == stats["failed"] == 0
+    return ok, f"{total} of 200 sales in orders, {total - distinct} duplicates, {stats['pending']} pending"
+
+def check_permanent_error(db, user_id, tmp, args):
+    product_id, = seed_products(db, user_id, 1, stock=100)
+    journal = OrderJournal(db, os.path.join(tmp, "poison.sqlite3"), batch_size=10)
+    catalog = fresh_catalog(db, user_id)
+    journal.record(user_id, [(product_id, 1)], catalog)
+    #hindi kasya sa decimal(10,2) yung total: DataError sa database, hindi na maaayos ng retry
+    poison = uuid.uuid4().hex
+    with journal._lock:
+        journal._conn.execute(
+            "INSERT INTO sales (order_key, user_id, created_at, payload) VALUES (?, ?, datetime('now'), ?)",
+            (poison, user_id, json.dumps({
+                "lines": [(product_id, 1, "1000000000.00")], "total": "1000000000.00", "payment": "1000000000.00",
+            }))
+        )
+    journal._load_held()
+    journal.record(user_id, [(product_id, 1)], catalog)
+    stats = drain(journal)
+    failed = [row[0] for row in journal.failed()]
+    journal.close()
+    total, _ = order_counts(db, user_id)
+    stock = stock_of(db, product_id)
+    ok = failed == [poison] and total == 2 and stock == 98 and stats["pending"] == 0
+    return ok, f"failed {len(failed)} (poison {'yes' if poison in failed else 'no'}), {total} orders, stock {stock}"
+
+def check_short_stock(db, user_id, tmp, args):
+    product_id, = seed_products(db, user_id, 1, stock=2)
+    catalog = fresh_catalog(db, user_id)
+    #dalawang till na offline, parehong nakita na 2 pa yung stock
+    first = OrderJournal(db, os.path.join(tmp, "till1.sqlite3"))
+    second = OrderJournal(db, os.path.join(tmp, "till2.sqlite3"))
+    first.record(user_id, [(product_id, 2)], catalog)
+    second.record(user_id, [(product_id, 2)], catalog)
+    drain(first)
+    stats = drain(second)
+    first.close()
+    second.close()
+    total, _ = order_counts(db, user_id)
+    stock = stock_of(db, product_id)
+    ok = stock == 0 and total == 1 and stats["failed"] == 1 and "Not enough stock" in (stats["last_failure"] or "")
+    return ok, f"stock {stock}, {total} orders, second till failed {stats['failed']}: {stats['last_failure']}"
+
+def check_deleted_product(db, user_id, tmp, args):
+    product_id, = seed_products(db, user_id, 1, stock=10)
+    journal = OrderJournal(db, os.path.join(tmp, "deleted.sqlite3"))
+    journal.record(user_id, [(product_id, 3)], fresh_catalog(db, user_id))
+    with db.cursor() as cursor:
+        cursor.execute("DELETE FROM products WHERE productId = ?", (product_id,))
+    stats = drain(journal)
+    released = journal.held(user_id, product_id)
+    retried = journal.retry_failed()
+    held = journal.held(user_id, product_id)
+    journal.close()
+    ok = stats["failed"] == 1 and "removed" in (stats["last_failure"] or "") and released == 0 and retried == 1 and held == 3
+    return ok, f"failed {stats['failed']}, held after failure {released}, retried {retried}, held again {held}"
+
+def check_held_stock(db, user_id, tmp, args):
+    product_id, = seed_products(db, user_id, 1, stock=5)
+    journal = OrderJournal(db, os.path.join(tmp, "held.sqlite3"))
+    journal.record(user_id, [(product_id, 4)], fresh_catalog(db, user_id))
+    try:
+        journal.record(user_id, [(product_id, 2)], fresh_catalog(db, user_id))  # bagong load, stock 5 pa rin
+        rejected = False
+    except CheckoutError:
+        rejected = True
+    journal.record(user_id, [(product_id, 1)], fresh_catalog(db, user_id))
+    stats = drain(journal)
+    journal.close()
+    stock = stock_of(db, product_id)
+    ok = rejected and stock == 0 and stats["failed"] == 0
+    return ok, f"oversell rejected {rejected}, stock {stock} after flush"
+
+def child(args):
+    # crash na sinasadya: walang cleanup, walang close, parang nawalan ng kuryente
+    db = bench_database(args)
+    journal = OrderJournal(db, args.journal, batch_size=args.batch_size)
+    if args.child == "record":
+        catalog = catalog_cache.get(db, args.user_id)
+        product_ids = [row.product_id for row in catalog.rows]
+        for i in range(args.sales):
+            journal.record(args.user_id, [(product_ids[i % len(product_ids)], 1)], catalog)
+    else:
+        journal._apply(journal.pending(args.batch_size))  # committed sa MariaDB, hindi pa na-delete sa journal
+    os.kill(os.getpid(), signal.SIGKILL)
+
+def run_child(args, mode, user_id, journal_path, sales):
+    subprocess.run([
+        sys.executable, "-m", "benchmarks.order_journal_checks",
+        "--host", args.host, "--user", args.user, "--password", args.password, "--database", args.database,
+        "--child", mode, "--child-user-id", str(user_id), "--journal", journal_path,
+        "--sales", str(sales), "--batch-size", str(args.batch_size),
+    ])
+
+CHECKS = [
+    ("dedup", check_dedup),
+    ("replay", check_replay),
+    ("crash", check_crash),
+    ("permanent error", check_permanent_error),
+    ("short stock", check_short_stock),
+    ("deleted product", check_deleted_product),
+    ("held stock", check_held_stock),
+]
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--child", choices=["record", "flush"], help=argparse.SUPPRESS)
+    parser.add_argument("--child-user-id", dest="user_id", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--journal", help=argparse.SUPPRESS)
+    parser.add_argument("--sales", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    db = bench_database(args)
+    failures = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, check in CHECKS:
+                user_id = create_bench_user(db)  # bawat check may sariling user at products
+                try:
+                    ok, detail = check(db, user_id, tmp, args)
+                except Exception as e:
+                    ok, detail = False, f"{type(e).__name__}: {e}"
+                finally:
+                    cleanup_user(db, user_id)
+                failures += not ok
+                print(f"{name}: {detail} -> {'PASS' if ok else 'FAIL'}")
+    finally:
+        db.close()
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
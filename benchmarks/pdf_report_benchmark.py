@@ -0,0 +1,46 @@
+"""PDF report generation time and peak memory at 1k, 10k and 100k orders.
+
+Both should grow roughly linearly with the number of orders:
+    python -m benchmarks.pdf_report_benchmark --database dailysales_bench
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, seed_orders, cleanup_user
+)
+from reports.pdf_report import export_sales_pdf
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        seed_products(db, user_id, 500)
+        seeded = 0
+        end = date.today() + timedelta(days=1)
+        for size in sorted(args.sizes):
+            #dagdagan lang hanggang umabot sa size, lahat sa loob ng 30 days
+            seed_orders(db, user_id, size - seeded, days=30, lines_per_order=3)
+            seeded = size
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "report.pdf")
+                tracemalloc.start()
+                t0 = time.perf_counter()
+                rows = export_sales_pdf(db, user_id, end - timedelta(days=31), end, path)
+                elapsed = time.perf_counter() - t0
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            print(f"{rows:>7} orders: {elapsed:7.2f}s ({elapsed / rows * 1e6:.0f} us/order), "
+                  f"peak {peak / 1e6:.1f} MB ({peak / rows:.0f} B/order)")
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Bulk import of a generated product CSV (default 100k rows); fails above --budget-s.
+
+    python -m benchmarks.product_import_benchmark --database dailysales_bench --products 100000
+"""
+import csv
+import os
+import tempfile
+import time
+from benchmarks.common import bench_arg_parser, bench_database, create_bench_user, cleanup_user
+from db.product_import import import_products
+
+def write_csv(path, count):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Product Name", "Price", "Purchase Price", "Stock", "SKU"])
+        for i in range(count):
+            writer.writerow([f"Imported product {i:06d}", f"{5 + i % 500}.50", f"{3 + i % 300}.25", 100, f"IMP{i:09d}"])
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--budget-s", type=float, default=30.0)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "products.csv")
+            write_csv(path, args.products)
+
+            start = time.perf_counter()
+            first = import_products(db, user_id, path, args.batch_size)
+            insert_s = time.perf_counter() - start
+
+            #pangalawang import ng parehong file = update by SKU
+            start = time.perf_counter()
+            second = import_products(db, user_id, path, args.batch_size)
+            update_s = time.perf_counter() - start
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+    print(f"insert: {first.imported} rows in {insert_s:.1f}s ({first.imported / insert_s:.0f} rows/s), "
+          f"{len(first.errors)} errors")
+    print(f"upsert: {second.imported} rows in {update_s:.1f}s ({second.imported / update_s:.0f} rows/s), "
+          f"{len(second.errors)} errors")
+    if max(insert_s, update_s) > args.budget_s:
+        print(f"FAIL: import took longer than {args.budget_s:.0f}s")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
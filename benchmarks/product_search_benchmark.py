@@ -0,0 +1,67 @@
+"""Build and per-keystroke query time of the Make Order product search index.
+
+Runs without a database on a generated catalog:
+    python -m benchmarks.product_search_benchmark --products 100000
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+from benchmarks.common import summarize
+from controls.product_search import ProductSearchIndex
+
+WORDS = ["rice", "sardines", "coffee", "noodles", "soap", "shampoo", "sugar", "bread", "milk", "choco",
+         "corned", "beef", "tuna", "salt", "vinegar", "soy", "sauce", "candy", "chips", "juice",
+         "water", "egg", "oil", "biscuit", "cracker", "detergent", "toothpaste", "cheese", "ham", "hotdog"]
+SIZES = ["small", "medium", "large", "250g", "500g", "1kg", "1L", "pack", "sachet", "bottle"]
+
+def make_catalog(count, rng):
+    rows = []
+    skus = {}
+    for i in range(count):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {rng.choice(SIZES)} #{i}"
+        rows.append((i + 1, name, Decimal(rng.randrange(100, 100_000)) / 100, rng.randrange(0, 500)))
+        skus[f"{480000000000 + i:013d}"] = i
+    return rows, skus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200, help="typed words; one sample per keystroke")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows, skus = make_catalog(args.products, rng)
+
+    start = time.perf_counter()
+    index = ProductSearchIndex(rows, skus)
+    build = time.perf_counter() - start
+
+    #ginagaya yung pag-type: bawat letra ng salita ay isang search
+    keystrokes = []
+    sizes = []
+    for _ in range(args.queries):
+        word = rng.choice(WORDS + SIZES)
+        for end in range(1, len(word) + 1):
+            start = time.perf_counter()
+            result = index.search(word[:end])
+            keystrokes.append(time.perf_counter() - start)
+            sizes.append(len(result))
+
+    codes = rng.sample(list(skus), min(10_000, len(skus)))
+    start = time.perf_counter()
+    for code in codes:
+        index.lookup_sku(code)
+    scan = (time.perf_counter() - start) / len(codes)
+
+    print(f"{args.products} products")
+    print(f"build: {build * 1000:.0f} ms")
+    stats = summarize(keystrokes)
+    print(f"keystroke: mean {stats['mean_ms']:.2f} ms, p50 {stats['p50_ms']:.2f}, "
+          f"p95 {stats['p95_ms']:.2f}, p99 {stats['p99_ms']:.2f}, max {max(keystrokes) * 1000:.2f} "
+          f"({len(keystrokes)} keystrokes, avg {sum(sizes) // len(sizes)} matches)")
+    print(f"sku lookup: {scan * 1e6:.2f} us")
+
+if __name__ == "__main__":
+    main()
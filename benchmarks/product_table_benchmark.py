@@ -0,0 +1,84 @@
+"""First paint, catalog-ready time and RSS of ShowProductsWindow/MakeOrderWindow at 100, 10k and 100k products.
+
+Each size runs in its own process with the offscreen Qt platform so RSS is
+not shared between runs:
+    python -m benchmarks.product_table_benchmark --database dailysales_bench
+
+"cold" opens with an empty catalog cache: the first page comes from the
+database and the full catalog loads in the background ("catalog ready").
+"warm" opens again with the catalog already cached.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from benchmarks.common import bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user
+
+def open_windows(args):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from controls.order import MakeOrderWindow
+    from controls.show_product import ShowProductsWindow
+    from db.catalog_cache import catalog_cache
+
+    app = QApplication(sys.argv[:1])
+    config = bench_database(args).config
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    results = {}
+    for name, factory, model in (
+        ("show_products", lambda: ShowProductsWindow(args.user_id, config), lambda w: w.products_model),
+        ("make_order", lambda: MakeOrderWindow(args.user_id, config, None), lambda w: w.order_model),
+    ):
+        catalog_cache.clear()
+        for run in ("cold", "warm"):
+            t0 = time.perf_counter()
+            window = factory()
+            window.show()
+            app.processEvents()
+            results[f"{name}_{run}_open_ms"] = (time.perf_counter() - t0) * 1000
+            #hintayin yung background load ng buong catalog
+            while model(window).catalog is None and time.perf_counter() - t0 < 120:
+                app.processEvents()
+                time.sleep(0.001)
+            results[f"{name}_{run}_catalog_ms"] = (time.perf_counter() - t0) * 1000
+            window.close()
+    results["rss_delta_mb"] = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss) / 1024
+    print(json.dumps(results))
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--child-user-id", dest="user_id", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.user_id is not None:
+        open_windows(args)
+        return
+
+    db = bench_database(args)
+    for size in args.sizes:
+        user_id = create_bench_user(db)
+        try:
+            seed_products(db, user_id, size)
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.product_table_benchmark",
+                 "--host", args.host, "--user", args.user, "--password", args.password,
+                 "--database", args.database, "--child-user-id", str(user_id)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{size:>7} products (first paint / catalog ready, ms): "
+                  f"products window cold {result['show_products_cold_open_ms']:.0f}/{result['show_products_cold_catalog_ms']:.0f}, "
+                  f"warm {result['show_products_warm_open_ms']:.0f}; "
+                  f"order window cold {result['make_order_cold_open_ms']:.0f}/{result['make_order_cold_catalog_ms']:.0f}, "
+                  f"warm {result['make_order_warm_open_ms']:.0f}; RSS +{result['rss_delta_mb']:.1f} MB")
+        finally:
+            cleanup_user(db, user_id)
+    db.close()
+
+if __name__ == "__main__":
+    main()
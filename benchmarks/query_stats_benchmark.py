@@ -0,0 +1,60 @@
+"""Overhead of db/query_stats.py: the same primary-key lookups with instrumentation off and on.
+
+Rounds alternate between off and on so drift in the server affects both the
+same way. Fails when the overhead is above --max-overhead-pct:
+    python -m benchmarks.query_stats_benchmark --database dailysales_bench
+"""
+import random
+import statistics
+import time
+from benchmarks.common import bench_arg_parser, bench_database, create_bench_user, seed_products, cleanup_user
+from db.query_stats import query_stats
+
+def lookups(db, user_id, product_ids):
+    start = time.perf_counter()
+    for product_id in product_ids:
+        with db.cursor() as cursor:
+            cursor.execute(
+                "SELECT productName, price, stock FROM products WHERE productId = ? AND userId = ?",
+                (product_id, user_id)
+            )
+            cursor.fetchone()
+    return time.perf_counter() - start
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--queries", type=int, default=2000, help="queries per round")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--max-overhead-pct", type=float, default=2.0)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    enabled = query_stats.enabled
+    try:
+        product_ids = seed_products(db, user_id, 1000)
+        sample = [random.choice(product_ids) for _ in range(args.queries)]
+        lookups(db, user_id, sample)  # warmup
+
+        off, on = [], []
+        for _ in range(args.rounds):
+            query_stats.enabled = False
+            off.append(lookups(db, user_id, sample))
+            query_stats.enabled = True
+            on.append(lookups(db, user_id, sample))
+    finally:
+        query_stats.enabled = enabled
+        cleanup_user(db, user_id)
+        db.close()
+
+    off_us = statistics.median(off) / args.queries * 1e6
+    on_us = statistics.median(on) / args.queries * 1e6
+    overhead = (on_us - off_us) / off_us * 100
+    print(f"disabled: {off_us:.1f} us/query")
+    print(f"enabled:  {on_us:.1f} us/query ({on_us - off_us:+.1f} us, {overhead:+.2f}%)")
+    if overhead > args.max_overhead_pct:
+        print(f"FAIL: overhead above {args.max_overhead_pct}%")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Headless benchmark suite over generated data, compared against a saved JSON baseline.
+
+    python -m benchmarks.run_all --database dailysales_bench                    # compare with the baseline
+    python -m benchmarks.run_all --database dailysales_bench --update-baseline  # save this machine's numbers
+
+Generates a dataset with benchmarks.generate_data (smaller than the
+generator's defaults; see --users/--products/--line-items), then times
+product loading, checkout, sales history loading, aggregation and the
+Excel/PDF exports. Every number is a median in milliseconds. Exits with
+status 1 if any of them is more than --tolerance slower than the baseline.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from benchmarks.common import bench_arg_parser, bench_database, check_baseline
+from benchmarks import generate_data
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def median_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def product_loading(db, user_id, runs):
+    from db.catalog_cache import Catalog
+    return {"catalog_load_ms": median_ms(lambda: Catalog.load(db, user_id), runs)}
+
+def checkout(db, user_id, runs):
+    from db.order_repository import OrderRepository
+    from db.product_repository import ProductRepository
+    orders = OrderRepository(db)
+    product_ids = [product.product_id for product in ProductRepository(db).catalog(user_id)[0]]
+    baskets = iter(range(runs * 2))
+
+    def one_sale():
+        offset = next(baskets) * 10
+        orders.place(user_id, [(product_ids[(offset + i) % len(product_ids)], 1) for i in range(10)])
+    return {"checkout_10_lines_ms": median_ms(one_sale, runs)}
+
+def sales_history(db, user_id, runs):
+    from controls.sales_history import PAGE_SIZE, sales_range
+    from db.sales_report_repository import SalesReportRepository
+    reports = SalesReportRepository(db)
+    today = date.today()
+    result = {}
+    for mode in ("Day", "Week", "Month"):
+        start, end = sales_range(mode, today - timedelta(days=1))
+        result[f"sales_page_{mode.lower()}_ms"] = median_ms(
+            lambda: reports.sales_page(user_id, start, end, 0, PAGE_SIZE), runs
+        )
+    return result
+
+def aggregation(db, user_id, runs):
+    from db import rollup
+    from db.sales_report_repository import SalesReportRepository
+    reports = SalesReportRepository(db)
+    end = date.today() + timedelta(days=1)
+    start = end - timedelta(days=30)
+
+    def month_totals():
+        with db.cursor() as cursor:
+            reports.totals(user_id, start, end, cursor=cursor)
+            reports.daily_totals(user_id, start, end, cursor=cursor)
+    return {
+        "rollup_month_ms": median_ms(month_totals, runs),
+        "rollup_rebuild_user_ms": median_ms(lambda: rollup.rebuild(db, user_id), max(1, runs // 5)),
+    }
+
+def exports(db, user_id, runs):
+    from reports.excel_export import export_sales_excel
+    from reports.pdf_report import export_sales_pdf
+    end = date.today() + timedelta(days=1)
+    start = end - timedelta(days=7)
+    runs = max(1, runs // 5)
+    with tempfile.TemporaryDirectory() as tmp:
+        return {
+            "excel_export_week_ms": median_ms(
+                lambda: export_sales_excel(db, user_id, start, end, os.path.join(tmp, "week.xlsx")), runs),
+            "pdf_export_week_ms": median_ms(
+                lambda: export_sales_pdf(db, user_id, start, end, os.path.join(tmp, "week.pdf")), runs),
+        }
+
+SCENARIOS = [product_loading, checkout, sales_history, aggregation, exports]
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--prefix", default="suite")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--products", type=int, default=25_000)
+    parser.add_argument("--line-items", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--only", nargs="+", choices=[scenario.__name__ for scenario in SCENARIOS])
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--keep-data", action="store_true", help="reuse and keep the generated users")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    db = bench_database(args)
+    try:
+        user_ids = generate_data.user_ids(db, args.prefix)
+        if not user_ids:
+            print(f"generating {args.users} users, {args.products} products, {args.line_items} line items...")
+            user_ids, _ = generate_data.generate(
+                db, args.prefix, args.users, args.products, args.line_items, progress=lambda message: None
+            )
+        user_id = user_ids[0]
+
+        result = {}
+        for scenario in SCENARIOS:
+            if args.only and scenario.__name__ not in args.only:
+                continue
+            timings = scenario(db, user_id, args.runs)
+            for name, value in timings.items():
+                print(f"{name}: {value:.1f} ms")
+            result.update(timings)
+    finally:
+        if not args.keep_data:
+            generate_data.cleanup(db, args.prefix)
+        db.close()
+
+    failures = check_baseline(result, BASELINE_PATH, args.tolerance, args.update_baseline)
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Flipping between nearby days in sales history: database load vs sales cache hit.
+
+    python -m benchmarks.sales_cache_benchmark --database dailysales_bench --orders 200000
+"""
+import random
+from datetime import date, timedelta
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, seed_orders, cleanup_user, summarize, timed
+)
+from controls.sales_history import PAGE_SIZE
+from db import rollup
+from db.sales_cache import SalesCache
+from db.sales_report_repository import SalesReportRepository
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--flips", type=int, default=200)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        seed_products(db, user_id, 500)
+        seed_orders(db, user_id, args.orders, days=args.days)
+        rollup.rebuild(db, user_id)
+
+        #manager na palipat-lipat sa loob ng isang linggo
+        today = date.today()
+        days = [today - timedelta(days=random.randrange(7)) for _ in range(args.flips)]
+        cache = SalesCache(max_entries=64)
+        reports = SalesReportRepository(db)
+
+        def flip(day):
+            key = (user_id, day, day + timedelta(days=1), 0)
+            version = rollup.range_version(user_id, day, day + timedelta(days=1))
+            if cache.get(key, version) is None:
+                cache.put(key, version, reports.sales_page(user_id, day, day + timedelta(days=1), 0, PAGE_SIZE))
+
+        uncached = []
+        for day in days:
+            uncached.append(timed(reports.sales_page, user_id, day, day + timedelta(days=1), 0, PAGE_SIZE)[0])
+        cached = [timed(flip, day)[0] for day in days]
+    finally:
+        cleanup_user(db, user_id)
+
+    print("no cache:  ", summarize(uncached))
+    print("with cache:", summarize(cached))
+    print("cache:     ", cache.stats())
+
+if __name__ == "__main__":
+    main()
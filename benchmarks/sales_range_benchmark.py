@@ -0,0 +1,73 @@
+"""Before/after timing of the SalesLoaderThread day query.
+
+Seeds a few million synthetic orders for a scratch user, then compares the
+old DATE(o.orderDateTime) = ? filter against the half-open range on
+idx_orders_user_datetime (migrations/001_sales_date_indexes.sql must be applied):
+    python -m benchmarks.sales_range_benchmark --database dailysales_bench --orders 2000000
+"""
+import random
+import time
+from datetime import date, datetime, timedelta
+from benchmarks.common import (
+    bench_arg_parser, bench_database, create_bench_user, seed_products, seed_orders, cleanup_user, summarize
+)
+
+BEFORE_QUERY = """
+    SELECT o.orderId, p.productName, od.quantity, od.totalPrice, o.orderDateTime, p.purchasePrice
+    FROM order_details od
+    JOIN orders o IGNORE INDEX (idx_orders_user_datetime) ON od.orderId = o.orderId
+    JOIN products p ON od.productId = p.productId
+    WHERE o.userId = ? AND DATE(o.orderDateTime) = ?
+"""
+
+AFTER_QUERY = """
+    SELECT o.orderId, p.productName, od.quantity, od.totalPrice, o.orderDateTime, p.purchasePrice
+    FROM order_details od
+    JOIN orders o ON od.orderId = o.orderId
+    JOIN products p ON od.productId = p.productId
+    WHERE o.userId = ? AND o.orderDateTime >= ? AND o.orderDateTime < ?
+"""
+
+def run(db, query, params_list):
+    samples = []
+    with db.cursor() as cursor:
+        for params in params_list:
+            t0 = time.perf_counter()
+            cursor.execute(query, params)
+            cursor.fetchall()
+            samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+def main():
+    parser = bench_arg_parser(__doc__)
+    parser.add_argument("--orders", type=int, default=2_000_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    db = bench_database(args)
+    user_id = create_bench_user(db)
+    try:
+        seed_products(db, user_id, 500)
+        t0 = time.perf_counter()
+        seed_orders(db, user_id, args.orders, days=args.days)
+        print(f"seeded {args.orders} orders in {time.perf_counter() - t0:.1f}s")
+
+        today = date.today()
+        days = [today - timedelta(days=random.randrange(args.days)) for _ in range(args.samples)]
+        before = run(db, BEFORE_QUERY, [(user_id, d.isoformat()) for d in days])
+        after = run(db, AFTER_QUERY, [
+            (user_id, datetime(d.year, d.month, d.day), datetime(d.year, d.month, d.day) + timedelta(days=1))
+            for d in days
+        ])
+
+        print(f"before (DATE() = ?):   mean {before['mean_ms']:.2f} ms, p95 {before['p95_ms']:.2f} ms")
+        print(f"after  (range + index): mean {after['mean_ms']:.2f} ms, p95 {after['p95_ms']:.2f} ms")
+        if after["mean_ms"]:
+            print(f"speedup: {before['mean_ms'] / after['mean_ms']:.1f}x")
+    finally:
+        cleanup_user(db, user_id)
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Cold start to the login screen, measured with python -X importtime; fails on regression.
+
+    python -m benchmarks.startup_benchmark                     # compare with the saved baseline
+    python -m benchmarks.startup_benchmark --update-baseline   # save this machine's numbers
+
+Exits with status 1 if a heavy module (pandas, fpdf, reportlab, openpyxl,
+PyQt6.uic) is imported before the login window, or if the median import or
+login-window time is more than --tolerance slower than the baseline.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.common import check_baseline
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "startup_baseline.json")
+HEAVY_MODULES = ("pandas", "fpdf", "reportlab", "openpyxl", "PyQt6.uic")
+
+LOGIN_WINDOW = """
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+import main
+window = main.LoginWindow(main.get_database(main.db_config))
+window.show()
+app.processEvents()
+"""
+
+def run_python(args, code):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stderr
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package"
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+def measure(runs):
+    import_us = []
+    login_s = []
+    heavy = set()
+    for _ in range(runs):
+        _, stderr = run_python(["-X", "importtime"], LOGIN_WINDOW)
+        modules = parse_importtime(stderr)
+        import_us.append(modules["main"])
+        heavy.update(name for name in modules if name.split(".")[0] in HEAVY_MODULES or name in HEAVY_MODULES)
+        elapsed, _ = run_python([], LOGIN_WINDOW)
+        login_s.append(elapsed)
+    return {
+        "main_import_ms": statistics.median(import_us) / 1000,
+        "login_window_ms": statistics.median(login_s) * 1000,
+    }, sorted(heavy)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    run_python([], LOGIN_WINDOW)  # warm-up: compile ui/_compiled at __pycache__ bago sukatin
+    result, heavy = measure(args.runs)
+    print(f"import main: {result['main_import_ms']:.1f} ms, login window: {result['login_window_ms']:.0f} ms "
+          f"(median of {args.runs})")
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+
+    failures.extend(check_baseline(result, BASELINE_PATH, args.tolerance, args.update_baseline))
+
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 from PyQt6.QtWidgets import QDialog, QPushButton, QLabel, QComboBox
-from PyQt6 import uic
+from controls.ui_loader import load_ui
 from datetime import datetime
 from controls.change_password_window import ChangePasswordWindow
 
 class AccountWindow(QDialog):
     def __init__(self, user_data, logout_callback, dashboard_callback):
         super().__init__()
-        uic.loadUi("ui/account.ui", self)
+        load_ui("ui/account.ui", self)
         self.setWindowTitle("Account Information")
 
         self.user_data = user_data
@@ -43,7 +43,13 @@ class AccountWindow(QDialog):
             self.show_again
         )
         self.change_password_window.show()
-        self.hide()
+
+    def on_screen_shown(self):
+        # naka-cache sa shell, kaya ibalik sa "Account" yung combo box
+        if self.choices:
+            self.choices.blockSignals(True)
+            self.choices.setCurrentText("Account")
+            self.choices.blockSignals(False)
 
     def show_again(self):
         self.show()
@@ -1,37 +1,116 @@
-from PyQt6 import uic
+from controls.ui_loader import load_ui
+from controls.profiling import profiled
 from controls.add_product_form import AddProductForm
 from controls.show_product import ShowProductsWindow
+from db.db_functions import get_database
+from db.product_import import import_products
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtWidgets import (
-     QPushButton, QMainWindow, QApplication
+     QPushButton, QMainWindow, QApplication, QFileDialog, QMessageBox, QProgressDialog
 )
 class ProductMainWindow(QMainWindow):
-    def __init__(self, user_id, db_config, dashboard_callback=None):
+    def __init__(self, user_id, db_config, dashboard_callback=None, shell=None):
         super().__init__()
-        uic.loadUi("ui/add_product.ui", self)
+        load_ui("ui/add_product.ui", self)
         self.setWindowTitle("Product UI")
         self.user_id = user_id
         self.db_config = db_config
         self.dashboard_callback = dashboard_callback
+        self.shell = shell
         
         self.add_product_btn = self.findChild(QPushButton, "addProductBtn")
         self.show_products_btn = self.findChild(QPushButton, "showProductsBtn")
         self.cancel_btn = self.findChild(QPushButton, "cancelBtn")
+        self.import_products_btn = self.findChild(QPushButton, "importProductsBtn")
+        self.import_thread = None
 
         self.add_product_btn.clicked.connect(self.open_add_product_ui)
         self.show_products_btn.clicked.connect(self.open_show_products_ui)
         self.cancel_btn.clicked.connect(self.go_back_to_dashboard)
+        self.import_products_btn.clicked.connect(self.import_products)
 
     def open_add_product_ui(self):
         self.add_product_window = AddProductForm(self.user_id, self.db_config)
         self.add_product_window.show()
 
     def open_show_products_ui(self):
-        self.show_products_window = ShowProductsWindow(self.user_id, self.db_config)
-        self.show_products_window.cancel_btn.clicked.connect(self.show)
-        self.show_products_window.show()
-        self.close()
+        self.shell.show_screen("show_products", self.create_show_products)
+
+    def create_show_products(self):
+        window = ShowProductsWindow(self.user_id, self.db_config)
+        #cancel = balik dito sa products screen
+        window.cancel_btn.clicked.connect(self.shell.dashboard.open_products_section)
+        return window
 
     def go_back_to_dashboard(self):
         if self.dashboard_callback:
             self.dashboard_callback()
-        self.close()
\ No newline at end of file
+
+    @profiled()
+    def import_products(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Products", "", "Product files (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+        )
+        if not path:
+            return
+
+        self.import_products_btn.setEnabled(False)
+        self.import_dialog = QProgressDialog("Importing products...", "Cancel", 0, 0, self)
+        self.import_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.import_dialog.setCancelButton(None)
+        self.import_dialog.setMinimumDuration(0)
+        self.import_dialog.show()
+
+        self.import_thread = ImportThread(get_database(self.db_config), self.user_id, path)
+        self.import_thread.progress.connect(
+            lambda rows: self.import_dialog.setLabelText(f"Importing products... {rows} rows")
+        )
+        self.import_thread.done.connect(self.on_import_done)
+        self.import_thread.start()
+
+    def on_import_done(self, result, error):
+        self.import_dialog.close()
+        self.import_products_btn.setEnabled(True)
+        if error:
+            QMessageBox.critical(self, "Import Error", error)
+            return
+
+        message = QMessageBox(self)
+        message.setWindowTitle("Import Finished")
+        message.setText(f"Imported {result.imported} of {result.rows} rows.")
+        notes = []
+        if result.without_sku:
+            notes.append(
+                f"{result.without_sku} rows had no SKU and were added as new products. "
+                "Importing them again adds them again."
+            )
+        if result.errors:
+            message.setIcon(QMessageBox.Icon.Warning)
+            notes.append(f"{len(result.errors)} rows were skipped. See the details for each line.")
+            message.setDetailedText("\n".join(f"Line {e.line}: {e.message}" for e in result.errors[:1000]))
+        else:
+            message.setIcon(QMessageBox.Icon.Information)
+        message.setInformativeText("\n\n".join(notes))
+        message.exec()
+
+    def is_busy(self):
+        # para hindi i-release ng shell habang nag-i-import
+        return bool(self.import_thread and self.import_thread.isRunning())
+
+
+class ImportThread(QThread):
+    progress = pyqtSignal(int)
+    done = pyqtSignal(object, str)
+
+    def __init__(self, db, user_id, path):
+        super().__init__()
+        self.db = db
+        self.user_id = user_id
+        self.path = path
+
+    def run(self):
+        try:
+            result = import_products(self.db, self.user_id, self.path, progress=self.progress.emit)
+            self.done.emit(result, "")
+        except Exception as e:
+            self.done.emit(None, str(e))
@@ -1,21 +1,28 @@
 from PyQt6.QtWidgets import (
      QPushButton, QMainWindow, QApplication, QMessageBox, QLineEdit, QSpinBox
 )
+from controls.ui_loader import load_ui
+from controls.profiling import profiled
 import mariadb
-from PyQt6 import uic
+from db.db_functions import get_database
+from db.catalog_cache import catalog_cache
+from db.product_repository import ProductRepository
 
 class AddProductForm(QMainWindow):
     def __init__(self, user_id, db_config):
         super().__init__()
-        uic.loadUi("ui/add_product_form.ui", self)
+        load_ui("ui/add_product_form.ui", self)
         self.user_id = user_id
         self.db_config = db_config
+        self.db = get_database(db_config)
+        self.products = ProductRepository(self.db)
 
         self.save_btn = self.findChild(QPushButton, "saveBtn")
         self.back_btn = self.findChild(QPushButton, "backBtn")
         self.product_name_input = self.findChild(QLineEdit, "productNameInput")
         self.price_input = self.findChild(QLineEdit, "priceInput")
         self.stock_input = self.findChild(QSpinBox, "stockInput")
+        self.sku_input = self.findChild(QLineEdit, "skuInput")
 
         if self.stock_input:
             self.stock_input.setMinimum(1)
@@ -30,29 +37,23 @@ class AddProductForm(QMainWindow):
         else:
             print("Back button not found")
 
+    @profiled()
     def save_product(self):
         product_name = self.product_name_input.text()
         price = self.price_input.text()
         stock = self.stock_input.value()
+        sku = self.sku_input.text().strip() or None  # optional, NULL kapag walang barcode
 
         if product_name and price:
             try:
                 price = float(price)
-                conn = mariadb.connect(**self.db_config)
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO products (productName, price, stock, userId) VALUES (?, ?, ?, ?)",
-                    (product_name, price, stock, self.user_id)
-                )
-                conn.commit()
+                self.products.add(self.user_id, product_name, price, stock, sku)
+                catalog_cache.invalidate(self.user_id)
                 QMessageBox.information(self, "Success", "Product added successfully!")
+            except mariadb.IntegrityError:
+                QMessageBox.critical(self, "Error", f"SKU {sku} is already used by another product.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
-            finally:
-                if 'conn' in locals():
-                    if conn:
-                        cursor.close()
-                        conn.close()
         else:
             QMessageBox.critical(self, "Error", "Please fill in all fields.")
 
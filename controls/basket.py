@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+# basket ng order: running total na Decimal, ina-update lang ng delta ng binagong row
+class Basket:
+    def __init__(self):
+        self.lines = {}  # productId -> (price, quantity)
+        self.total = Decimal("0.00")
+
+    def quantity(self, product_id):
+        line = self.lines.get(product_id)
+        return line[1] if line else 0
+
+    def set_quantity(self, product_id, price, quantity):
+        old_price, old_quantity = self.lines.get(product_id, (price, 0))
+        delta = price * quantity - old_price * old_quantity
+        self.total += delta
+        if quantity:
+            self.lines[product_id] = (price, quantity)
+        else:
+            self.lines.pop(product_id, None)
+        return delta
+
+    def items(self):
+        return [(product_id, quantity) for product_id, (_, quantity) in self.lines.items()]
+
+    def change(self, payment):
+        return payment - self.total
+
+    def clear(self):
+        self.lines = {}
+        self.total = Decimal("0.00")
+
+    def __len__(self):
+        return len(self.lines)
@@ -0,0 +1,30 @@
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtWidgets import QProgressDialog
+
+# hinihintay yung Future galing sa worker pool habang may busy indicator,
+# tapos tinatawag yung callback(result, error) sa Qt thread
+class BusyTask(QObject):
+    done = pyqtSignal(object, object)
+
+    def __init__(self, parent, message, future, callback):
+        super().__init__(parent)
+        self.callback = callback
+
+        self.dialog = QProgressDialog(message, "Cancel", 0, 0, parent)
+        self.dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.dialog.setCancelButton(None)
+        self.dialog.setMinimumDuration(0)
+        self.dialog.show()
+
+        # galing sa worker thread yung emit kaya queued papunta sa Qt thread
+        self.done.connect(self.on_done)
+        future.add_done_callback(self.emit_done)
+
+    def emit_done(self, future):
+        error = future.exception()
+        self.done.emit(None if error else future.result(), error)
+
+    def on_done(self, result, error):
+        self.dialog.close()
+        self.callback(result, error)
+        self.deleteLater()
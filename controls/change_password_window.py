@@ -1,13 +1,14 @@
 from PyQt6.QtWidgets import QDialog, QLineEdit, QPushButton, QMessageBox, QCheckBox
-from PyQt6 import uic
-import hashlib
-import os
-from db.db_functions import Database
+from controls.ui_loader import load_ui
+from db.db_functions import get_database
+from db.auth import AuthError, get_auth_service
+from controls.busy_task import BusyTask
 from db.config import db_config
+from db.query_stats import call_site, query_stats
 class ChangePasswordWindow(QDialog):
     def __init__(self, user_data, back_callback):
         super().__init__()
-        uic.loadUi("ui/change_password.ui", self)
+        load_ui("ui/change_password.ui", self)
         self.setWindowTitle("Change Password")
 
         self.user_data = user_data
@@ -42,56 +43,38 @@ class ChangePasswordWindow(QDialog):
         self.confirmPassword.textEdited.connect(self.check_verified)
 
         # Database connection
-        self.db = db_config
+        self.db = get_database(db_config)
 
     def verify_favorite_food(self):
         self.togglePasswordCheckbox.setEnabled(True)
         food_input = self.favoriteFood.text().strip()
+        username = self.user_data.get("username")
 
-        try:
-            username = self.user_data.get("username")
+        self.verifyBtn.setEnabled(False)
+        future = get_auth_service(self.db).submit_verify_favorite_food(username, food_input)
+        self.verify_task = BusyTask(self, "Verifying...", future, self.on_verify_finished)
 
-            result = self.db.execute_query(
-                "SELECT favoriteFood FROM user WHERE LOWER(username) = LOWER(?)",
-                (username,)
-            )
-
-            if result is None:
-                QMessageBox.critical(self, "Database Error", "An error occurred during the database query.")
-                return
-
-            if len(result) == 0:
-                QMessageBox.critical(self, "Error", "User not found or no favorite food set.")
-                return
-
-            stored_favfood = result[0]["favoriteFood"]
-
-            if ":" not in stored_favfood:
-                QMessageBox.critical(self, "Error", "Stored favorite food format is invalid.")
-                return
-
-            stored_hash, stored_salt = stored_favfood.split(":")
-            salt_bytes = bytes.fromhex(stored_salt)
-
-            hashed_input = hashlib.pbkdf2_hmac(
-                'sha256', food_input.encode('utf-8'), salt_bytes, 10000
-            ).hex()
-
-            if hashed_input == stored_hash:
-                self.verified = True
-                self.newPassword.setEnabled(True)
-                self.confirmPassword.setEnabled(True)
-                self.saveBtn.setEnabled(True)
-                QMessageBox.information(self, "Verified", "You may now enter your new password.")
-            else:
-                self.verified = False
-                self.clear_password_fields()
-                self.saveBtn.setEnabled(False)
-                QMessageBox.critical(self, "Error", "Favorite food does not match.")
+    def on_verify_finished(self, matched, error):
+        self.verifyBtn.setEnabled(True)
+        if isinstance(error, AuthError):
+            QMessageBox.critical(self, "Error", str(error))
+            return
+        if error is not None:
+            query_stats.log_error("AuthService.verify_favorite_food", error, call_site())
+            QMessageBox.critical(self, "Database Error", str(error))
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Database Error", str(e))
-            print(f"Debug: Error executing query - {e}")
+        if matched:
+            self.verified = True
+            self.newPassword.setEnabled(True)
+            self.confirmPassword.setEnabled(True)
+            self.saveBtn.setEnabled(True)
+            QMessageBox.information(self, "Verified", "You may now enter your new password.")
+        else:
+            self.verified = False
+            self.clear_password_fields()
+            self.saveBtn.setEnabled(False)
+            QMessageBox.critical(self, "Error", "Favorite food does not match.")
 
     def check_verified(self):
         if not self.verified:
@@ -115,22 +98,19 @@ class ChangePasswordWindow(QDialog):
             QMessageBox.warning(self, "Mismatch", "Passwords do not match.")
             return
 
-        salt = os.urandom(16)
-        encrypted_password = hashlib.pbkdf2_hmac('sha256', new_password.encode('utf-8'), salt, 10000)
-        password_to_store = encrypted_password.hex() + ":" + salt.hex()
-
-        try:
-            success = self.db.execute_non_query(
-                "UPDATE user SET password = ? WHERE username = ?",
-                (password_to_store, self.user_data["username"])
-            )
-            if success:
-                QMessageBox.information(self, "Success", "Password updated successfully.")
-                self.go_back()
-            else:
-                QMessageBox.critical(self, "Error", "Failed to update password in the database.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error updating password: {str(e)}")
+        self.saveBtn.setEnabled(False)
+        future = get_auth_service(self.db).submit_change_password(self.user_data["username"], new_password)
+        self.change_task = BusyTask(self, "Updating password...", future, self.on_change_finished)
+
+    def on_change_finished(self, _, error):
+        self.saveBtn.setEnabled(True)
+        if isinstance(error, AuthError):
+            QMessageBox.critical(self, "Error", str(error))
+        elif error is not None:
+            QMessageBox.critical(self, "Error", f"Error updating password: {str(error)}")
+        else:
+            QMessageBox.information(self, "Success", "Password updated successfully.")
+            self.go_back()
 
     def clear_password_fields(self):
         self.newPassword.clear()
@@ -1,21 +1,22 @@
 from PyQt6.QtWidgets import QMainWindow, QMessageBox
-from PyQt6 import uic
+from controls.ui_loader import load_ui
 from controls.account_window import AccountWindow
 from main import LoginWindow 
-from db.db_functions import Database
+from db.db_functions import get_database
 from controls.add_product import ProductMainWindow
 from controls.order import MakeOrderWindow
 from controls.sales_history import SalesHistoryWindow
+from controls.diagnostics_window import DiagnosticsWindow
 class DashboardWindow(QMainWindow):
-    def __init__(self, user_data, db_config, parent=None):
+    def __init__(self, user_data, db_config, shell=None, parent=None):
         super().__init__(parent)
-        uic.loadUi("ui/dashboard.ui", self)
+        load_ui("ui/dashboard.ui", self)
         self.setWindowTitle("Dashboard")
 
         self.db_config = db_config
         self.user_data = user_data
+        self.shell = shell  # ShellWindow na may hawak ng mga naka-cache na screen
         self.is_logged_in = False
-        self.account_window = None
         self.login_window = None
 
         #buttonsconnections
@@ -31,6 +32,9 @@ class DashboardWindow(QMainWindow):
         elif choice == "Account":
             self.set_buttons_visible(False)
             self.check_login_for_account()
+        elif choice == "Diagnostics":
+            self.set_buttons_visible(False)
+            self.open_diagnostics()
 
     def set_buttons_visible(self, visible):
         self.productBtn.setVisible(visible)
@@ -39,36 +43,38 @@ class DashboardWindow(QMainWindow):
         self.storeBtn.setVisible(visible)
     
     def open_products_section(self):
-        #open yung products
-        self.add_product = ProductMainWindow(
+        #open yung products (naka-cache sa shell, hindi na ginagawa ulit)
+        self.shell.show_screen("products", lambda: ProductMainWindow(
             user_id=self.user_data["userId"],
             db_config=self.db_config,
-            dashboard_callback=self.show_dashboard_again
-        )
-        self.add_product.show()
-        self.close()
-        
+            dashboard_callback=self.show_dashboard_again,
+            shell=self.shell
+        ))
+
     def open_make_order_section(self):
         #open yung make order
-        self.make_order_window = MakeOrderWindow(
-        user_id=self.user_data["userId"],
-        db_config=self.db_config,
-        dashboard_window=self
-    )
-
-        self.make_order_window.show()
-        self.close()
-        
+        self.shell.show_screen("make_order", lambda: MakeOrderWindow(
+            user_id=self.user_data["userId"],
+            db_config=self.db_config,
+            dashboard_window=self
+        ))
+
     def open_sales_report_section(self):
         #open yunng sales report
-        self.sales_report_window = SalesHistoryWindow(
+        self.shell.show_screen("sales_report", lambda: SalesHistoryWindow(
             user_id=self.user_data["userId"],
-            
             db_config=self.db_config,
             dashboard_window=self
-        )
-        self.sales_report_window.show()
-        self.close()
+        ))
+
+    def open_diagnostics(self):
+        #query timings at cache stats; walang user data kaya hindi kailangan ng login
+        self.shell.show_screen("diagnostics", lambda: DiagnosticsWindow(
+            self.db_config,
+            shell=self.shell,
+            back_callback=self.show_dashboard_again
+        ))
+
     def check_login_for_account(self):
         if self.is_logged_in:
             self.redirect_to_account()
@@ -107,12 +113,11 @@ class DashboardWindow(QMainWindow):
 
     def logout(self):
         self.open_login_window()
-        self.close()
 
     def open_login_window(self):
-        self.login_window = LoginWindow(Database(self.db_config))
+        self.login_window = LoginWindow(get_database(self.db_config))
         self.login_window.show()
-        self.close()
+        self.shell.close()
 
     def on_login_success(self, user_data):
         self.user_data = user_data
@@ -121,15 +126,13 @@ class DashboardWindow(QMainWindow):
             self.login_window.close()
 
     def redirect_to_account(self):
-        self.account_window = AccountWindow(
+        self.shell.show_screen("account", lambda: AccountWindow(
             self.user_data,
             self.logout,
             self.show_dashboard_again
-        )
-        self.account_window.show()
-        self.close()
-  
+        ))
+
     def show_dashboard_again(self):
-        self.new_dashboard = DashboardWindow(self.user_data, self.db_config)
-        self.new_dashboard.is_logged_in = True
-        self.new_dashboard.show()
+        # balik sa parehong dashboard, hindi na gagawa ng bago
+        self.choices.setCurrentText("Dashboard")
+        self.shell.show_home()
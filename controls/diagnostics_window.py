@@ -0,0 +1,106 @@
+import json
+import time
+from PyQt6.QtWidgets import (
+    QMainWindow, QPushButton, QTableWidget, QTableWidgetItem, QPlainTextEdit, QFileDialog, QMessageBox
+)
+from controls import profiling
+from controls.ui_loader import load_ui
+from db.catalog_cache import catalog_cache
+from db.config import order_journal_config
+from db.db_functions import get_database
+from db.order_journal import get_order_journal
+from db.query_stats import query_stats
+from db.sales_cache import sales_cache
+
+STATEMENT_HEADERS = ["Statement", "Calls", "Total ms", "Mean ms", "p95 ms", "Max ms", "Rows", "Errors"]
+SITE_HEADERS = ["Call Site", "Calls", "Total ms", "p95 ms", "Acquire ms"]
+MAX_ROWS = 200
+
+
+def other_stats(db, shell=None):
+    # pool, caches, shell, event loop at button handlers; kasama ng query stats sa panel at sa JSON export
+    stats = {
+        "pool": db.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "sales_cache": sales_cache.stats(),
+    }
+    if order_journal_config["enabled"]:
+        stats["order_journal"] = get_order_journal(db).stats()
+    if shell is not None:
+        stats["shell"] = shell.stats()
+    if profiling.watchdog is not None:
+        stats["event_loop"] = profiling.watchdog.stats()
+    stats["actions"] = profiling.action_profiler.stats()
+    return stats
+
+
+def fill_table(table, headers, rows):
+    table.setSortingEnabled(False)
+    table.clear()
+    table.setColumnCount(len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.setRowCount(len(rows))
+    for row, values in enumerate(rows):
+        for column, value in enumerate(values):
+            table.setItem(row, column, QTableWidgetItem(str(value)))
+    table.resizeColumnsToContents()
+
+
+# query latency per statement at per window, pati pool at cache stats
+class DiagnosticsWindow(QMainWindow):
+    def __init__(self, db_config, shell=None, back_callback=None):
+        super().__init__()
+        load_ui("ui/diagnostics.ui", self)
+        self.setWindowTitle("Diagnostics")
+        self.db = get_database(db_config)
+        self.shell = shell
+        self.back_callback = back_callback
+
+        self.statements_table = self.findChild(QTableWidget, "statementsTable")
+        self.sites_table = self.findChild(QTableWidget, "sitesTable")
+        self.caches_text = self.findChild(QPlainTextEdit, "cachesText")
+        self.findChild(QPushButton, "refreshBtn").clicked.connect(self.refresh)
+        self.findChild(QPushButton, "resetBtn").clicked.connect(self.reset)
+        self.findChild(QPushButton, "exportBtn").clicked.connect(self.export_json)
+        self.findChild(QPushButton, "backBtn").clicked.connect(self.go_back)
+        self.refresh()
+
+    def on_screen_shown(self):
+        self.refresh()
+
+    def refresh(self):
+        summary = query_stats.summary()
+        fill_table(self.statements_table, STATEMENT_HEADERS, [
+            (s["sql"][:200], s["count"], s["total_ms"], s["mean_ms"], s["p95_ms"], s["max_ms"], s["rows"], s["errors"])
+            for s in summary["statements"][:MAX_ROWS]
+        ])
+        acquire = summary["acquire"]
+        fill_table(self.sites_table, SITE_HEADERS, [
+            (site, s["count"], s["total_ms"], s["p95_ms"], acquire.get(site, {}).get("total_ms", 0.0))
+            for site, s in list(summary["call_sites"].items())[:MAX_ROWS]
+        ])
+        self.caches_text.setPlainText(json.dumps(other_stats(self.db, self.shell), indent=2, default=str))
+
+        status = f"Since {summary['since']}, slow query threshold {summary['slow_ms']} ms"
+        if not summary["enabled"]:
+            status = "Query stats are disabled (query_stats_config in db/config.py)"
+        self.statusBar().showMessage(status)
+
+    def reset(self):
+        query_stats.reset()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Diagnostics", f"diagnostics_{time.strftime('%Y%m%d_%H%M%S')}.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            query_stats.dump(path, **other_stats(self.db, self.shell))
+        except OSError as e:
+            QMessageBox.critical(self, "Error", str(e))
+
+    def go_back(self):
+        if self.back_callback:
+            self.back_callback()
@@ -1,181 +1,319 @@
 from PyQt6.QtWidgets import (
-    QMainWindow, QApplication, QLineEdit, QTableWidget, QTableWidgetItem,
-    QPushButton, QMessageBox, QLabel, QSpinBox
+    QMainWindow, QApplication, QLineEdit, QTableView, QAbstractItemView,
+    QPushButton, QMessageBox, QLabel
 )
-import mariadb
 import sys
-from PyQt6 import uic
-from db.config import db_config
+import threading
+from decimal import Decimal, InvalidOperation
+from controls.ui_loader import load_ui
+from controls.profiling import profiled
+from db.config import db_config, order_journal_config
+from db.db_functions import get_database
+from db.checkout import CheckoutError
+from db.order_repository import OrderRepository
+from db.order_journal import get_order_journal
+from controls.product_table_model import OrderTableModel, SpinBoxDelegate
+from controls.product_search import ProductSearchIndex
+from db.catalog_cache import catalog_cache
+from PyQt6.QtCore import QEvent, QObject, QThreadPool, QTimer, pyqtSignal
+
+
+class CheckoutTask(QObject):
+    # naka-lock na checkout sa QThreadPool para hindi naka-block yung till habang naghihintay sa database
+    finished = pyqtSignal(object, object, object)  # task, receipt (None kapag nag-error), error
+
+    def __init__(self, orders, user_id, items, payment, catalog):
+        super().__init__()
+        self.orders = orders
+        self.user_id = user_id
+        self.items = items
+        self.payment = payment
+        self.catalog = catalog
+        self.order_key = orders.new_order_key()
+        self.lock = threading.Lock()  # deadline (GUI thread) vs katatapos na checkout (worker)
+        self.done = False
+        self.journaled = False  # lumampas sa deadline kaya na-journal na at naibigay na yung resibo
+
+    def journal(self):
+        # tinatawag ng till pagdating ng deadline; None kapag tapos na o hindi ma-journal
+        with self.lock:
+            if self.done or self.catalog is None:
+                return None
+            receipt = self.orders.journal.record(
+                self.user_id, self.items, self.catalog, self.payment, order_key=self.order_key, in_flight=True
+            )
+            self.journaled = True
+            return receipt
+
+    def run(self):
+        try:
+            receipt, error = self.orders.checkout(self.user_id, self.items, self.payment, self.order_key), None
+        except Exception as e:
+            receipt, error = None, e
+        with self.lock:
+            self.done = True
+            if self.journaled:
+                #dito na, kahit sarado na yung window: commit = tanggalin sa journal, kung hindi = i-flush
+                self.orders.journal.resolve(self.order_key, committed=error is None)
+        self.finished.emit(self, receipt, error)
+
+
 class MakeOrderWindow(QMainWindow):
     def __init__(self, user_id, db_config, dashboard_window):
         super().__init__()
-        uic.loadUi("ui/order.ui", self)
+        load_ui("ui/order.ui", self)
 
         self.user_id = user_id
         self.db_config = db_config
+        self.db = get_database(db_config)
+        journal = get_order_journal(self.db) if order_journal_config["enabled"] else None
+        self.orders = OrderRepository(self.db, journal)
+        self.journal = journal
+        self.checkout_task = None  # checkout na hinihintay pa ng till
+        self.checkout_tasks = set()  # hawak hanggang matapos, kasama yung na-journal na
+        #ilang sale na ang na-failed sa flush (kulang stock); bagong failed = sabihan yung cashier
+        self.failed_seen = journal.failed_count() if journal is not None else 0
+        if journal is not None:
+            self.journal_timer = QTimer(self)
+            self.journal_timer.setInterval(5000)
+            self.journal_timer.timeout.connect(self.check_journal)
+            self.journal_timer.start()
         self.dashboard_window = dashboard_window
         self.low_payment_warned = False
 
-        self.order_table = self.findChild(QTableWidget, "orderTable")
+        self.order_table = self.findChild(QTableView, "orderTable")
         self.total_label = self.findChild(QLabel, "totalAmountEdit")
         self.payment_edit = self.findChild(QLineEdit, "paymentEdit")
         self.change_label = self.findChild(QLabel, "changeEdit")
         self.add_button = self.findChild(QPushButton, "addButton")
         self.cancel_button = self.findChild(QPushButton, "cancelButton")
+        self.search_edit = self.findChild(QLineEdit, "searchEdit")
+        self.search_index = None  # binubuo lang sa unang search/scan, per catalog
 
-        self.order_table.setColumnCount(4)
-        self.order_table.setHorizontalHeaderLabels(["Product Name", "Price", "Stock", "Quantity"])
-        self.products = {}
+        #model/view: lazy loading ng products, spinbox lang kapag ine-edit yung quantity
+        self.order_model = OrderTableModel(self.db, self.user_id, parent=self, journal=journal)
+        self.quantity_delegate = SpinBoxDelegate(self.order_table)
+        self.order_table.setModel(self.order_model)
+        self.order_table.setItemDelegateForColumn(OrderTableModel.QUANTITY, self.quantity_delegate)
+        self.order_table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.order_model.basketChanged.connect(self.calculate_total)
 
         self.load_products()
         self.payment_edit.textChanged.connect(self.calculate_change)
         self.add_button.clicked.connect(self.process_order)
         self.cancel_button.clicked.connect(self.cancel_order)
+        self.search_edit.textChanged.connect(self.search_products)
+        self.search_edit.returnPressed.connect(self.scan_product)
 
+    @profiled()
     def load_products(self):
         try:
-            conn = mariadb.connect(**self.db_config)
-            cursor = conn.cursor()
-            cursor.execute("SELECT productId, productName, price, stock FROM products WHERE userId = ?", (self.user_id,))
-            products = cursor.fetchall()
-
-            self.order_table.setRowCount(0)
+            self.search_edit.blockSignals(True)
+            self.search_edit.clear()
+            self.search_edit.blockSignals(False)
+            self.order_model.reload()
+        except Exception as e:
+            QMessageBox.critical(self, "Error loading products", str(e))
 
-            #load lang mga products na asa database
-            if products:
-                self.order_table.setRowCount(len(products))
+    def check_journal(self):
+        if self.journal is None or not self.isVisible():
+            return
+        failed = self.journal.failed_count()
+        if failed <= self.failed_seen:
+            self.failed_seen = failed  # may na-retry o na-review na
+            return
+        new = failed - self.failed_seen
+        self.failed_seen = failed
+        QMessageBox.warning(
+            self, "Sales Need Review",
+            f"{new} offline sale(s) could not be saved to the database.\n"
+            f"{self.journal.last_failure or ''}\n"
+            "Run 'python -m db.order_journal status' to review them."
+        )
+
+    def on_screen_shown(self):
+        self.check_journal()
+        #may binago sa products habang nasa ibang screen, i-refresh pero wag galawin yung basket
+        if not self.order_model.is_stale():
+            return
+        try:
+            self.order_model.refresh()
+            if self.search_edit.text().strip():
+                self.search_products(self.search_edit.text())
+        except Exception as e:
+            QMessageBox.critical(self, "Error loading products", str(e))
 
-                for row, (product_id, name, price, stock) in enumerate(products):
-                    #ensure product is valid
-                    if product_id not in self.products:
-                        self.products[row] = {"productId": product_id, "name": name, "price": price, "stock": stock}
+    def event(self, event):
+        if event.type() == QEvent.Type.WindowActivate:
+            self.on_screen_shown()
+        return super().event(event)
 
-                    self.order_table.setItem(row, 0, QTableWidgetItem(name))
-                    self.order_table.setItem(row, 1, QTableWidgetItem(str(price)))
-                    self.order_table.setItem(row, 2, QTableWidgetItem(str(stock)))
+    def get_search_index(self):
+        catalog = self.order_model.catalog or catalog_cache.get(self.db, self.user_id)
+        # parehong catalog = valid pa yung index (in place lang yung update ng price/stock)
+        if self.search_index is None or self.search_index.rows is not catalog.rows:
+            self.search_index = ProductSearchIndex(catalog.rows, catalog.by_sku)
+        return self.search_index
 
-                    spin_box = QSpinBox()
-                    spin_box.setRange(0, stock)
-                    spin_box.valueChanged.connect(self.calculate_total)
-                    self.order_table.setCellWidget(row, 3, spin_box)
+    def search_products(self, text):
+        try:
+            if not text.strip():
+                if self.order_model.filtered:
+                    self.order_model.clear_filter()
+                return
+            self.order_model.show_rows(self.get_search_index().search(text))
+        except Exception as e:
+            QMessageBox.critical(self, "Error searching products", str(e))
 
+    def scan_product(self):
+        text = self.search_edit.text().strip()
+        if not text:
+            return
+        try:
+            product = self.get_search_index().lookup_sku(text)
         except Exception as e:
-            QMessageBox.critical(self, "Error loading products", str(e))
-        finally:
-            if 'conn' in locals() and conn:
-                cursor.close()
-                conn.close()
+            QMessageBox.critical(self, "Error searching products", str(e))
+            return
+
+        if product is None:
+            # Enter sa search na isa lang yung lumabas = idagdag na rin
+            if self.order_model.rowCount() != 1:
+                self.statusBar().showMessage(f"No product with SKU {text}.", 3000)
+                return
+            product = self.order_model.rows[0]
+
+        if self.order_model.add_product(product):
+            self.statusBar().showMessage(
+                f"Added {product[1]} (x{self.order_model.basket.quantity(product[0])})", 3000
+            )
+        else:
+            QMessageBox.warning(self, "Out of Stock", f"Not enough stock for {product[1]}.")
+        self.search_edit.clear()
 
     def calculate_total(self):
-        total = 0
-        for row in range(self.order_table.rowCount()):
-            try:
-                price = float(self.order_table.item(row, 1).text())
-                quantity = self.order_table.cellWidget(row, 3).value()
-                total += price * quantity
-            except:
-                pass
-
+        #O(1): yung running total ng basket na lang, walang rescan ng rows
         if self.total_label:
-            self.total_label.setText(f"Total: {total:.2f}")
+            self.total_label.setText(f"Total: {self.order_model.basket.total:.2f}")
         self.calculate_change()
 
     def calculate_change(self):
         try:
-            total = float(self.total_label.text().replace("Total: ", ""))
-            payment = float(self.payment_edit.text())
-            change = payment - total
-            self.change_label.setText(f"Change: {change:.2f}")
-
-            if change < 0 and not self.low_payment_warned:
-                QMessageBox.warning(self, "Insufficient Payment", "Please enter a proper bill for this order.")
-                self.low_payment_warned = True
-            elif change >= 0:
-                self.low_payment_warned = False
-        except ValueError:
+            payment = Decimal(self.payment_edit.text())
+            if not payment.is_finite():
+                raise InvalidOperation
+        except InvalidOperation:
             self.change_label.setText("")
             self.low_payment_warned = False
+            return
+
+        change = self.order_model.basket.change(payment)
+        self.change_label.setText(f"Change: {change:.2f}")
+
+        if change < 0 and not self.low_payment_warned:
+            QMessageBox.warning(self, "Insufficient Payment", "Please enter a proper bill for this order.")
+            self.low_payment_warned = True
+        elif change >= 0:
+            self.low_payment_warned = False
 
+    @profiled()
     def process_order(self):
-        order_summary_lines = []
-        total_price = 0.0
-        order_details = []#container for order_details
+        items = self.order_model.basket.items()
 
+        if not items:
+            QMessageBox.warning(self, "No Products Selected", "Please select at least one product.")
+            return
+
+        payment_text = self.payment_edit.text().strip()
         try:
-            conn = mariadb.connect(**self.db_config)
-            cursor = conn.cursor()
-
-            #get existing productIds from the products table
-            cursor.execute("SELECT productId FROM products WHERE userId = ?", (self.user_id,))
-            valid_product_ids = set(row[0] for row in cursor.fetchall()) #get valid pId
-
-            #check kung existed yunng productid sa products
-            for row in range(self.order_table.rowCount()):
-                quantity = self.order_table.cellWidget(row, 3).value()
-                if quantity > 0:
-                    product_name = self.order_table.item(row, 0).text()
-                    price = float(self.order_table.item(row, 1).text())
-                    total_price += price * quantity
-                    order_summary_lines.append(f"{product_name} x {quantity} - {price * quantity:.2f}")
-                    product_id = self.products[row]['productId']
-
-                    if product_id not in valid_product_ids:
-                        raise ValueError(f"Product with ID {product_id} has been removed or no longer exists.")
-
-                    #get details
-                    order_details.append((product_id, quantity, price * quantity))
-
-            if order_summary_lines:
-                summary_text = "\n".join(order_summary_lines)
-                print("Ordered Products:\n" + summary_text)
-                QMessageBox.information(self, "Order Processed", "Products added to the order summary.")
-
-                try:
-                    #insert 
-                    cursor.execute("""
-                        INSERT INTO orders (userId, totalPrice, totalMoney, changeAmount, orderDateTime)
-                        VALUES (?, ?, ?, ?, NOW())
-                    """, (
-                        self.user_id, total_price, total_price, float(self.change_label.text().replace("Change: ", "")) if self.change_label.text() else 0.0
-                    ))
-
-                    order_id = cursor.lastrowid #dito makukuha yung nagenerate na orders per id
-
-                    #insert process
-                    for product_id, quantity, total_price in order_details:
-                        cursor.execute("""
-                            INSERT INTO order_details (orderId, productId, quantity, totalPrice)
-                            VALUES (?, ?, ?, ?)
-                        """, (
-                            order_id, product_id, quantity, total_price
-                        ))
-
-                    conn.commit()
-
-                except Exception as e:
-                    QMessageBox.critical(self, "Error processing order", str(e))
-
-                #remove yung quantity sa spinbox
-                for row in range(self.order_table.rowCount()):
-                    self.order_table.cellWidget(row, 3).setValue(0)
-
-                #reset after ng sucessful order
-                self.total_label.setText("Total: 0.00")
-                self.payment_edit.clear()
-                self.change_label.setText("Change: 0.00")
-
-            else:
-                QMessageBox.warning(self, "No Products Selected", "Please select at least one product.")
+            payment = Decimal(payment_text) if payment_text else None
+        except InvalidOperation:
+            QMessageBox.warning(self, "Invalid Payment", "Please enter a valid amount.")
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
-        finally:
-            if 'conn' in locals() and conn:
-                conn.close()
+        catalog = self.order_model.catalog or catalog_cache.peek(self.user_id)  # para sa offline na benta
+        if self.orders.journal_first(catalog):
+            try:
+                receipt = self.journal.record(self.user_id, items, catalog, payment)
+            except Exception as e:
+                self.show_order_error(e)
+                return
+            self.finish_order(receipt)
+            return
+
+        #isang transaction lang buong sale, kasama yung bawas sa stock, sa background thread
+        task = CheckoutTask(self.orders, self.user_id, items, payment, catalog)
+        task.finished.connect(self.on_checkout_finished)
+        self.checkout_task = task
+        self.checkout_tasks.add(task)
+        self.set_busy(True)
+        QThreadPool.globalInstance().start(task.run)
+        if self.journal is not None:
+            deadline_ms = int(order_journal_config["checkout_deadline"] * 1000)
+            QTimer.singleShot(deadline_ms, lambda: self.on_checkout_deadline(task))
+
+    def set_busy(self, busy):
+        self.add_button.setEnabled(not busy)
+        self.order_table.setEnabled(not busy)
+        if busy:
+            self.statusBar().showMessage("Saving order...")
+        else:
+            self.statusBar().clearMessage()
+
+    def on_checkout_deadline(self, task):
+        # mabagal o hindi maabot yung database: i-journal na, tuloy pa rin yung checkout sa background
+        if task is not self.checkout_task:
+            return
+        try:
+            receipt = task.journal()
+        except Exception:
+            receipt = None  # e.g. kulang sa stock ayon sa catalog; hintayin na lang yung database
+        if receipt is None:
+            return
+        self.checkout_task = None
+        self.set_busy(False)
+        self.finish_order(receipt)
+
+    def on_checkout_finished(self, task, receipt, error):
+        self.checkout_tasks.discard(task)
+        if task.journaled or task is not self.checkout_task:
+            return  # naibigay na yung resibo galing sa journal
+        self.checkout_task = None
+        self.set_busy(False)
+        if error is not None and self.orders.can_journal(error, task.catalog):
+            try:
+                receipt = self.journal.record(task.user_id, task.items, task.catalog, task.payment, order_key=task.order_key)
+                error = None
+            except Exception as e:
+                error = e
+        if error is not None:
+            self.show_order_error(error)
+            return
+        self.finish_order(receipt)
+
+    def show_order_error(self, error):
+        if isinstance(error, CheckoutError):
+            QMessageBox.warning(self, "Order Not Processed", str(error))
+        else:
+            QMessageBox.critical(self, "Error processing order", str(error))
+
+    def finish_order(self, receipt):
+        #offline (journal): wala pang orderId hanggang ma-flush, reference muna
+        saved = f"Order #{receipt.order_id}" if receipt.order_id else f"Offline sale {receipt.order_key[:8].upper()}"
+        message = QMessageBox(self)
+        message.setIcon(QMessageBox.Icon.Information)
+        message.setWindowTitle("Order Processed")
+        message.setText(f"{saved} saved.\nTotal: {receipt.total:.2f}\nChange: {receipt.change:.2f}")
+        message.setDetailedText("Ordered Products:\n" + receipt.summary())
+        message.exec()
+
+        #reset after ng sucessful order, reload para updated yung stock
+        self.total_label.setText("Total: 0.00")
+        self.payment_edit.clear()
+        self.change_label.setText("Change: 0.00")
+        self.load_products()
 
     def cancel_order(self):
-        self.close()
-        self.dashboard_window.show()
+        self.dashboard_window.show_dashboard_again()
 
 
 if __name__ == "__main__":
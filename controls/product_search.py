@@ -0,0 +1,80 @@
+from collections import defaultdict
+
+# in-memory index ng buong catalog para sa search box at barcode scanner sa Make Order
+class ProductSearchIndex:
+    def __init__(self, rows, skus=None):
+        # rows/skus galing sa Catalog; hindi kinokopya para kita agad yung write-through ng price/stock
+        self.rows = rows
+        self.by_sku = skus or {}  # sku -> position sa rows, O(1) lookup ng scan
+        self.names = [row[1].casefold() for row in self.rows]
+
+        #prefix index para sa 1-2 letters: simula ng salita -> positions
+        #trigram index para sa 3+ letters: trigram sa loob ng salita -> positions
+        #(hinahati sa spaces yung query kaya hindi kailangan yung trigram na tumatawid ng space)
+        prefixes = defaultdict(list)
+        trigrams = defaultdict(list)
+        for position, name in enumerate(self.names):
+            keys = set()
+            grams = set()
+            for word in name.split():
+                keys.add(word[:1])
+                keys.add(word[:2])
+                grams.update(word[i:i + 3] for i in range(len(word) - 2))
+            for key in keys:
+                prefixes[key].append(position)
+            for gram in grams:
+                trigrams[gram].append(position)
+        # naka-sort na yung positions kasi in order yung pag-append
+        self.prefixes = dict(prefixes)
+        self.trigrams = dict(trigrams)
+
+        self._last_query = None
+        self._last_positions = None
+
+    def lookup_sku(self, sku):
+        position = self.by_sku.get(sku.strip())
+        return None if position is None else self.rows[position]
+
+    def _term_positions(self, term):
+        if len(term) <= 2:
+            return self.prefixes.get(term, [])
+        if len(term) == 3:
+            return self.trigrams.get(term, [])
+
+        postings = []
+        for i in range(len(term) - 2):
+            posting = self.trigrams.get(term[i:i + 3])
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        positions = set(postings[0])
+        for posting in postings[1:]:
+            positions.intersection_update(posting)
+            if not positions:
+                return []
+        # may false positive yung trigrams (hindi magkakasunod), i-verify sa totoong pangalan
+        names = self.names
+        return sorted(position for position in positions if term in names[position])
+
+    def search(self, query):
+        query = query.casefold().strip()
+        if not query:
+            return list(self.rows)
+
+        #habang nagta-type: kung dinagdagan lang yung dating query, sa dating results na lang mag-filter
+        # (3+ letters lang, substring na kasi yung match doon kaya subset talaga)
+        if self._last_query and query.startswith(self._last_query) and " " not in query:
+            positions = [p for p in self._last_positions if query in self.names[p]]
+        else:
+            terms = query.split()
+            positions = self._term_positions(terms[0])
+            if len(terms) > 1:
+                matched = set(positions)
+                for term in terms[1:]:
+                    matched.intersection_update(self._term_positions(term))
+                positions = sorted(matched)
+
+        self._last_query = query if len(query) >= 3 and " " not in query else None
+        self._last_positions = positions
+        return [self.rows[position] for position in positions]
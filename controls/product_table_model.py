@@ -0,0 +1,458 @@
+from bisect import bisect_right
+from decimal import Decimal, InvalidOperation
+from PyQt6.QtCore import QAbstractTableModel, QEvent, QModelIndex, QObject, Qt, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QApplication, QDoubleSpinBox, QSpinBox, QStyle, QStyledItemDelegate, QStyleOptionButton
+)
+from controls.basket import Basket
+from db.catalog_cache import catalog_cache
+from db.product_repository import MAX_PRICE, MAX_STOCK, ProductRepository
+from db.query_stats import call_site, query_stats
+
+PAGE_SIZE = 500
+
+
+class CatalogLoadTask(QObject):
+    # buong catalog sa QThreadPool habang galing pa sa database yung pages ng table
+    loaded = pyqtSignal(object, object, object)  # task, catalog (None kapag nag-error), error
+
+    def __init__(self, db, user_id):
+        super().__init__()
+        self.db = db
+        self.user_id = user_id
+
+    def run(self):
+        try:
+            catalog = catalog_cache.get(self.db, self.user_id)
+        except Exception as e:
+            self.loaded.emit(self, None, e)
+            return
+        self.loaded.emit(self, catalog, None)
+
+
+# lazy na model ng products: page by page galing sa cached catalog (o sa database habang wala pa) habang nag-scroll
+class ProductTableModel(QAbstractTableModel):
+    NAME, PRICE, STOCK = 0, 1, 2
+    HEADERS = ["Product Name", "Price", "Stock"]
+
+    def __init__(self, db, user_id, button_headers=(), page_size=PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.user_id = user_id
+        self.page_size = page_size
+        self.headers = self.HEADERS + list(button_headers)
+        self.button_columns = range(len(self.HEADERS), len(self.headers))
+        self.rows = []  # (productId, productName, price, stock)
+        self.exhausted = False
+        self.filtered = False
+        self.products = ProductRepository(db)
+        self.catalog = None
+        self.catalog_version = None
+        self.catalog_task = None  # CatalogLoadTask para sa kasalukuyang load lang
+        self.catalog_failed = False  # nag-error yung background load; stale para i-load ulit
+        self.tasks = set()  # hawak hanggang matapos, kahit luma na
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        column = index.column()
+        if column in self.button_columns:
+            return self.headers[column]  # text ng button na dinadrawing ng ButtonDelegate
+        _, name, price, stock = self.rows[index.row()]
+        if column == self.NAME:
+            return name
+        if column == self.PRICE:
+            return str(price)
+        if column == self.STOCK:
+            return str(stock)
+        return None
+
+    def product_id(self, row):
+        return self.rows[row].product_id
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        if self.catalog_version is None:
+            #version muna bago kunin, para kapag may write habang naglo-load ay stale agad
+            self.catalog_version = catalog_cache.version(self.user_id)
+        if self.catalog is None:
+            self.catalog = catalog_cache.peek(self.user_id)
+
+        start = len(self.rows)
+        last_id = self.rows[-1].product_id if self.rows else 0
+        if self.catalog is None:
+            #malamig pa yung cache: isang page lang galing sa database para mabilis yung unang paint,
+            #tapos yung buong catalog sa background (para sa search, scan at susunod na pagbukas)
+            page = self.products.page(self.user_id, last_id, self.page_size)
+            self.exhausted = len(page) < self.page_size
+            self.load_catalog()
+        else:
+            offset = bisect_right(self.catalog.rows, last_id, key=lambda row: row.product_id) if self.rows else 0
+            page = self.catalog.rows[offset:offset + self.page_size]
+            if offset + len(page) >= len(self.catalog.rows):
+                self.exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+
+    def load_catalog(self):
+        if self.catalog_task is None:
+            self.catalog_task = CatalogLoadTask(self.db, self.user_id)
+            self.catalog_task.loaded.connect(self.on_catalog_loaded)
+            self.tasks.add(self.catalog_task)
+            QThreadPool.globalInstance().start(self.catalog_task.run)
+
+    def on_catalog_loaded(self, task, catalog, error):
+        self.tasks.discard(task)
+        if task is not self.catalog_task:
+            return  # galing sa lumang load (nag-reload na)
+        self.catalog_task = None
+        if error is not None:
+            # tuloy lang yung paging sa database; susubukan ulit sa susunod na page o pagbalik sa screen
+            query_stats.log_error("ProductRepository.catalog", error, call_site())
+            self.catalog_failed = True
+            return
+        self.catalog_failed = False
+        # may binago habang naglo-load: stale na yung model, ire-refresh pagbalik sa screen
+        if self.catalog is None and catalog_cache.version(self.user_id) == self.catalog_version:
+            self.catalog = catalog
+
+    def is_stale(self):
+        # may binago sa products mula nung huling load (ibang window o checkout)
+        return self.catalog_failed or (
+            self.catalog_version is not None and catalog_cache.version(self.user_id) != self.catalog_version
+        )
+
+    def show_rows(self, rows):
+        # filtered view galing sa search index, walang lazy loading habang naka-filter
+        self.beginResetModel()
+        self.rows = rows
+        self.exhausted = True
+        self.filtered = True
+        self.endResetModel()
+
+    def clear_filter(self):
+        self.beginResetModel()
+        self.rows = []
+        self.exhausted = False
+        self.filtered = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def reload(self):
+        self.catalog = None
+        self.catalog_version = None
+        self.catalog_task = None
+        self.catalog_failed = False
+        self.clear_filter()
+
+
+# price at stock na pwedeng i-edit sa table; naiipon muna, isang transaction lang kapag sinave
+class EditableProductTableModel(ProductTableModel):
+    PENDING_COLOR = QColor(255, 235, 156)
+
+    pendingChanged = pyqtSignal(int)
+
+    def __init__(self, db, user_id, button_headers=(), page_size=PAGE_SIZE, parent=None):
+        super().__init__(db, user_id, button_headers, page_size, parent)
+        self.pending = {}  # productId -> {PRICE: Decimal, STOCK: int}
+        self.loaded_stock = {}  # productId -> stock nung ine-edit, para hindi ma-overwrite yung benta
+        self.conflicts = {}  # productId -> stock sa database, galing sa huling save na may hindi na-save
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        column = index.column() if index.isValid() else None
+        if column not in (self.PRICE, self.STOCK):
+            return super().data(index, role)
+        row = self.rows[index.row()]
+        value = self.pending.get(row.product_id, {}).get(column)
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.PENDING_COLOR if value is not None else None
+        if value is None:
+            value = row.price if column == self.PRICE else row.stock
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(value)
+        if role == Qt.ItemDataRole.EditRole:
+            return float(value) if column == self.PRICE else value
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() in (self.PRICE, self.STOCK):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() not in (self.PRICE, self.STOCK) or role != Qt.ItemDataRole.EditRole:
+            return False
+        column = index.column()
+        try:
+            if column == self.PRICE:
+                value = Decimal(str(value)).quantize(Decimal("0.01"))
+                valid = 0 <= value <= MAX_PRICE
+            else:
+                value = int(value)
+                valid = 0 <= value <= MAX_STOCK
+        except (InvalidOperation, ValueError, TypeError):
+            valid = False
+        if not valid:
+            return False
+
+        row = self.rows[index.row()]
+        changes = self.pending.setdefault(row.product_id, {})
+        if value == (row.price if column == self.PRICE else row.stock):
+            changes.pop(column, None)  # binalik sa dati, wala nang ise-save
+        else:
+            changes[column] = value
+        if column == self.STOCK:
+            if self.STOCK in changes:
+                self.loaded_stock[row.product_id] = row.stock
+            else:
+                self.loaded_stock.pop(row.product_id, None)
+        if not changes:
+            del self.pending[row.product_id]
+        self.dataChanged.emit(index, index)
+        self.pendingChanged.emit(len(self.pending))
+        return True
+
+    def _refresh_rows(self, product_ids):
+        # dataChanged lang sa mga apektadong rows, walang reset ng buong table
+        for position, row in enumerate(self.rows):
+            if row.product_id in product_ids:
+                self.dataChanged.emit(self.index(position, self.PRICE), self.index(position, self.STOCK))
+
+    def discard_changes(self):
+        product_ids = set(self.pending)
+        self.pending.clear()
+        self.loaded_stock.clear()
+        self._refresh_rows(product_ids)
+        self.pendingChanged.emit(0)
+
+    def save_changes(self):
+        """Write all pending price/stock changes in one transaction and return how many products changed.
+
+        On error nothing is written and the changes stay pending. A stock edit
+        whose row changed in the database since it was loaded (a sale, another
+        terminal) is not written: the row shows the database stock, the edit
+        stays pending, and self.conflicts lists it.
+        """
+        self.conflicts = {}
+        if not self.pending:
+            return 0
+        changes = {
+            product_id: (values.get(self.PRICE), values.get(self.STOCK))
+            for product_id, values in self.pending.items()
+        }
+        with self.db.cursor() as cursor:
+            conflicts = self.products.update_many(
+                self.user_id,
+                prices=[(product_id, price) for product_id, (price, _) in changes.items() if price is not None],
+                stocks=[
+                    (product_id, stock, self.loaded_stock[product_id])
+                    for product_id, (_, stock) in changes.items() if stock is not None
+                ],
+                cursor=cursor,
+            )
+
+        #hindi na-save yung stock: stock sa database yung ipapakita, pending pa rin yung edit
+        kept = {}
+        for product_id, current in conflicts.items():
+            price, _ = changes[product_id]
+            if current is None:
+                catalog_cache.invalidate(self.user_id)  # natanggal na yung product
+                changes.pop(product_id)
+                continue
+            changes[product_id] = (price, current)
+            kept[product_id] = {self.STOCK: self.pending[product_id][self.STOCK]}
+            self.loaded_stock[product_id] = current
+
+        #write-through sa cache; kung kami lang yung nag-bump, hindi stale yung naka-load
+        version = catalog_cache.update_products(self.user_id, changes)
+        if self.catalog_version is not None and version == self.catalog_version + 1:
+            self.catalog_version = version
+        if self.catalog is not None:
+            for product_id, (price, stock) in changes.items():
+                self.catalog.update(product_id, price, stock)
+
+        for position, row in enumerate(self.rows):
+            change = changes.get(row.product_id)
+            if change is not None:
+                price, stock = change
+                self.rows[position] = row._replace(
+                    price=row.price if price is None else price,
+                    stock=row.stock if stock is None else stock,
+                )
+        self.pending = kept
+        self.loaded_stock = {product_id: self.loaded_stock[product_id] for product_id in kept}
+        self.conflicts = conflicts
+        self._refresh_rows(set(changes) | set(conflicts))
+        self.pendingChanged.emit(len(self.pending))
+        return len(changes) - len(kept)
+
+
+class OrderTableModel(ProductTableModel):
+    QUANTITY = 3
+    HEADERS = ["Product Name", "Price", "Stock", "Quantity"]
+
+    basketChanged = pyqtSignal()
+
+    def __init__(self, db, user_id, page_size=PAGE_SIZE, parent=None, journal=None):
+        super().__init__(db, user_id, page_size=page_size, parent=parent)
+        self.basket = Basket()
+        self.journal = journal  # OrderJournal; yung hindi pa na-flush na benta ay bawas sa ipinapakitang stock
+
+    def available(self, product):
+        if self.journal is None:
+            return product.stock
+        return product.stock - self.journal.held(self.user_id, product.product_id)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and index.column() == self.QUANTITY:
+            if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+                return self.basket.quantity(self.product_id(index.row()))
+            return None
+        if index.isValid() and index.column() == self.STOCK and role == Qt.ItemDataRole.DisplayRole:
+            return str(self.available(self.rows[index.row()]))
+        return super().data(index, role)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.QUANTITY:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() != self.QUANTITY or role != Qt.ItemDataRole.EditRole:
+            return False
+        product_id, _, price, _ = self.rows[index.row()]
+        quantity = max(0, min(int(value), self.available(self.rows[index.row()])))
+        if quantity == self.basket.quantity(product_id):
+            return False
+        self.basket.set_quantity(product_id, price, quantity)
+        self.dataChanged.emit(index, index)
+        self.basketChanged.emit()
+        return True
+
+    def add_product(self, product, quantity=1):
+        # galing sa barcode scan, kahit wala sa mga naka-load na rows
+        product_id, _, price, _ = product
+        current = self.basket.quantity(product_id)
+        new_quantity = min(current + quantity, self.available(product))
+        if new_quantity == current:
+            return False
+        self.basket.set_quantity(product_id, price, new_quantity)
+        if self.rows:
+            self.dataChanged.emit(self.index(0, self.QUANTITY), self.index(len(self.rows) - 1, self.QUANTITY))
+        self.basketChanged.emit()
+        return True
+
+    def stock(self, row):
+        return self.available(self.rows[row])
+
+    def on_catalog_loaded(self, task, catalog, error):
+        super().on_catalog_loaded(task, catalog, error)
+        if self.catalog is not None:
+            self.reprice_basket()
+
+    def reprice_basket(self):
+        # presyo sa basket = presyo sa na-refresh na products, para tugma sa sisingilin ng checkout
+        if self.catalog is not None:
+            prices = {
+                product_id: self.catalog.rows[self.catalog.positions[product_id]].price
+                for product_id in self.basket.lines if product_id in self.catalog.positions
+            }
+        else:
+            prices = {row.product_id: row.price for row in self.rows if row.product_id in self.basket.lines}
+        changed = False
+        for product_id, price in prices.items():
+            old_price, quantity = self.basket.lines[product_id]
+            if price != old_price:
+                self.basket.set_quantity(product_id, price, quantity)
+                changed = True
+        if changed:
+            self.basketChanged.emit()
+        return changed
+
+    def refresh(self):
+        # bagong catalog pero hindi ginagalaw yung laman ng basket, presyo lang
+        super().reload()
+        self.reprice_basket()
+
+    def reload(self):
+        self.basket.clear()
+        super().reload()
+        self.basketChanged.emit()
+
+
+# dinadrawing lang yung button, walang QPushButton per row
+class ButtonDelegate(QStyledItemDelegate):
+    clicked = pyqtSignal(QModelIndex)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data() or ""
+        button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())):
+            self.clicked.emit(index)
+            return True
+        return False
+
+
+# QSpinBox lang kapag ine-edit yung cell, hindi naka-attach sa bawat row
+class SpinBoxDelegate(QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        editor = QSpinBox(parent)
+        editor.setRange(0, index.model().stock(index.row()))
+        editor.valueChanged.connect(lambda _: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.blockSignals(True)
+        editor.setValue(index.data(Qt.ItemDataRole.EditRole) or 0)
+        editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.value(), Qt.ItemDataRole.EditRole)
+
+
+# editor para sa Price (2 decimals) at Stock ng EditableProductTableModel
+class PriceStockDelegate(QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        if index.column() == index.model().PRICE:
+            editor = QDoubleSpinBox(parent)
+            editor.setDecimals(2)
+            editor.setRange(0, float(MAX_PRICE))
+        else:
+            editor = QSpinBox(parent)
+            editor.setRange(0, MAX_STOCK)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setValue(index.data(Qt.ItemDataRole.EditRole) or 0)
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), Qt.ItemDataRole.EditRole)
@@ -0,0 +1,183 @@
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import sys
+import threading
+import time
+import traceback
+from PyQt6.QtCore import QObject, Qt, QTimer
+from db.config import profiling_config
+from db.query_stats import Histogram, rotating_logger
+
+_logger = None
+
+def profiling_log():
+    # iisang rotating file para sa stalls at actions, binubuksan lang kapag may isusulat na
+    global _logger
+    if _logger is None:
+        _logger = rotating_logger("dailysales.profiling", profiling_config["log"])
+    return _logger
+
+
+# oras (o cProfile) ng bawat button handler na naka-@profiled
+class ActionProfiler:
+    MODES = ("off", "wall", "cprofile")
+
+    def __init__(self, mode="off", slow_ms=100, top=25):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid profiling mode {mode!r}: use one of {', '.join(self.MODES)}.")
+        self.mode = mode
+        self.slow_ms = slow_ms
+        self.top = top
+        self.current = []  # mga action na tumatakbo ngayon sa GUI thread, para sa stall log
+        self._lock = threading.Lock()
+        self._stats = {}  # action -> Histogram (ms)
+
+    def run(self, name, fn, args, kwargs):
+        #cProfile sa pinakalabas na action lang; bawal yung nested na profiler
+        profile = cProfile.Profile() if self.mode == "cprofile" and not self.current else None
+        self.current.append(name)
+        start = time.perf_counter()
+        try:
+            if profile is not None:
+                return profile.runcall(fn, *args, **kwargs)
+            return fn(*args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self.current.pop()
+            with self._lock:
+                histogram = self._stats.get(name)
+                if histogram is None:
+                    histogram = self._stats[name] = Histogram()
+                histogram.add(ms)
+            if profile is not None:
+                out = io.StringIO()
+                pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(self.top)
+                profiling_log().info("action %s %.1f ms\n%s", name, ms, out.getvalue())
+            elif ms >= self.slow_ms:
+                profiling_log().info("action %s %.1f ms", name, ms)
+
+    def stats(self):
+        with self._lock:
+            actions = {name: histogram.summary() for name, histogram in self._stats.items()}
+        return {
+            "mode": self.mode,
+            "actions": dict(sorted(actions.items(), key=lambda item: -item[1]["total_ms"])),
+        }
+
+
+action_profiler = ActionProfiler(profiling_config["actions"], profiling_config["slow_action_ms"])
+
+
+def profiled(name=None):
+    """Decorate a slot so action_profiler times it (no-op while actions is 'off').
+
+    Extra signal arguments (e.g. clicked's checked flag) are dropped when the
+    slot does not take them, like PyQt does for undecorated slots.
+    """
+    def decorate(fn):
+        label = name or fn.__qualname__
+        params = inspect.signature(fn).parameters.values()
+        if any(p.kind == p.VAR_POSITIONAL for p in params):
+            max_args = None
+        else:
+            max_args = sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if max_args is not None:
+                args = args[:max_args]
+            if action_profiler.mode == "off":
+                return fn(*args, **kwargs)
+            return action_profiler.run(label, fn, args, kwargs)
+        return wrapper
+    return decorate
+
+
+# QTimer sa GUI thread + hiwalay na thread na nagbabantay kung huminto yung event loop
+class EventLoopWatchdog(QObject):
+    def __init__(self, stall_ms=250, interval_ms=50, parent=None):
+        super().__init__(parent)
+        self.stall_ms = stall_ms
+        self.interval_ms = interval_ms
+        self.latency = Histogram()  # gaano ka-late yung tick kumpara sa interval (ms)
+        self.stalls = 0
+        self.longest_stall_ms = 0.0
+
+        self._lock = threading.Lock()
+        self._last_tick = time.monotonic()
+        self._stalled = False  # na-log na yung stack ng kasalukuyang stall
+        self._gui_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self._last_tick = time.monotonic()
+        self.timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def tick(self):
+        now = time.monotonic()
+        with self._lock:
+            blocked_ms = (now - self._last_tick) * 1000
+            self._last_tick = now
+            self.latency.add(max(blocked_ms - self.interval_ms, 0.0))
+            stalled, self._stalled = self._stalled, False
+            if stalled:
+                self.longest_stall_ms = max(self.longest_stall_ms, blocked_ms)
+        if stalled:
+            profiling_log().warning("stall ended after %.0f ms", blocked_ms)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval_ms / 1000):
+            with self._lock:
+                blocked_ms = (time.monotonic() - self._last_tick) * 1000
+                if blocked_ms < self.stall_ms or self._stalled:
+                    continue
+                self._stalled = True
+                self.stalls += 1
+            #stack habang naka-freeze pa, para makita kung anong handler yung may sala
+            frame = sys._current_frames().get(self._gui_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "(no frame)\n"
+            actions = " > ".join(action_profiler.current) or "-"
+            profiling_log().warning(
+                "event loop stalled for %.0f ms (action: %s)\n%s", blocked_ms, actions, stack
+            )
+
+    def stats(self):
+        with self._lock:
+            return {
+                "stall_ms": self.stall_ms,
+                "interval_ms": self.interval_ms,
+                "stalls": self.stalls,
+                "longest_stall_ms": round(self.longest_stall_ms, 1),
+                "lateness": self.latency.summary(),
+            }
+
+
+watchdog = None
+
+def start_watchdog(app):
+    # tawagin pagkatapos gawin yung QApplication; wala kapag naka-off sa profiling_config
+    global watchdog
+    if profiling_config["watchdog"] and watchdog is None:
+        watchdog = EventLoopWatchdog(profiling_config["stall_ms"], profiling_config["interval_ms"], parent=app)
+        watchdog.start()
+        app.aboutToQuit.connect(watchdog.stop)
+    return watchdog
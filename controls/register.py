@@ -1,17 +1,17 @@
-import hashlib
-import os
 import sys
-from PyQt6 import uic
+from controls.ui_loader import load_ui
 from PyQt6.QtWidgets import QMainWindow, QMessageBox, QApplication, QLineEdit
 from PyQt6.QtGui import QMouseEvent
-from db.db_functions import Database
+from db.db_functions import get_database
+from db.auth import AuthError, get_auth_service
+from controls.busy_task import BusyTask
 from db.config import db_config
 class RegisterWindow(QMainWindow):
     def __init__(self, db_config):
         super().__init__()
-        uic.loadUi("ui/register.ui", self)
+        load_ui("ui/register.ui", self)
 
-        self.db = Database(db_config)
+        self.db = get_database(db_config)
         self.registerBtn.clicked.connect(self.register_user)
         self.loginBtn.clicked.connect(self.open_login_window)
         self.favoriteFood.mousePressEvent = self.favorite_food_clicked
@@ -27,49 +27,25 @@ class RegisterWindow(QMainWindow):
             QMessageBox.warning(self, "Missing Info", "Please fill in all fields.")
             return
 
-        try:
-            existing_user = self.db.execute_query(
-                "SELECT username FROM user WHERE username = ?", (username,)
-            )
-            if existing_user:
-                QMessageBox.warning(self, "Error", "Username already exists.")
-                return
-
-            #hash password
-            salt = os.urandom(16)
-            encrypted_password = hashlib.pbkdf2_hmac(
-                'sha256', password.encode('utf-8'), salt, 10000
-            )
-            password_to_store = encrypted_password.hex() + ":" + salt.hex()
-
-            # hash din natin yung favorite food
-            favorite_food_salt = os.urandom(16)
-            encrypted_favorite_food = hashlib.pbkdf2_hmac(
-                'sha256', favoriteFood.encode('utf-8'), favorite_food_salt, 10000
-            )
-            favorite_food_to_store = encrypted_favorite_food.hex() + ":" + favorite_food_salt.hex()
-
-            #reg process
-            query = """
-                INSERT INTO user (name, username, password, gender, favoriteFood)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            params = (name, username, password_to_store, gender, favorite_food_to_store)
-
-            if self.db.execute_non_query(query, params):
-                QMessageBox.information(self, "Success", "Account registered!")
-                self.redirect_to_login()
-            else:
-                QMessageBox.critical(self, "Error", "Registration failed.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
-        finally:
-            self.db.disconnect()
+        #dalawang PBKDF2 (password at favorite food) sa worker pool, may busy indicator
+        self.registerBtn.setEnabled(False)
+        future = get_auth_service(self.db).submit_register(name, username, password, gender, favoriteFood)
+        self.register_task = BusyTask(self, "Registering account...", future, self.on_register_finished)
+
+    def on_register_finished(self, _, error):
+        self.registerBtn.setEnabled(True)
+        if isinstance(error, AuthError):
+            QMessageBox.warning(self, "Error", str(error))
+        elif error is not None:
+            QMessageBox.critical(self, "Error", str(error))
+        else:
+            QMessageBox.information(self, "Success", "Account registered!")
+            self.redirect_to_login()
+        self.db.disconnect()
 
     def open_login_window(self):
         from main import LoginWindow
-        db = Database(self.db.config)
-        self.login_window = LoginWindow(db)
+        self.login_window = LoginWindow(self.db)
         self.login_window.show()
         self.close()
     
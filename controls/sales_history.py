@@ -1,21 +1,31 @@
-import mariadb
-import pandas as pd
 import sys
 import os
-from PyQt6 import uic
-from fpdf import FPDF
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+import mariadb
+from controls.ui_loader import load_ui
+from controls.profiling import profiled
 from decimal import Decimal
-from db.config import db_config
+from datetime import date, timedelta
+from db.config import db_config, sales_loader_config
+from db.db_functions import get_database
+from db.query_stats import call_site, query_stats
+from db import rollup
+from db.sales_cache import is_live, sales_cache
+from db.sales_report_repository import SalesPage, SalesReportRepository, SalesTotals
 from PyQt6.QtWidgets import (
     QMainWindow, QApplication, QCalendarWidget, QTableWidget, QTableWidgetItem,
-    QPushButton, QMessageBox, QProgressDialog, QLabel
+    QPushButton, QMessageBox, QProgressDialog, QLabel, QComboBox
 )
-from PyQt6.QtCore import QDate, Qt, QThread, pyqtSignal
+from PyQt6.QtCore import QDate, QObject, Qt, QThread, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QTextCharFormat
 
 class SalesHistoryWindow(QMainWindow):
     def __init__(self, user_id, db_config, dashboard_window):
         super().__init__()
-        uic.loadUi("ui/sales_history.ui", self)
+        load_ui("ui/sales_history.ui", self)
 
         self.user_id = user_id
         self.db_config = db_config
@@ -41,172 +51,471 @@ class SalesHistoryWindow(QMainWindow):
         current_date = QDate.currentDate().toString("yyyy-MM-dd")
         self.date_label.setText(f"Date now: {current_date}")
 
-
-        self.calendar.selectionChanged.connect(self.load_sales)
+        #range view (Day/Week/Month/Custom) at pagination
+        self.range_combo = self.findChild(QComboBox, "rangeCombo")
+        self.prev_page_button = self.findChild(QPushButton, "prevPageButton")
+        self.next_page_button = self.findChild(QPushButton, "nextPageButton")
+        self.page_label = self.findChild(QLabel, "pageLabel")
+        self.range_combo.addItems(RANGE_MODES)
+
+        self.range_start = None
+        self.range_end = None
+        self.custom_anchor = None
+        self.page = 0
+        self.total_orders = 0
+        self.loaded_version = None
+
+        #debounce: sunod-sunod na clicks = isang load lang, yung huli
+        self.generation = 0
+        self.tasks = set()
+        self.current_task = None
+        self.pending_load = None
+        self.prefetching = set()  # keys ng neighbouring ranges na kasalukuyang nilo-load
+        self.loader_pool = QThreadPool(self)
+        self.loader_pool.setMaxThreadCount(sales_loader_config["max_threads"])
+        self.load_timer = QTimer(self)
+        self.load_timer.setSingleShot(True)
+        self.load_timer.timeout.connect(self.start_load)
+
+        #heatmap ng calendar: total sales per araw, naka-cache per buwan
+        self.month_totals = OrderedDict()  # (year, month) -> (version, {date: total sales}, expires_at)
+        self.calendar.currentPageChanged.connect(self.load_heatmap)
+
+        self.calendar.selectionChanged.connect(self.on_date_selected)
+        self.range_combo.currentTextChanged.connect(self.on_date_selected)
+        self.prev_page_button.clicked.connect(self.previous_page)
+        self.next_page_button.clicked.connect(self.next_page)
         self.export_excel_button.clicked.connect(self.export_to_excel)
         self.export_pdf_button.clicked.connect(self.export_to_pdf)
         self.back_button.clicked.connect(self.go_back)
 
         self.calendar.setSelectedDate(QDate.currentDate())
         self.load_sales_for_today()
+        self.load_heatmap()
 
     def go_back(self):
-        self.dashboard_window.show()
-        self.close()
+        self.dashboard_window.show_dashboard_again()
+
+    def on_screen_shown(self):
+        #may bagong benta mula nung huling load (o luma na yung page na kasama ngayong araw), i-reload
+        stale = (self.loaded_version != self.current_version()
+                 or not sales_cache.contains(self.cache_key(), self.loaded_version))
+        if stale and not self.is_busy():
+            self.load_sales(immediate=True)
+        self.load_heatmap()
+
+    def is_busy(self):
+        # para hindi i-release ng shell habang may tumatakbong thread o naka-schedule na load
+        exporter = getattr(self, "export_thread", None)
+        return (bool(self.tasks) or self.load_timer.isActive()
+                or bool(exporter and exporter.isRunning()))
 
     def load_sales_for_today(self):
-        selected_date = QDate.currentDate().toString("yyyy-MM-dd")
-        self.load_sales(selected_date)
+        self.on_date_selected()
+        if self.load_timer.isActive():
+            self.load_timer.start(0)  # unang load, hindi na hihintayin yung debounce
+
+    def on_date_selected(self):
+        selected = self.calendar.selectedDate().toPyDate()
+        mode = self.range_combo.currentText()
+
+        if mode == "Custom":
+            #unang click = start, pangalawang click = end ng range
+            if self.custom_anchor is None:
+                self.custom_anchor = selected
+                self.statusBar().showMessage(f"Range start: {selected}. Select the end date.")
+                return
+            start, end = sorted((self.custom_anchor, selected))
+            self.custom_anchor = None
+            self.range_start, self.range_end = start, end + timedelta(days=1)
+        else:
+            self.custom_anchor = None
+            self.range_start, self.range_end = sales_range(mode, selected)
+
+        self.page = 0
+        self.load_sales()
+
+    def previous_page(self):
+        if self.page > 0:
+            self.page -= 1
+            self.load_sales()
+
+    def next_page(self):
+        if (self.page + 1) * PAGE_SIZE < self.total_orders:
+            self.page += 1
+            self.load_sales()
+
+    def range_text(self):
+        last_day = self.range_end - timedelta(days=1)
+        if last_day == self.range_start:
+            return str(self.range_start)
+        return f"{self.range_start} to {last_day}"
+
+    def load_sales(self, immediate=False):
+        self.statusBar().showMessage(f"Loading sales for {self.range_text()}...")
+        # bagong generation agad, para yung result ng luma ay hindi na ipapakita
+        self.generation += 1
+        self.cancel_current_load()
+
+        #nasa cache na (e.g. na-prefetch o kabubukas lang): ipakita agad, walang query
+        version = self.current_version()
+        result = sales_cache.get(self.cache_key(), version)
+        if result is not None:
+            self.load_timer.stop()
+            self.pending_load = None
+            self.loaded_version = version
+            self.on_sales_data_loaded(self.generation, *result)
+            return
+
+        self.pending_load = (self.generation, self.range_start, self.range_end, self.page)
+        self.load_timer.start(0 if immediate else sales_loader_config["debounce_ms"])
 
-    def load_sales(self, selected_date=None):
-        if selected_date is None:
-            selected_date = self.calendar.selectedDate().toString("yyyy-MM-dd")
+    def cache_key(self, range_start=None, range_end=None, page=None):
+        return (
+            self.user_id,
+            self.range_start if range_start is None else range_start,
+            self.range_end if range_end is None else range_end,
+            self.page if page is None else page,
+        )
 
-        self.loading_dialog = QProgressDialog("Loading sales data...", "Cancel", 0, 0, self)
-        self.loading_dialog.setWindowModality(Qt.WindowModality.WindowModal)
-        self.loading_dialog.setCancelButton(None)
-        self.loading_dialog.setValue(0)
-        self.loading_dialog.show()
+    def current_version(self):
+        return rollup.range_version(self.user_id, self.range_start, self.range_end)
 
-        self.thread = SalesLoaderThread(self.user_id, selected_date, self.db_config)
-        self.thread.finished.connect(self.on_sales_data_loaded)
-        self.thread.start()
+    def cancel_current_load(self):
+        if self.current_task is not None:
+            self.current_task.cancel()
+            self.current_task = None
 
-    def on_sales_data_loaded(self, sales_data):
-        self.loading_dialog.close()
+    def start_load(self):
+        if self.pending_load is None:
+            return
+        generation, range_start, range_end, page = self.pending_load
+        self.pending_load = None
+
+        # version bago mag-query: kapag may benta habang naglo-load, hindi na tutugma sa cache
+        version = rollup.range_version(self.user_id, range_start, range_end)
+        self.loaded_version = version
+        task = SalesLoadTask(generation, self.user_id, range_start, range_end, page, self.db_config, version)
+        task.loaded.connect(self.on_sales_data_loaded)
+        task.failed.connect(self.on_sales_load_failed)
+        task.finished.connect(self.tasks.discard)
+        self.tasks.add(task)  # hawak hanggang matapos, kahit na-cancel na
+        self.current_task = task
+        self.loader_pool.start(task.run)
+
+    def on_sales_load_failed(self, generation, error):
+        if generation != self.generation:
+            return
+        self.current_task = None
+        self.statusBar().showMessage(f"Could not load sales for {self.range_text()}")
+        QMessageBox.critical(self, "Error loading sales", error)
+
+    def on_sales_data_loaded(self, generation, sales_data, totals, total_orders):
+        if generation != self.generation:
+            return  # may mas bagong request na, luma na ito
+        self.current_task = None
+        self.statusBar().showMessage(f"Sales for {self.range_text()}")
         self.sales_table.setRowCount(0)
+        self.total_orders = total_orders
+        self.update_page_controls()
 
         if not sales_data:
-            QMessageBox.warning(self, "No Data", "No sales data found.")
-            self.total_purchase_label.setText("Total Purchase: 0.00")
-            self.total_sales_label.setText("Total Sales: 0.00")
-            self.total_income_label.setText("Total Income: 0.00")
+            if self.page == 0:
+                QMessageBox.warning(self, "No Data", "No sales data found.")
+            self.show_totals(Decimal("0.00"), Decimal("0.00"))
+            self.prefetch_neighbours()
             return
 
-        order_sales = {}
-        total_purchase = Decimal("0.00")
-        total_sales = Decimal("0.00")
-
-        for sale in sales_data:
-            order_id, product_name, quantity, total_price, order_datetime, purchase_price = sale
-            total_price = Decimal(total_price)
-            purchase_price = Decimal(purchase_price)
-
-            total_sales += total_price
-            total_purchase += purchase_price * Decimal(quantity)
-
-            if order_id not in order_sales:
-                order_sales[order_id] = {"products": [], "total_sales": Decimal("0.00")}
-
-            order_sales[order_id]["products"].append((product_name, quantity))
-            order_sales[order_id]["total_sales"] += total_price
-
-        for order_id, details in order_sales.items():
-            products = ", ".join([p[0] for p in details["products"]])
-            quantities = ", ".join([str(p[1]) for p in details["products"]])
-            total = details["total_sales"]
-
-            row_position = self.sales_table.rowCount()
-            self.sales_table.insertRow(row_position)
-            self.sales_table.setItem(row_position, 0, QTableWidgetItem(str(order_id)))
-            self.sales_table.setItem(row_position, 1, QTableWidgetItem(products))
-            self.sales_table.setItem(row_position, 2, QTableWidgetItem(quantities))
-            self.sales_table.setItem(row_position, 3, QTableWidgetItem(f"{total:.2f}"))
-            self.sales_table.setItem(row_position, 4, QTableWidgetItem(str(order_datetime.date())))
-
-        # Set QLabel values
-        self.total_purchase_label.setText(f"{total_purchase:.2f}")
-        self.total_sales_label.setText(f"{total_sales:.2f}")
-        self.total_income_label.setText(f"{(total_sales - total_purchase):.2f}")
+        #naka-group na galing sa SQL, display na lang
+        self.sales_table.setRowCount(len(sales_data))
+        for row, order in enumerate(sales_data):
+            self.sales_table.setItem(row, 0, QTableWidgetItem(str(order.order_id)))
+            self.sales_table.setItem(row, 1, QTableWidgetItem(order.products))
+            self.sales_table.setItem(row, 2, QTableWidgetItem(order.quantities))
+            self.sales_table.setItem(row, 3, QTableWidgetItem(f"{order.total:.2f}"))
+            self.sales_table.setItem(row, 4, QTableWidgetItem(str(order.ordered_at.date())))
+
+        # Set QLabel values, galing na sa daily_sales_summary
+        self.show_totals(*totals)
+        self.prefetch_neighbours()
+
+    def prefetch_neighbours(self):
+        #background load ng katabing araw/linggo/buwan para instant yung paglipat
+        mode = self.range_combo.currentText()
+        for range_start, range_end in neighbour_ranges(mode, self.range_start, self.range_end):
+            key = self.cache_key(range_start, range_end, 0)
+            version = rollup.range_version(self.user_id, range_start, range_end)
+            if key in self.prefetching or sales_cache.contains(key, version):
+                continue
+            task = SalesLoadTask(0, self.user_id, range_start, range_end, 0, self.db_config, version, prefetch=True)
+            task.finished.connect(self.on_prefetch_finished)
+            self.tasks.add(task)
+            self.prefetching.add(key)
+            self.loader_pool.start(task.run, -1)  # mas mababang priority kaysa sa totoong load
+
+    def on_prefetch_finished(self, task):
+        self.tasks.discard(task)
+        self.prefetching.discard(self.cache_key(task.start_date, task.end_date, 0))
+
+    def load_heatmap(self, *_):
+        key = (self.calendar.yearShown(), self.calendar.monthShown())
+        start, end = heatmap_range(*key)
+        version = rollup.range_version(self.user_id, start, end)
+        cached = self.month_totals.get(key)
+        fresh = cached is not None and (not is_live(end) or time.monotonic() < cached[2])
+        if fresh and cached[0] == version:
+            self.month_totals.move_to_end(key)
+            paint_heatmap(self.calendar, cached[1])
+            return
 
+        task = HeatmapTask(key, self.user_id, start, end, self.db_config, version)
+        task.loaded.connect(self.on_heatmap_loaded)
+        task.finished.connect(self.tasks.discard)
+        self.tasks.add(task)
+        self.loader_pool.start(task.run)
+
+    def on_heatmap_loaded(self, key, version, totals):
+        self.month_totals[key] = (version, totals, time.monotonic() + sales_cache.live_ttl)
+        self.month_totals.move_to_end(key)
+        while len(self.month_totals) > HEATMAP_MONTHS:
+            self.month_totals.popitem(last=False)
+        if key == (self.calendar.yearShown(), self.calendar.monthShown()):
+            paint_heatmap(self.calendar, totals)
+
+    def update_page_controls(self):
+        pages = max(1, -(-self.total_orders // PAGE_SIZE))
+        self.page_label.setText(f"Page {self.page + 1} of {pages} ({self.total_orders} orders)")
+        self.prev_page_button.setEnabled(self.page > 0)
+        self.next_page_button.setEnabled(self.page + 1 < pages)
+
+    def show_totals(self, total_purchase, total_sales):
+        self.total_purchase_label.setText(f"Total Purchase: {total_purchase:.2f}")
+        self.total_sales_label.setText(f"Total Sales: {total_sales:.2f}")
+        self.total_income_label.setText(f"Total Income: {(total_sales - total_purchase):.2f}")
+
+    def export_path(self, extension):
+        filename = f"sales_history_{self.range_text().replace(' to ', '_')}.{extension}"
+        return os.path.join(os.path.expanduser("~"), filename)
+
+    @profiled()
     def export_to_excel(self):
-        if self.sales_table.rowCount() == 0:
+        if self.total_orders == 0:
             QMessageBox.warning(self, "No Data", "No sales data to export.")
             return
 
-        selected_date = self.calendar.selectedDate().toString("yyyy-MM-dd")
-        filename = f"sales_history_{selected_date}.xlsx"
-        path = os.path.join(os.path.expanduser("~"), filename)
-
-        try:
-            data = []
-            for row in range(self.sales_table.rowCount()):
-                row_data = []
-                for column in range(self.sales_table.columnCount()):
-                    item = self.sales_table.item(row, column)
-                    row_data.append(item.text() if item else "")
-                data.append(row_data)
-
-            df = pd.DataFrame(data, columns=[
-                "Order ID", "Product Name", "Quantity", "Total Retail Sales", "Sales Date"
-            ])
-            df.to_excel(path, index=False)
+        #openpyxl lazy import, para hindi bumagal yung startup ng app
+        from reports.excel_export import export_sales_excel
+
+        #buong range galing sa database, hindi lang yung nakikita sa table
+        export_fn = partial(
+            export_sales_excel, get_database(self.db_config), self.user_id, self.range_start, self.range_end
+        )
+        self.start_export(export_fn, self.export_path("xlsx"))
+
+    def start_export(self, export_fn, path):
+        self.export_excel_button.setEnabled(False)
+        self.export_pdf_button.setEnabled(False)
+
+        self.export_dialog = QProgressDialog("Exporting sales data...", "Cancel", 0, 0, self)
+        self.export_dialog.setWindowModality(Qt.WindowModality.NonModal)
+        self.export_dialog.setCancelButton(None)
+        self.export_dialog.show()
+
+        self.export_thread = ExportThread(export_fn, path)
+        self.export_thread.progress.connect(
+            lambda rows: self.export_dialog.setLabelText(f"Exporting sales data... {rows} rows")
+        )
+        self.export_thread.done.connect(self.on_export_done)
+        self.export_thread.start()
+
+    def on_export_done(self, path, error):
+        self.export_dialog.close()
+        self.export_excel_button.setEnabled(True)
+        self.export_pdf_button.setEnabled(True)
+        if error:
+            QMessageBox.critical(self, "Export Error", error)
+        else:
             QMessageBox.information(self, "Export Successful", f"Saved to: {path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", str(e))
 
+    @profiled()
     def export_to_pdf(self):
-        if self.sales_table.rowCount() == 0:
+        if self.total_orders == 0:
             QMessageBox.warning(self, "No Data", "No sales data to export.")
             return
 
-        selected_date = self.calendar.selectedDate().toString("yyyy-MM-dd")
-        filename = f"sales_history_{selected_date}.pdf"
-        path = os.path.join(os.path.expanduser("~"), filename)
+        from reports.pdf_report import export_sales_pdf  # reportlab, lazy din
 
-        try:
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=10)
-            col_widths = [30, 50, 30, 55, 40]
-            headers = ["Order ID", "Product Name", "Quantity", "Total Retail Sales", "Sales Date"]
-
-            for i, header in enumerate(headers):
-                pdf.cell(col_widths[i], 10, header, 1)
-            pdf.ln()
-
-            for row in range(self.sales_table.rowCount()):
-                for col in range(self.sales_table.columnCount()):
-                    item = self.sales_table.item(row, col)
-                    text = item.text() if item else ""
-                    pdf.cell(col_widths[col], 10, text, 1)
-                pdf.ln()
-
-            pdf.output(path)
-            QMessageBox.information(self, "Export Successful", f"Saved to: {path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", str(e))
+        export_fn = partial(
+            export_sales_pdf, get_database(self.db_config), self.user_id, self.range_start, self.range_end
+        )
+        self.start_export(export_fn, self.export_path("pdf"))
 
 
-class SalesLoaderThread(QThread):
-    finished = pyqtSignal(list)
+class ExportThread(QThread):
+    progress = pyqtSignal(int)
+    done = pyqtSignal(str, str)
 
-    def __init__(self, user_id, selected_date, db_config):
+    def __init__(self, export_fn, path):
+        super().__init__()
+        self.export_fn = export_fn
+        self.path = path
+
+    def run(self):
+        try:
+            self.export_fn(self.path, progress=self.progress.emit)
+            self.done.emit(self.path, "")
+        except Exception as e:
+            self.done.emit(self.path, str(e))
+
+
+RANGE_MODES = ["Day", "Week", "Month", "Custom"]
+PAGE_SIZE = 200
+HEATMAP_MONTHS = 24  # ilang buwan ng heatmap yung naka-cache per window
+
+def paint_heatmap(calendar, totals):
+    calendar.setDateTextFormat(QDate(), QTextCharFormat())  # tanggalin yung dating kulay
+    highest = max(totals.values(), default=0)
+    if highest <= 0:
+        return
+    for day, total in totals.items():
+        if total <= 0:
+            continue
+        #mas matingkad kapag mas malaki yung benta (sqrt para kita pa rin yung maliliit)
+        strength = float(total / highest) ** 0.5
+        cell = QTextCharFormat()
+        cell.setBackground(QColor(46, 160, 67, int(40 + 180 * strength)))
+        calendar.setDateTextFormat(QDate(day.year, day.month, day.day), cell)
+
+def heatmap_range(year, month):
+    # kasama yung dulo ng nakaraang buwan at simula ng susunod na nakikita rin sa calendar
+    first = date(year, month, 1)
+    next_first = (first + timedelta(days=32)).replace(day=1)
+    return first - timedelta(days=7), next_first + timedelta(days=14)
+
+def sales_range(mode, selected):
+    #half-open range [start, end) ng dates para magamit yung index sa orderDateTime
+    if mode == "Week":
+        start = selected - timedelta(days=selected.weekday())
+        return start, start + timedelta(days=7)
+    if mode == "Month":
+        start = selected.replace(day=1)
+        return start, (start + timedelta(days=32)).replace(day=1)
+    return selected, selected + timedelta(days=1)
+
+def neighbour_ranges(mode, start, end):
+    # (naunang range, susunod na range) na kapareho ng haba / mode
+    if mode == "Month":
+        return [sales_range("Month", start - timedelta(days=1)), sales_range("Month", end)]
+    length = end - start
+    return [(start - length, start), (end, end + length)]
+
+
+class SalesLoadTask(QObject):
+    # isang load ng sales page sa QThreadPool; pwedeng i-cancel kapag may mas bagong request
+    loaded = pyqtSignal(int, list, object, int)   # generation, sales_data, totals, total_orders
+    failed = pyqtSignal(int, str)                 # generation, error
+    finished = pyqtSignal(object)                 # self, kahit na-cancel
+
+    def __init__(self, generation, user_id, start_date, end_date, page, db_config, version, prefetch=False):
         super().__init__()
+        self.generation = generation
+        self.version = version
+        self.prefetch = prefetch
         self.user_id = user_id
-        self.selected_date = selected_date
-        self.db_config = db_config
+        self.start_date = start_date
+        self.end_date = end_date
+        self.page = page
+        self.db = get_database(db_config)
+        self.reports = SalesReportRepository(self.db)
+
+        self.lock = threading.Lock()
+        self.cancelled = False
+        self.connection_id = None  # habang hawak ng task yung connection lang ito may laman
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            running = self.connection_id is not None
+        if running:
+            #KILL QUERY galing sa ibang connection, sa global pool para hindi maipit sa likod ng loads
+            QThreadPool.globalInstance().start(self.kill_query)
+
+    def kill_query(self):
+        try:
+            with self.db.cursor() as cursor:
+                # naka-lock para hindi ma-kill yung connection kapag naibalik na sa pool
+                with self.lock:
+                    if self.connection_id is not None:
+                        cursor.execute(f"KILL QUERY {int(self.connection_id)}")
+        except mariadb.Error as e:
+            query_stats.log_error("KILL QUERY ?", e, call_site())
+
+    def is_cancelled(self):
+        with self.lock:
+            return self.cancelled
 
     def run(self):
         try:
-            conn = mariadb.connect(**self.db_config)
-            cursor = conn.cursor()
+            if not self.is_cancelled():
+                result, ok, error = self.load()
+                if ok:
+                    sales_cache.put((self.user_id, self.start_date, self.end_date, self.page),
+                                    self.version, result, prefetched=self.prefetch)
+                if not self.is_cancelled():
+                    if error is not None:
+                        self.failed.emit(self.generation, str(error))
+                    else:
+                        self.loaded.emit(self.generation, *result)
+        finally:
+            self.finished.emit(self)
 
-            cursor.execute("""
-                SELECT o.orderId, p.productName, od.quantity, od.totalPrice, o.orderDateTime, p.purchasePrice
-                FROM order_details od
-                JOIN orders o ON od.orderId = o.orderId
-                JOIN products p ON od.productId = p.productId
-                WHERE o.userId = ? AND DATE(o.orderDateTime) = ?
-            """, (self.user_id, self.selected_date))
+    def load(self):
+        # (SalesPage, ok, error); ok = False kapag na-cancel o nag-error, para hindi ma-cache
+        empty = SalesPage([], SalesTotals(Decimal("0.00"), Decimal("0.00")), 0)
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute("SELECT CONNECTION_ID()")
+                with self.lock:
+                    if self.cancelled:
+                        return empty, False, None
+                    self.connection_id = cursor.fetchone()[0]
+                try:
+                    page = self.reports.sales_page(
+                        self.user_id, self.start_date, self.end_date, self.page, PAGE_SIZE, cursor=cursor
+                    )
+                finally:
+                    with self.lock:
+                        self.connection_id = None
+
+        except Exception as e:
+            #"Query execution was interrupted" kapag na-KILL, hindi error yun
+            if self.is_cancelled():
+                return empty, False, None
+            query_stats.log_error("SalesReportRepository.sales_page", e, call_site())
+            return empty, False, e
+        return page, True, None
 
-            sales_data = cursor.fetchall()
 
+class HeatmapTask(QObject):
+    # isang GROUP BY query sa daily_sales_summary para sa buong nakikitang buwan
+    loaded = pyqtSignal(object, object, dict)  # (year, month), version, {date: total sales}
+    finished = pyqtSignal(object)
+
+    def __init__(self, key, user_id, start_date, end_date, db_config, version):
+        super().__init__()
+        self.key = key
+        self.user_id = user_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.db = get_database(db_config)
+        self.version = version
+
+    def run(self):
+        try:
+            totals = SalesReportRepository(self.db).daily_totals(self.user_id, self.start_date, self.end_date)
+            self.loaded.emit(self.key, self.version, totals)
         except Exception as e:
-            print("Error loading sales:", e)
-            sales_data = []
+            #walang shading lang yung calendar, hindi na kailangang istorbohin yung user
+            query_stats.log_error("SalesReportRepository.daily_totals", e, call_site())
         finally:
-            if conn:
-                cursor.close()
-                conn.close()
-            self.finished.emit(sales_data)
+            self.finished.emit(self)
@@ -0,0 +1,134 @@
+import os
+import time
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QMainWindow, QStackedWidget
+from db.config import shell_config
+
+HOME = "dashboard"
+
+def current_rss_mb():
+    # kasalukuyang RSS (hindi peak), galing sa /proc; None kapag hindi Linux
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# isang window lang para sa buong app: naka-cache yung mga screen sa QStackedWidget
+class ShellWindow(QMainWindow):
+    def __init__(self, user_data, db_config, max_screens=6, memory_budget_mb=300, idle_timeout=900):
+        super().__init__()
+        from controls.dashboard_window import DashboardWindow
+
+        self.user_data = user_data
+        self.db_config = db_config
+        self.max_screens = max_screens
+        self.memory_budget_mb = memory_budget_mb
+        self.idle_timeout = idle_timeout
+
+        self.stack = QStackedWidget(self)
+        self.setCentralWidget(self.stack)
+        self.screens = OrderedDict()  # key -> screen, pinaka-recent sa dulo
+        self.screen_sizes = {}
+        self.last_shown = {}
+        self.released = 0
+        self.budget_rss = None  # RSS bago yung huling tanggal dahil sa memory budget
+
+        self.dashboard = DashboardWindow(user_data, db_config, shell=self)
+        self.dashboard.on_login_success(user_data)
+        self.show_screen(HOME, lambda: self.dashboard)
+
+        #pana-panahong tanggalin yung matagal nang hindi binubuksang screens
+        self.idle_timer = QTimer(self)
+        self.idle_timer.timeout.connect(self.release_idle_screens)
+        self.idle_timer.start(60 * 1000)
+
+    def show_screen(self, key, factory):
+        screen = self.screens.get(key)
+        if screen is None:
+            screen = factory()
+            self.screen_sizes[key] = screen.size()  # galing sa geometry ng .ui
+            screen.setWindowFlags(Qt.WindowType.Widget)
+            self.stack.addWidget(screen)
+            self.screens[key] = screen
+        else:
+            # naka-cache na: data lang yung nire-refresh, at kapag luma na lang
+            on_shown = getattr(screen, "on_screen_shown", None)
+            if on_shown:
+                on_shown()
+
+        self.screens.move_to_end(key)
+        self.last_shown[key] = time.monotonic()
+        self.stack.setCurrentWidget(screen)
+        self.setWindowTitle(screen.windowTitle())
+        # lumalaki lang hanggang sa pinakamalaking screen; ang paulit-ulit na resize
+        # kada lipat ng screen ay nagpapalaki ng RSS (nakita sa soak test)
+        self.resize(self.size().expandedTo(self.screen_sizes[key]))
+        self.release_idle_screens()
+        return screen
+
+    def show_home(self):
+        return self.show_screen(HOME, lambda: self.dashboard)
+
+    def release_screen(self, key):
+        screen = self.screens.pop(key)
+        self.screen_sizes.pop(key, None)
+        self.last_shown.pop(key, None)
+        self.stack.removeWidget(screen)
+        screen.deleteLater()
+        self.released += 1
+
+    def _releasable(self):
+        # hindi kasama yung dashboard, yung nakabukas, at yung may tumatakbo pang thread
+        current = self.stack.currentWidget()
+        return [
+            key for key, screen in self.screens.items()
+            if key != HOME and screen is not current
+            and not getattr(screen, "is_busy", lambda: False)()
+        ]
+
+    def release_idle_screens(self):
+        now = time.monotonic()
+        for key in self._releasable():
+            if now - self.last_shown[key] >= self.idle_timeout:
+                self.release_screen(key)
+
+        #LRU: sobra sa max_screens
+        while len(self.screens) > self.max_screens:
+            releasable = self._releasable()
+            if not releasable:
+                break
+            self.release_screen(releasable[0])
+
+        #lampas sa memory budget: isang screen lang kada pass, at tuloy lang kung bumaba yung RSS
+        #pagkatapos ng huling tanggal (madalas hindi na bumababa yung RSS kahit na-free na ng Python)
+        rss = current_rss_mb()
+        if rss is None or rss <= self.memory_budget_mb:
+            self.budget_rss = None
+        elif self.budget_rss is None or rss < self.budget_rss:
+            releasable = self._releasable()
+            if releasable:
+                self.budget_rss = rss
+                self.release_screen(releasable[0])
+
+    def stats(self):
+        return {
+            "screens": list(self.screens),
+            "released": self.released,
+            "rss_mb": current_rss_mb(),
+            "memory_budget_mb": self.memory_budget_mb,
+        }
+
+    def closeEvent(self, event):
+        self.idle_timer.stop()
+        for key in [key for key in self.screens if key != HOME]:
+            if not getattr(self.screens[key], "is_busy", lambda: False)():
+                self.release_screen(key)
+        super().closeEvent(event)
+
+
+def create_shell(user_data, db_config):
+    return ShellWindow(user_data, db_config, **shell_config)
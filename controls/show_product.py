@@ -1,110 +1,127 @@
-import mariadb
 import sys
-from PyQt6 import uic
+from controls.ui_loader import load_ui
+from controls.profiling import profiled
 from PyQt6.QtWidgets import (
-    QMainWindow, QApplication, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QInputDialog
+    QMainWindow, QApplication, QTableView, QPushButton, QMessageBox, QInputDialog
 )
 from db.config import db_config
+from db.db_functions import get_database
+from db.catalog_cache import catalog_cache
+from db.product_repository import MAX_PRICE, MAX_STOCK, ProductRepository
+from PyQt6.QtCore import QEvent, Qt
+from controls.product_table_model import EditableProductTableModel, ButtonDelegate, PriceStockDelegate
 
 class ShowProductsWindow(QMainWindow):
     def __init__(self, user_id, db_config):
         super().__init__()
-        uic.loadUi("ui/show_products.ui", self)
+        load_ui("ui/show_products.ui", self)
         self.user_id = user_id
         self.db_config = db_config
+        self.db = get_database(db_config)
+        self.products = ProductRepository(self.db)
 
-        self.products_table = self.findChild(QTableWidget, "productsTable")
-        self.products_table.setRowCount(0)
-        self.products_table.setColumnCount(6)
-        self.products_table.setHorizontalHeaderLabels(["Product Name", "Price", "Stock", "Update Price", "Update Stock", "Remove"])
+        self.products_table = self.findChild(QTableView, "productsTable")
+        self.products_model = EditableProductTableModel(
+            self.db, self.user_id, ["Update Price", "Update Stock", "Remove"], parent=self
+        )
+        self.products_table.setModel(self.products_model)
+
+        #inline edit ng price/stock; naiipon hanggang i-click yung Save Changes
+        self.edit_delegate = PriceStockDelegate(self.products_table)
+        self.products_table.setItemDelegateForColumn(self.products_model.PRICE, self.edit_delegate)
+        self.products_table.setItemDelegateForColumn(self.products_model.STOCK, self.edit_delegate)
+        self.products_model.pendingChanged.connect(self.on_pending_changed)
+
+        #isang delegate lang para sa lahat ng button columns
+        self.button_delegate = ButtonDelegate(self.products_table)
+        self.button_delegate.clicked.connect(self.on_button_clicked)
+        for column in self.products_model.button_columns:
+            self.products_table.setItemDelegateForColumn(column, self.button_delegate)
 
         self.load_products()
         self.cancel_btn = self.findChild(QPushButton, "cancelBtn")
         self.cancel_btn.clicked.connect(self.go_back)
+        self.save_changes_btn = self.findChild(QPushButton, "saveChangesBtn")
+        self.save_changes_btn.clicked.connect(self.save_changes)
+        self.discard_changes_btn = self.findChild(QPushButton, "discardChangesBtn")
+        self.discard_changes_btn.clicked.connect(self.products_model.discard_changes)
+        self.on_pending_changed(0)
+
+    @profiled()
     def load_products(self):
         try:
-            conn = mariadb.connect(**self.db_config)
-            cursor = conn.cursor()
-            cursor.execute("SELECT productId, productName, price, stock FROM products WHERE userId = ?", (self.user_id,))
-            products = cursor.fetchall()
+            self.products_model.reload()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
 
-            self.products_table.setRowCount(len(products))
+    def on_screen_shown(self):
+        #e.g. may bagong product galing sa Add Product form o may nabenta sa Make Order
+        if self.products_model.is_stale():
+            self.load_products()
 
-            for row, product in enumerate(products):
-                self.products_table.setItem(row, 0, QTableWidgetItem(product[1]))
-                self.products_table.setItem(row, 1, QTableWidgetItem(str(product[2])))
-                self.products_table.setItem(row, 2, QTableWidgetItem(str(product[3])))
+    def event(self, event):
+        if event.type() == QEvent.Type.WindowActivate:
+            self.on_screen_shown()
+        return super().event(event)
 
-                update_price_button = QPushButton("Update Price")
-                update_price_button.clicked.connect(lambda checked, product_id=product[0]: self.update_price(product_id))
-                self.products_table.setCellWidget(row, 3, update_price_button)
+    def on_button_clicked(self, index):
+        actions = [self.update_price, self.update_stock, self.remove_product]
+        actions[index.column() - self.products_model.button_columns.start](index.row())
 
-                update_stock_button = QPushButton("Update Stock")
-                update_stock_button.clicked.connect(lambda checked, product_id=product[0]: self.update_stock(product_id))
-                self.products_table.setCellWidget(row, 4, update_stock_button)
+    def update_price(self, row):
+        #pending lang muna, kasama sa susunod na Save Changes
+        index = self.products_model.index(row, self.products_model.PRICE)
+        price, ok = QInputDialog.getDouble(
+            self, "Update Price", "Enter new price:", index.data(Qt.ItemDataRole.EditRole), 0, float(MAX_PRICE), 2
+        )
+        if ok:
+            self.products_model.setData(index, price)
+
+    def update_stock(self, row):
+        index = self.products_model.index(row, self.products_model.STOCK)
+        stock, ok = QInputDialog.getInt(
+            self, "Update Stock", "Enter new stock:", index.data(Qt.ItemDataRole.EditRole), 0, MAX_STOCK
+        )
+        if ok:
+            self.products_model.setData(index, stock)
 
-                remove_button = QPushButton("Remove")
-                remove_button.clicked.connect(lambda checked, product_id=product[0]: self.remove_product(product_id))
-                self.products_table.setCellWidget(row, 5, remove_button)
+    def on_pending_changed(self, count):
+        self.save_changes_btn.setText(f"Save Changes ({count})" if count else "Save Changes")
+        self.save_changes_btn.setEnabled(bool(count))
+        self.discard_changes_btn.setEnabled(bool(count))
 
+    @profiled()
+    def save_changes(self):
+        try:
+            self.products_model.save_changes()
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
-        finally:
-            if 'conn' in locals():
-                if conn:
-                    cursor.close()
-                    conn.close()
-
-    def update_price(self, product_id):
-        price, ok = QInputDialog.getDouble(self, "Update Price", "Enter new price:")
-        if ok:
-            try:
-                conn = mariadb.connect(**self.db_config)
-                cursor = conn.cursor()
-                cursor.execute("UPDATE products SET price = ? WHERE productId = ?", (price, product_id))
-                conn.commit()
-                self.load_products()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", str(e))
-            finally:
-                if 'conn' in locals():
-                    if conn:
-                        cursor.close()
-                        conn.close()
+            return
+        if self.products_model.conflicts:
+            QMessageBox.warning(
+                self, "Stock Changed",
+                f"{len(self.products_model.conflicts)} product(s) had sales or other stock changes after you edited them. "
+                "Their stock was not saved. The table now shows the current stock, and your values are still pending. "
+                "Save again to overwrite it."
+            )
 
-    def update_stock(self, product_id):
-        stock, ok = QInputDialog.getInt(self, "Update Stock", "Enter new stock:")
-        if ok:
-            try:
-                conn = mariadb.connect(**self.db_config)
-                cursor = conn.cursor()
-                cursor.execute("UPDATE products SET stock = ? WHERE productId = ?", (stock, product_id))
-                conn.commit()
-                self.load_products()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", str(e))
-            finally:
-                if 'conn' in locals():
-                    if conn:
-                        cursor.close()
-                        conn.close()
+    def is_busy(self):
+        # may hindi pa nasa-save: wag i-release ng shell
+        return bool(self.products_model.pending)
 
-    def remove_product(self, product_id):
+    @profiled()
+    def remove_product(self, row):
+        product_id = self.products_model.product_id(row)
         reply = QMessageBox.question(self, "Remove Product", "Are you sure you want to remove this product?")
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                conn = mariadb.connect(**self.db_config)
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM products WHERE productId = ?", (product_id,))
-                conn.commit()
+                self.products.remove(self.user_id, product_id)
+                catalog_cache.invalidate(self.user_id)
+                if self.products_model.pending.pop(product_id, None):
+                    self.products_model.pendingChanged.emit(len(self.products_model.pending))
                 self.load_products()
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
-            finally:
-                if 'conn' in locals():
-                    if conn:
-                        cursor.close()
-                        conn.close()
     def go_back(self):
         self.close()
 if __name__ == "__main__":
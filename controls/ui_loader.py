@@ -0,0 +1,58 @@
+import importlib.util
+import os
+from db.config import ui_config
+
+UI_CACHE_DIR = os.path.join("ui", "_compiled")
+
+# .ui -> Python module na naka-cache sa ui/_compiled, para walang XML parsing tuwing bubuksan yung window
+def _compile(ui_path, py_path, source_mtime):
+    from PyQt6 import uic  # mabigat i-import, kaya kapag may ico-compile lang
+
+    os.makedirs(os.path.dirname(py_path), exist_ok=True)
+    tmp_path = f"{py_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as py_file:
+        uic.compileUi(ui_path, py_file)
+        py_file.write(f"\nSOURCE_MTIME_NS = {source_mtime}\n")
+    os.replace(tmp_path, py_path)
+
+def _import(name, py_path):
+    # SourceFileLoader, kaya naka-cache din yung bytecode sa __pycache__
+    spec = importlib.util.spec_from_file_location(f"ui._compiled.{name}", py_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_modules = {}  # py_path -> module na na-import na ngayong process
+
+def compiled_ui_module(ui_path):
+    name = os.path.splitext(os.path.basename(ui_path))[0]
+    py_path = os.path.join(UI_CACHE_DIR, f"{name}_ui.py")
+    source_mtime = os.stat(ui_path).st_mtime_ns
+
+    module = _modules.get(py_path)
+    if module is not None and module.SOURCE_MTIME_NS == source_mtime:
+        return module
+
+    if not os.path.exists(py_path):
+        _compile(ui_path, py_path, source_mtime)
+    module = _import(name, py_path)
+    #iba na yung mtime ng .ui (na-edit o na-checkout), i-compile ulit
+    if getattr(module, "SOURCE_MTIME_NS", None) != source_mtime:
+        _compile(ui_path, py_path, source_mtime)
+        module = _import(name, py_path)
+    _modules[py_path] = module
+    return module
+
+def load_ui(ui_path, widget):
+    # kapalit ng uic.loadUi(ui_path, widget): parehong attributes (e.g. self.loginBtn) sa widget
+    if not ui_config["compiled"]:
+        from PyQt6 import uic
+        uic.loadUi(ui_path, widget)
+        return
+
+    module = compiled_ui_module(ui_path)
+    ui_class = next(getattr(module, attr) for attr in dir(module) if attr.startswith("Ui_"))
+    ui = ui_class()
+    ui.setupUi(widget)
+    for attr, value in vars(ui).items():
+        setattr(widget, attr, value)
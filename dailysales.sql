@@ -35,7 +35,8 @@ CREATE TABLE `orders` (
   `totalPrice` decimal(10,2) NOT NULL,
   `totalMoney` decimal(10,2) DEFAULT 0.00,
   `changeAmount` decimal(10,2) DEFAULT 0.00,
-  `orderDateTime` datetime DEFAULT current_timestamp()
+  `orderDateTime` datetime DEFAULT current_timestamp(),
+  `clientOrderKey` char(32) DEFAULT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 --
@@ -61,7 +62,8 @@ CREATE TABLE `order_details` (
   `orderId` int(11) NOT NULL,
   `productId` int(11) NOT NULL,
   `quantity` int(11) NOT NULL,
-  `totalPrice` decimal(10,2) NOT NULL
+  `totalPrice` decimal(10,2) NOT NULL,
+  `unitCost` decimal(10,2) NOT NULL DEFAULT 0.00
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 --
@@ -81,6 +83,34 @@ INSERT INTO `order_details` (`orderDetailId`, `orderId`, `productId`, `quantity`
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `daily_sales_summary`
+--
+
+CREATE TABLE `daily_sales_summary` (
+  `userId` int(11) NOT NULL,
+  `salesDate` date NOT NULL,
+  `productId` int(11) NOT NULL,
+  `quantity` int(11) NOT NULL DEFAULT 0,
+  `totalSales` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `totalPurchase` decimal(14,2) NOT NULL DEFAULT 0.00
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+--
+-- Dumping data for table `daily_sales_summary`
+--
+
+INSERT INTO `daily_sales_summary` (`userId`, `salesDate`, `productId`, `quantity`, `totalSales`, `totalPurchase`) VALUES
+(9, '2025-04-22', 2, 2, 24.00, 0.00),
+(9, '2025-04-22', 3, 1, 34.00, 0.00),
+(9, '2025-04-22', 4, 2, 20.00, 0.00),
+(9, '2025-04-22', 5, 2, 40.00, 0.00),
+(9, '2025-05-01', 4, 1, 10.00, 0.00),
+(9, '2025-05-04', 2, 1, 12.00, 0.00),
+(9, '2025-05-04', 3, 2, 68.00, 0.00);
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `products`
 --
@@ -88,7 +118,9 @@ INSERT INTO `order_details` (`orderDetailId`, `orderId`, `productId`, `quantity`
 CREATE TABLE `products` (
   `productId` int(11) NOT NULL,
   `productName` varchar(100) NOT NULL,
+  `sku` varchar(64) DEFAULT NULL,
   `price` decimal(10,2) NOT NULL,
+  `purchasePrice` decimal(10,2) NOT NULL DEFAULT 0.00,
   `stock` int(11) NOT NULL,
   `userId` int(11) NOT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
@@ -114,10 +146,10 @@ CREATE TABLE `user` (
   `userId` int(11) NOT NULL,
   `name` varchar(100) NOT NULL,
   `username` varchar(50) NOT NULL,
-  `password` varchar(100) NOT NULL,
+  `password` varchar(255) NOT NULL,
   `gender` enum('Male','Female','Other') DEFAULT NULL,
   `accountDateCreated` datetime DEFAULT current_timestamp(),
-  `favoriteFood` varchar(100) DEFAULT NULL
+  `favoriteFood` varchar(255) DEFAULT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 --
@@ -137,7 +169,9 @@ INSERT INTO `user` (`userId`, `name`, `username`, `password`, `gender`, `account
 ALTER TABLE `orders`
   ADD PRIMARY KEY (`orderId`),
   ADD KEY `userId` (`userId`),
-  ADD KEY `orders_ibfk_1` (`productId`);
+  ADD KEY `orders_ibfk_1` (`productId`),
+  ADD UNIQUE KEY `uq_orders_client_key` (`clientOrderKey`),
+  ADD KEY `idx_orders_user_datetime` (`userId`,`orderDateTime`);
 
 --
 -- Indexes for table `order_details`
@@ -145,13 +179,22 @@ ALTER TABLE `orders`
 ALTER TABLE `order_details`
   ADD PRIMARY KEY (`orderDetailId`),
   ADD KEY `orderId` (`orderId`),
-  ADD KEY `productId` (`productId`);
+  ADD KEY `productId` (`productId`),
+  ADD KEY `idx_order_details_order_product` (`orderId`,`productId`,`quantity`,`totalPrice`);
+
+--
+-- Indexes for table `daily_sales_summary`
+--
+ALTER TABLE `daily_sales_summary`
+  ADD PRIMARY KEY (`userId`,`salesDate`,`productId`),
+  ADD KEY `idx_daily_sales_summary_product` (`productId`);
 
 --
 -- Indexes for table `products`
 --
 ALTER TABLE `products`
   ADD PRIMARY KEY (`productId`),
+  ADD UNIQUE KEY `uq_products_user_sku` (`userId`,`sku`),
   ADD KEY `fk_user_products` (`userId`);
 
 --
@@ -206,6 +249,13 @@ ALTER TABLE `order_details`
   ADD CONSTRAINT `order_details_ibfk_1` FOREIGN KEY (`orderId`) REFERENCES `orders` (`orderId`) ON DELETE CASCADE,
   ADD CONSTRAINT `order_details_ibfk_2` FOREIGN KEY (`productId`) REFERENCES `products` (`productId`) ON DELETE CASCADE;
 
+--
+-- Constraints for table `daily_sales_summary`
+--
+ALTER TABLE `daily_sales_summary`
+  ADD CONSTRAINT `daily_sales_summary_ibfk_1` FOREIGN KEY (`userId`) REFERENCES `user` (`userId`) ON DELETE CASCADE,
+  ADD CONSTRAINT `daily_sales_summary_ibfk_2` FOREIGN KEY (`productId`) REFERENCES `products` (`productId`) ON DELETE CASCADE;
+
 --
 -- Constraints for table `products`
 --
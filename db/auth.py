@@ -0,0 +1,124 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from db import passwords
+from db.config import auth_config
+
+class AuthError(ValueError):
+    pass
+
+USER_COLUMNS = "userId, name, username, password, gender, accountDateCreated, favoriteFood"
+
+# login/register/change password; yung PBKDF2 ay sa worker threads, hindi sa Qt thread
+# (nire-release ng hashlib yung GIL kaya sabay-sabay talaga yung logins)
+class AuthService:
+    def __init__(self, db, iterations=600000, workers=2):
+        self.db = db
+        self.iterations = iterations
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth")
+
+    # submit_* ay nagbabalik ng Future; yung walang submit ay blocking (para sa benchmarks)
+    def submit_login(self, username, password):
+        return self.executor.submit(self.login, username, password)
+
+    def submit_register(self, name, username, password, gender, favorite_food):
+        return self.executor.submit(self.register, name, username, password, gender, favorite_food)
+
+    def submit_verify_favorite_food(self, username, favorite_food):
+        return self.executor.submit(self.verify_favorite_food, username, favorite_food)
+
+    def submit_change_password(self, username, new_password):
+        return self.executor.submit(self.change_password, username, new_password)
+
+    def login(self, username, password):
+        """Return the user row (dict) if the password matches, otherwise None.
+
+        Raises AuthError when the username is not registered. A hash stored
+        in the legacy format or with a different iteration count is replaced
+        with one at the configured cost.
+        """
+        self.db.connect()
+        rows = self.db.execute_query(f"SELECT {USER_COLUMNS} FROM user WHERE username = ?", (username,))
+        if rows is None:
+            raise AuthError(f"Could not reach the database: {self.db.last_error}")
+        if not rows:
+            raise AuthError(f"Account '{username}' isn't registered.")
+        user = rows[0]
+        if not passwords.verify_secret(password, user["password"]):
+            return None
+
+        #transparent rehash: tama na yung password kaya pwede nang palitan yung hash
+        if passwords.needs_rehash(user["password"], self.iterations):
+            new_hash = passwords.hash_secret(password, self.iterations)
+            if self.db.execute_non_query(
+                "UPDATE user SET password = ? WHERE userId = ? AND password = ?",
+                (new_hash, user["userId"], user["password"])
+            ):
+                user["password"] = new_hash
+        return user
+
+    def register(self, name, username, password, gender, favorite_food):
+        existing = self.db.execute_query("SELECT username FROM user WHERE username = ?", (username,))
+        if existing is None:
+            raise AuthError(f"Could not reach the database: {self.db.last_error}")
+        if existing:
+            raise AuthError("Username already exists.")
+
+        # sabay na i-hash yung password at favorite food (hiwalay na thread, hindi sa executor
+        # para walang deadlock kapag isa lang yung worker)
+        food_hash = []
+        food_thread = threading.Thread(
+            target=lambda: food_hash.append(passwords.hash_secret(favorite_food, self.iterations))
+        )
+        food_thread.start()
+        password_hash = passwords.hash_secret(password, self.iterations)
+        food_thread.join()
+
+        if not self.db.execute_non_query("""
+            INSERT INTO user (name, username, password, gender, favoriteFood)
+            VALUES (?, ?, ?, ?, ?)
+        """, (name, username, password_hash, gender, food_hash[0])):
+            raise AuthError(f"Registration failed: {self.db.last_error}")
+
+    def verify_favorite_food(self, username, favorite_food):
+        rows = self.db.execute_query(
+            "SELECT userId, favoriteFood FROM user WHERE LOWER(username) = LOWER(?)", (username,)
+        )
+        if rows is None:
+            raise AuthError(f"An error occurred during the database query: {self.db.last_error}")
+        if not rows or not rows[0]["favoriteFood"]:
+            raise AuthError("User not found or no favorite food set.")
+
+        stored = rows[0]["favoriteFood"]
+        if passwords.parse(stored) is None:
+            raise AuthError("Stored favorite food format is invalid.")
+        if not passwords.verify_secret(favorite_food, stored):
+            return False
+        if passwords.needs_rehash(stored, self.iterations):
+            self.db.execute_non_query(
+                "UPDATE user SET favoriteFood = ? WHERE userId = ?",
+                (passwords.hash_secret(favorite_food, self.iterations), rows[0]["userId"])
+            )
+        return True
+
+    def change_password(self, username, new_password):
+        password_hash = passwords.hash_secret(new_password, self.iterations)
+        if not self.db.execute_non_query(
+            "UPDATE user SET password = ? WHERE username = ?", (password_hash, username)
+        ):
+            raise AuthError(f"Failed to update password in the database: {self.db.last_error}")
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+#isang AuthService (at worker pool) lang per Database
+_services = {}
+_services_lock = threading.Lock()
+
+def get_auth_service(db):
+    with _services_lock:
+        service = _services.get(db)
+        if service is None:
+            service = AuthService(db, **auth_config)
+            _services[db] = service
+        return service
@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from db.config import catalog_cache_config
+from db.product_repository import ProductRepository
+
+# snapshot ng lahat ng products ng isang user, galing sa isang query lang
+class Catalog:
+    def __init__(self, rows, skus=None):
+        self.rows = rows  # Product(product_id, name, price, stock) na naka-sort sa productId
+        self.positions = {row[0]: position for position, row in enumerate(rows)}
+        self.by_sku = skus or {}  # sku -> position sa rows
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def load(cls, db, user_id):
+        return cls(*ProductRepository(db).catalog(user_id))
+
+    def update(self, product_id, price=None, stock=None):
+        # pinapalitan yung row sa parehong position para valid pa rin yung search index
+        position = self.positions.get(product_id)
+        if position is None:
+            return False
+        row = self.rows[position]
+        self.rows[position] = row._replace(
+            price=row.price if price is None else price,
+            stock=row.stock if stock is None else stock,
+        )
+        return True
+
+
+# process-wide na cache ng catalogs per userId (LRU + TTL)
+class CatalogCache:
+    def __init__(self, max_users=8, ttl=300):
+        if max_users < 1:
+            raise ValueError("Invalid cache size: max_users must be at least 1.")
+        self.max_users = max_users
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # userId -> Catalog, pinaka-recent sa dulo
+        self._versions = {}  # userId -> counter, tumataas sa bawat pagbabago
+
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+        self._invalidations = 0
+
+    def _bump_locked(self, user_id):
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def version(self, user_id):
+        # ikumpara ng mga window sa version na nakita nila para malaman kung luma na sila
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def get(self, db, user_id):
+        with self._lock:
+            catalog = self._entries.get(user_id)
+            if catalog is not None:
+                if time.monotonic() - catalog.loaded_at < self.ttl:
+                    self._entries.move_to_end(user_id)
+                    self._hits += 1
+                    return catalog
+                #expired: baka may binago yung ibang terminal, kaya bagong version din
+                del self._entries[user_id]
+                self._expired += 1
+                self._bump_locked(user_id)
+            self._misses += 1
+            version = self._versions.get(user_id, 0)
+
+        catalog = Catalog.load(db, user_id)
+
+        with self._lock:
+            # kung may write habang naglo-load, wag i-cache (baka luma na), gamitin lang ngayon
+            if self._versions.get(user_id, 0) == version:
+                self._entries[user_id] = catalog
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+                    self._evicted += 1
+        return catalog
+
+    def peek(self, user_id):
+        # naka-cache na catalog na hindi pa expired, o None; hindi naglo-load galing sa database
+        with self._lock:
+            catalog = self._entries.get(user_id)
+            if catalog is None or time.monotonic() - catalog.loaded_at >= self.ttl:
+                return None
+            self._entries.move_to_end(user_id)
+            self._hits += 1
+            return catalog
+
+    def update_product(self, user_id, product_id, price=None, stock=None):
+        #write-through para sa price/stock, hindi na kailangan i-reload yung buong catalog
+        with self._lock:
+            catalog = self._entries.get(user_id)
+            if catalog is not None and not catalog.update(product_id, price, stock):
+                del self._entries[user_id]  # wala sa cache yung product, reload na lang
+            self._bump_locked(user_id)
+
+    def update_products(self, user_id, changes):
+        # changes: productId -> (price, stock), None = hindi binago; isang version bump lang para sa buong batch
+        with self._lock:
+            catalog = self._entries.get(user_id)
+            if catalog is not None:
+                for product_id, (price, stock) in changes.items():
+                    if not catalog.update(product_id, price, stock):
+                        del self._entries[user_id]
+                        break
+            self._bump_locked(user_id)
+            return self._versions[user_id]
+
+    def adjust_stock(self, user_id, deltas):
+        # deltas: productId -> dagdag/bawas sa stock (e.g. -quantity pagkatapos ng checkout)
+        with self._lock:
+            catalog = self._entries.get(user_id)
+            if catalog is not None:
+                for product_id, delta in deltas.items():
+                    position = catalog.positions.get(product_id)
+                    if position is None:
+                        del self._entries[user_id]
+                        break
+                    catalog.update(product_id, stock=catalog.rows[position].stock + delta)
+            self._bump_locked(user_id)
+
+    def invalidate(self, user_id):
+        # para sa add/remove ng product: nagbabago yung positions kaya buong reload
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidations += 1
+            self._bump_locked(user_id)
+
+    def clear(self):
+        with self._lock:
+            for user_id in self._entries:
+                self._bump_locked(user_id)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "users": len(self._entries),
+                "max_users": self.max_users,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "expired": self._expired,
+                "evicted": self._evicted,
+                "invalidations": self._invalidations,
+            }
+
+
+catalog_cache = CatalogCache(**catalog_cache_config)
@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from db import rollup
+from db.catalog_cache import catalog_cache
+
+class CheckoutError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class ReceiptLine:
+    product_id: int
+    name: str
+    quantity: int
+    price: Decimal
+    total: Decimal
+
+@dataclass(frozen=True)
+class Receipt:
+    order_id: int
+    user_id: int
+    lines: list = field(default_factory=list)
+    total: Decimal = Decimal("0.00")
+    payment: Decimal = Decimal("0.00")
+    change: Decimal = Decimal("0.00")
+    created_at: datetime = None
+    order_key: str = None  # clientOrderKey; kapag offline (journal) wala pang order_id hanggang ma-flush
+
+    def summary(self):
+        return "\n".join(f"{line.name} x {line.quantity} - {line.total:.2f}" for line in self.lines)
+
+
+def _merge_items(items):
+    # pagsamahin yung parehong product para isang UPDATE lang per product
+    quantities = {}
+    for product_id, quantity in items:
+        if quantity <= 0:
+            continue
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    return quantities
+
+def _receipt_lines(quantities, prices):
+    # prices: productId -> (name, price); ReceiptLines na naka-sort sa productId at yung total
+    lines = []
+    total = Decimal("0.00")
+    for product_id in sorted(quantities):
+        name, price = prices[product_id]
+        quantity = quantities[product_id]
+        line_total = price * quantity
+        total += line_total
+        lines.append(ReceiptLine(product_id, name, quantity, price, line_total))
+    return lines, total
+
+def _check_payment(payment, total):
+    payment = total if payment is None else Decimal(payment)
+    if payment < total:
+        raise CheckoutError(f"Payment {payment:.2f} is less than the total {total:.2f}.")
+    return payment
+
+def _record_sale(cursor, user_id, quantities, payment, order_key=None):
+    # buong sale sa transaction ng cursor; inuulit ng Database.transaction kapag deadlock
+    product_ids = sorted(quantities)
+    placeholders = ", ".join("?" for _ in product_ids)
+
+    #i-lock muna yung product rows (naka-sort sa productId para pare-pareho yung order ng locks
+    #sa lahat ng terminal); yung ibang terminal na may parehong product ay maghihintay dito
+    cursor.execute(
+        f"SELECT productId, productName, price, purchasePrice, stock FROM products "
+        f"WHERE userId = ? AND productId IN ({placeholders}) ORDER BY productId FOR UPDATE",
+        (user_id, *product_ids)
+    )
+    products = {row[0]: (row[1], Decimal(row[2]), Decimal(row[3]), row[4]) for row in cursor.fetchall()}
+
+    missing = [product_id for product_id in product_ids if product_id not in products]
+    if missing:
+        catalog_cache.invalidate(user_id)  # luma na yung nakikita ng mga window
+        raise CheckoutError(f"Product with ID {missing[0]} has been removed or no longer exists.")
+
+    lines, total = _receipt_lines(
+        quantities, {product_id: row[:2] for product_id, row in products.items()}
+    )
+    payment = _check_payment(payment, total)
+
+    #naka-lock na yung stock, kaya hindi na magbabago hanggang commit
+    short = [line.name for line in lines if products[line.product_id][3] < line.quantity]
+    if short:
+        catalog_cache.invalidate(user_id)
+        raise CheckoutError(f"Not enough stock for: {', '.join(short)}.")
+
+    cursor.executemany(
+        "UPDATE products SET stock = stock - ? WHERE productId = ? AND userId = ?",
+        [(line.quantity, line.product_id, user_id) for line in lines]
+    )
+
+    created_at = datetime.now().replace(microsecond=0)
+    cursor.execute("""
+        INSERT INTO orders (userId, totalPrice, totalMoney, changeAmount, orderDateTime, clientOrderKey)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (user_id, total, total, payment - total, created_at, order_key))
+    order_id = cursor.lastrowid
+
+    cursor.executemany("""
+        INSERT INTO order_details (orderId, productId, quantity, totalPrice, unitCost)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (order_id, line.product_id, line.quantity, line.total, products[line.product_id][2])
+        for line in lines
+    ])
+
+    #rollup sa parehong transaction para laging tugma sa raw tables
+    rollup.add_sale(cursor, user_id, created_at.date(), [
+        (line.product_id, line.quantity, line.total, products[line.product_id][2] * line.quantity)
+        for line in lines
+    ])
+    return Receipt(order_id, user_id, lines, total, payment, payment - total, created_at, order_key)
+
+def checkout(db, user_id, items, payment=None, order_key=None, acquire_timeout=None):
+    """Record a whole sale in one transaction and return its Receipt.
+
+    items is an iterable of (productId, quantity). The product rows are
+    locked with SELECT ... FOR UPDATE in productId order, so terminals
+    selling the same products take turns instead of both passing the stock
+    check. A short or missing product raises CheckoutError; deadlocks and
+    lock wait timeouts are retried by Database.transaction. order_key is
+    stored as the order's clientOrderKey. acquire_timeout bounds the wait
+    for a pooled connection (see Database.transaction).
+    """
+    quantities = _merge_items(items)
+    if not quantities:
+        raise CheckoutError("Please select at least one product.")
+
+    receipt = db.transaction(
+        lambda cursor: _record_sale(cursor, user_id, quantities, payment, order_key), acquire_timeout=acquire_timeout
+    )
+
+    #committed na, write-through ng bagong stock sa catalog cache
+    catalog_cache.adjust_stock(user_id, {line.product_id: -line.quantity for line in receipt.lines})
+    rollup.mark_changed(user_id, receipt.created_at.date())
+    return receipt
@@ -3,5 +3,87 @@ db_config = {
     'host': 'localhost',
     'user': 'root',
     'password': "",
-    'database': 'dailysales'
+    'database': 'dailysales',
+    'connect_timeout': 5            # seconds; hindi maghihintay nang matagal kapag hindi maabot yung server
+}
+
+#connection pool settings (hiwalay sa db_config kasi diretso yun sa mariadb.connect)
+pool_config = {
+    'min_size': 1,
+    'max_size': 5,
+    'acquire_timeout': 10,          # seconds na maghihintay kapag puno na yung pool
+    'idle_timeout': 300,            # seconds bago isara yung idle na connection (above min_size)
+    'health_check_interval': 30     # seconds bago i-ping ulit yung idle na connection
+}
+
+#transactions na may row locks (checkout, order journal flush): retry kapag deadlock o lock wait timeout
+transaction_config = {
+    'lock_retries': 5,              # ilang beses uulitin yung buong transaction bago sumuko
+    'retry_delay_ms': 20            # base ng random na hintay bago umulit; dumodoble bawat retry
+}
+
+#product catalog cache (db/catalog_cache.py), per userId
+catalog_cache_config = {
+    'max_users': 8,                 # ilang users yung naka-cache bago tanggalin yung least recently used
+    'ttl': 300                      # seconds bago i-reload para makita yung binago ng ibang terminal
+}
+
+#password hashing (db/auth.py); kapag binago yung iterations, nire-rehash sa susunod na login
+auth_config = {
+    'iterations': 600000,           # PBKDF2-SHA256 iterations para sa bagong hashes
+    'workers': 2                    # threads para sa hashing, hiwalay sa Qt thread
+}
+
+#startup: compiled na .ui modules (ui/_compiled) imbes na uic.loadUi tuwing bubuksan yung window
+ui_config = {
+    'compiled': True                # False = uic.loadUi ng .ui XML sa runtime (dating behavior)
+}
+
+#single-window shell (controls/shell_window.py): naka-cache na screens
+shell_config = {
+    'max_screens': 6,               # ilang screens (kasama dashboard) yung naka-cache
+    'memory_budget_mb': 300,        # kapag lampas sa RSS na ito, tanggalin yung least recently used
+    'idle_timeout': 900             # seconds bago tanggalin yung screen na hindi binubuksan
+}
+
+#sales history loading (controls/sales_history.py)
+sales_loader_config = {
+    'debounce_ms': 250,             # hintay muna pagkatapos ng huling click bago mag-query
+    'max_threads': 2                # QThreadPool threads para sa sales queries
+}
+
+#sales history result cache (db/sales_cache.py)
+sales_cache_config = {
+    'max_entries': 256,             # ilang pages (range + page) yung naka-cache
+    'max_mb': 32,                   # tantyang memory limit ng lahat ng naka-cache na pages
+    'live_ttl': 30                  # seconds; pages na kasama ngayong araw, para makita yung benta ng ibang terminal
+}
+
+#query instrumentation (db/query_stats.py): latency per statement, call site, slow-query log
+query_stats_config = {
+    'enabled': True,                # False = diretso yung cursor, walang timing
+    'slow_ms': 200,                 # statements na mas mabagal dito ay isinusulat sa slow_log
+    'slow_log': 'logs/slow_queries.log'
+}
+
+#event-loop watchdog at profiling ng button handlers (controls/profiling.py); naka-off by default
+profiling_config = {
+    'watchdog': False,              # True = i-log yung stack ng GUI thread kapag na-freeze
+    'stall_ms': 250,                # ilang ms na hindi umiikot yung event loop bago ituring na stall
+    'interval_ms': 50,              # gaano kadalas mag-tick yung watchdog timer
+    'actions': 'off',               # 'off', 'wall' (oras lang) o 'cprofile' (pati top functions)
+    'slow_action_ms': 100,          # sa 'wall', yung mas mabagal lang dito yung isinusulat sa log
+    'log': 'logs/profiling.log'
+}
+
+#lokal na order journal (db/order_journal.py): naka-lock na checkout sa background thread; kapag mabagal
+#o hindi maabot yung MariaDB, sa SQLite muna yung benta at ang flusher thread ang magsusulat sa database
+order_journal_config = {
+    'enabled': True,                # False = walang journal, hinihintay ng till yung database
+    'checkout_deadline': 1.5,       # seconds na hihintayin ng till yung checkout bago i-journal yung benta
+    'acquire_timeout': 1,           # seconds na hintay ng checkout sa connection (imbes na pool acquire_timeout)
+    'path': 'data/order_journal.sqlite3',
+    'batch_size': 50,               # ilang benta per transaction sa MariaDB
+    'flush_interval': 1.0,          # seconds; gigisingin din agad kapag may bagong benta
+    'max_backoff': 60               # seconds na pinakamatagal na hintay bago subukan ulit kapag offline
 }
@@ -1,41 +1,340 @@
+import atexit
+import random
+import threading
+import time
+from contextlib import contextmanager
 import mariadb
+from db.config import pool_config, transaction_config
+from db.query_stats import InstrumentedConnection, call_site, query_stats
+
+# ER_LOCK_DEADLOCK at ER_LOCK_WAIT_TIMEOUT: walang mali sa transaction, naunahan lang ng ibang terminal
+LOCK_CONFLICT_ERRNOS = (1213, 1205)
+
+def is_lock_conflict(error):
+    return getattr(error, "errno", None) in LOCK_CONFLICT_ERRNOS
+
+
+# session settings ng bawat bagong connection, para pare-pareho kahit anong connection yung mahiram
+SESSION_SQL = (
+    "SET SESSION group_concat_max_len = 65535",  # products/quantities ng isang order (sales history, exports)
+)
+
+# connection pool para hindi na mag-connect ulit sa bawat button press
+class ConnectionPool:
+    def __init__(self, config, min_size=1, max_size=5, acquire_timeout=10,
+                 idle_timeout=300, health_check_interval=30):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: min_size must be between 0 and max_size.")
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition()
+        self._idle = []  # (conn, last_used), pinakabago sa dulo
+        self._size = 0   # lahat ng bukas na connection (idle + in use)
+        self._in_use = 0
+        self._closed = False
+
+        #pool stats para ma-size natin ng tama
+        self._borrows = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._health_check_failures = 0
+        self._evicted = 0
+
+    def _open(self):
+        conn = mariadb.connect(**self.config)
+        try:
+            cursor = conn.cursor()
+            for sql in SESSION_SQL:
+                cursor.execute(sql)
+            cursor.close()
+        except mariadb.Error:
+            self._close_quietly(conn)
+            raise
+        return conn
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except mariadb.Error:
+            pass
+
+    def fill(self):
+        # buksan agad yung min_size para walang handshake sa unang click
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def _take_expired_locked(self, now):
+        #idle eviction: luma na sa harap ng list kasi LIFO yung reuse
+        expired = []
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.pop(0)
+            self._size -= 1
+            self._evicted += 1
+            expired.append(conn)
+        return expired
+
+    def _health_check(self, conn):
+        try:
+            conn.ping()
+            return conn
+        except mariadb.Error:
+            with self._cond:
+                self._health_check_failures += 1
+            self._close_quietly(conn)
+            return self._open()
+
+    def acquire(self, timeout=None):
+        # timeout = mas maikling hintay para sa isang caller (e.g. checkout); None = acquire_timeout
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+        expired = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise mariadb.PoolError("Connection pool is closed.")
+                    expired.extend(self._take_expired_locked(time.monotonic()))
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        conn, last_used = None, None
+                        break
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise mariadb.PoolError(
+                            f"Timed out after {timeout}s waiting for a database connection."
+                        )
+                    self._cond.wait(remaining)
+        finally:
+            for old_conn in expired:
+                self._close_quietly(old_conn)
+
+        try:
+            if conn is None:
+                conn = self._open()
+            elif time.monotonic() - last_used >= self.health_check_interval:
+                conn = self._health_check(conn)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.perf_counter() - start
+        with self._cond:
+            self._in_use += 1
+            self._borrows += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def release(self, conn, discard=False, clean=False):
+        # clean = na-commit o na-rollback na ng caller, kaya walang extra round trip para sa rollback
+        if not discard and not clean:
+            try:
+                conn.rollback()  # wag ibalik sa pool na may naka-open na transaction
+            except mariadb.Error:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._close_quietly(conn)
+
+    def evict_idle(self):
+        with self._cond:
+            expired = self._take_expired_locked(time.monotonic())
+        for conn in expired:
+            self._close_quietly(conn)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle = []
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "borrows": self._borrows,
+                "timeouts": self._timeouts,
+                "wait_avg_ms": (self._wait_total / self._borrows * 1000) if self._borrows else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+                "health_check_failures": self._health_check_failures,
+                "evicted": self._evicted,
+            }
+
+
 # ito sa mga functions like yang execute query
 class Database:
-    def __init__(self, config):
+    def __init__(self, config, pool_settings=None):
         self.config = config
-        self.conn = None
-        self.cursor = None
+        self.pool = ConnectionPool(config, **(pool_settings or pool_config))
+        self._retries_lock = threading.Lock()
+        self.lock_retries = 0   # transactions na inulit dahil sa deadlock/lock wait timeout
+        self.lock_failures = 0  # sumuko na pagkatapos ng lahat ng retries
+        self._local = threading.local()  # last_error per thread (GUI, auth workers, loaders)
+
+    @contextmanager
+    def connection(self, acquire_timeout=None):
+        # commit kapag walang error, rollback kapag meron
+        stats = query_stats if query_stats.enabled else None
+        if stats is None:
+            conn = self.pool.acquire(acquire_timeout)
+        else:
+            #isang beses lang hanapin yung call site, para sa lahat ng statements sa connection na ito
+            site = call_site()
+            start = time.perf_counter()
+            conn = self.pool.acquire(acquire_timeout)
+            stats.record_acquire(time.perf_counter() - start, site)
+        broken = False
+        try:
+            yield conn if stats is None else InstrumentedConnection(conn, stats, site)
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except mariadb.Error:
+                broken = True  # patay na yung connection, wag nang ibalik sa pool
+            raise
+        finally:
+            #laging tapos na yung transaction dito (commit o rollback), o sira na yung connection
+            self.pool.release(conn, discard=broken, clean=True)
+
+    @contextmanager
+    def cursor(self, acquire_timeout=None, **kwargs):
+        # kwargs diretso sa conn.cursor(), e.g. dictionary=True o buffered=False para sa streaming
+        with self.connection(acquire_timeout) as conn:
+            cursor = conn.cursor(**kwargs)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def transaction(self, fn, retries=None, acquire_timeout=None):
+        """Run fn(cursor) in one transaction and return its result.
+
+        On a deadlock or lock wait timeout the transaction is rolled back and
+        fn runs again after a short random delay, up to retries more times, so
+        fn must not change anything outside the database before it returns.
+        acquire_timeout overrides the pool's wait for a free connection.
+        """
+        retries = transaction_config["lock_retries"] if retries is None else retries
+        attempt = 0
+        while True:
+            try:
+                with self.cursor(acquire_timeout) as cursor:
+                    return fn(cursor)
+            except mariadb.Error as e:
+                if not is_lock_conflict(e):
+                    raise
+                with self._retries_lock:
+                    if attempt >= retries:
+                        self.lock_failures += 1
+                        raise
+                    self.lock_retries += 1
+            #random para hindi sabay ulit yung dalawang nag-deadlock
+            time.sleep(random.uniform(0.5, 1.0) * transaction_config["retry_delay_ms"] * 2 ** attempt / 1000)
+            attempt += 1
 
     def connect(self):
-        if self.conn is None:
-            self.conn = mariadb.connect(**self.config)
-            self.cursor = self.conn.cursor(dictionary=True)
+        self.pool.fill()
 
     def disconnect(self):
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
-            self.conn = None
-            self.cursor = None
+        # naka-pool na, kaya yung sobrang idle connections lang yung isasara
+        self.pool.evict_idle()
+
+    def close(self):
+        self.pool.close()
+
+    def stats(self):
+        with self._retries_lock:
+            return dict(self.pool.stats(), lock_retries=self.lock_retries, lock_failures=self.lock_failures)
+
+    @property
+    def last_error(self):
+        # huling error ng execute_query/execute_non_query sa thread na ito, para maipakita ng caller
+        return getattr(self._local, "error", None)
+
+    def _failed(self, query, error):
+        self._local.error = error
+        query_stats.log_error(query, error, call_site())
 
     def execute_query(self, query, params=None):
+        # None kapag nag-error; nasa last_error at sa logs/slow_queries.log yung dahilan
+        self._local.error = None
         try:
-            self.connect()  # Ensure the connection is active
-            self.cursor.execute(query, params or ())
-            result = self.cursor.fetchall()
-            return result
+            with self.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params or ())
+                return cursor.fetchall()
         except mariadb.Error as e:
-            print(f"Error executing query: {e}")
+            self._failed(query, e)
             return None
 
     def execute_non_query(self, query, params=None):
+        self._local.error = None
         try:
-            self.connect()  # Ensure the connection is active
-            self.cursor.execute(query, params or ())
-            self.conn.commit()
+            with self.cursor() as cursor:
+                cursor.execute(query, params or ())
             return True
         except mariadb.Error as e:
-            print(f"Error executing non-query: {e}")
+            self._failed(query, e)
             return False
-    
\ No newline at end of file
+
+
+#isang shared Database (at pool) lang per config para sa lahat ng windows
+_databases = {}
+_databases_lock = threading.Lock()
+
+def get_database(config):
+    key = tuple(sorted(config.items()))
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None:
+            db = Database(config)
+            _databases[key] = db
+            atexit.register(db.close)
+        return db
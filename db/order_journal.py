@@ -0,0 +1,463 @@
+import argparse
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple
+import mariadb
+from db import rollup
+from db.catalog_cache import catalog_cache
+from db.checkout import CheckoutError, Receipt, _check_payment, _merge_items, _receipt_lines
+from db.config import db_config, order_journal_config
+from db.db_functions import get_database
+
+# hindi na maaayos ng retry (sirang data, wala na yung product): failed na, hindi na uulitin
+PERMANENT_ERRORS = (mariadb.IntegrityError, mariadb.DataError, mariadb.ProgrammingError, CheckoutError)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sales (
+    order_key TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sales_status ON sales (status);
+"""
+
+
+class JournalEntry(NamedTuple):
+    order_key: str
+    user_id: int
+    created_at: datetime
+    lines: list     # (productId, quantity, price)
+    total: Decimal
+    payment: Decimal
+
+
+# lokal na write-ahead journal ng mga benta (SQLite WAL); ang flusher thread ang nagsusulat sa MariaDB
+class OrderJournal:
+    def __init__(self, db, path, batch_size=50, flush_interval=1.0, max_backoff=60):
+        self.db = db
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()  # para sa SQLite connection, ginagamit ng GUI at flusher thread
+        self._conn = self._open(path)
+        self._held = defaultdict(int)  # (userId, productId) -> quantity ng pending na hindi pa bawas sa database
+        self._in_flight = set()  # order_key na tumatakbo pa yung checkout; hindi muna ifa-flush
+        self._load_held()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.flushed = 0
+        self.batches = 0
+        self.retries = 0
+        self.backoff = 0
+        self.last_error = None
+        self.last_failure = None  # dahilan ng huling sale na na-failed, para sa Diagnostics at sa till
+
+    @staticmethod
+    def _open(path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")  # naka-fsync na bago bumalik yung record()
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _load_held(self):
+        # galing sa SQLite para tama pa rin pagkatapos ng restart o retry_failed
+        with self._lock:
+            rows = self._conn.execute("SELECT user_id, payload FROM sales WHERE status = 'pending'").fetchall()
+            self._held.clear()
+            for user_id, payload in rows:
+                for product_id, quantity, _ in json.loads(payload)["lines"]:
+                    self._held[(user_id, product_id)] += quantity
+
+    def _release(self, entries):
+        with self._lock:
+            for entry in entries:
+                for product_id, quantity, _ in entry.lines:
+                    key = (entry.user_id, product_id)
+                    self._held[key] -= quantity
+                    if self._held[key] <= 0:
+                        del self._held[key]
+
+    def held(self, user_id, product_id):
+        # nabenta na sa till pero hindi pa bawas sa stock ng database (at ng catalog)
+        with self._lock:
+            return self._held.get((user_id, product_id), 0)
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._held)
+
+    def record(self, user_id, items, catalog, payment=None, order_key=None, in_flight=False):
+        """Journal a sale and return its Receipt without waiting for the database.
+
+        Prices come from catalog, the snapshot the till is showing. Stock is
+        the catalog stock minus what pending journal sales already hold, so a
+        reloaded catalog does not free stock that is still waiting to flush.
+        The Receipt has order_key instead of order_id; the flusher assigns the
+        order_id when it writes the sale to MariaDB. Pass the order_key of a
+        checkout that failed mid-commit so the flush skips it if it did commit.
+        With in_flight the checkout is still running: the sale is not flushed
+        until resolve() says how it ended.
+        """
+        quantities = _merge_items(items)
+        if not quantities:
+            raise CheckoutError("Please select at least one product.")
+
+        prices = {}
+        for product_id in quantities:
+            position = catalog.positions.get(product_id)
+            if position is None:
+                raise CheckoutError(f"Product with ID {product_id} has been removed or no longer exists.")
+            row = catalog.rows[position]
+            prices[product_id] = (row.name, row.price)
+
+        lines, total = _receipt_lines(quantities, prices)
+        payment = _check_payment(payment, total)
+        created_at = datetime.now().replace(microsecond=0)
+        order_key = order_key or uuid.uuid4().hex
+        payload = json.dumps({
+            "lines": [(line.product_id, line.quantity, str(line.price)) for line in lines],
+            "total": str(total),
+            "payment": str(payment),
+        })
+        with self._lock:
+            #sa loob ng lock para hindi sabay makuha ng dalawang record yung huling stock
+            short = [
+                line.name for line in lines
+                if catalog.rows[catalog.positions[line.product_id]].stock - self._held.get((user_id, line.product_id), 0)
+                < line.quantity
+            ]
+            if short:
+                raise CheckoutError(f"Not enough stock for: {', '.join(short)}.")
+            self._conn.execute(
+                "INSERT INTO sales (order_key, user_id, created_at, payload) VALUES (?, ?, ?, ?)",
+                (order_key, user_id, created_at.isoformat(sep=" "), payload)
+            )
+            for line in lines:
+                self._held[(user_id, line.product_id)] += line.quantity
+            if in_flight:
+                self._in_flight.add(order_key)
+        self._wake.set()
+        return Receipt(None, user_id, lines, total, payment, payment - total, created_at, order_key)
+
+    def resolve(self, order_key, committed):
+        """Finish a sale recorded with in_flight once its checkout has ended.
+
+        committed: the checkout wrote the sale itself, so the journal copy is
+        dropped. Otherwise the sale is flushed like any other journaled sale;
+        clientOrderKey still guards against a commit the checkout never saw.
+        """
+        with self._lock:
+            self._in_flight.discard(order_key)
+            if not committed:
+                self._wake.set()
+                return
+            row = self._conn.execute("SELECT user_id, payload FROM sales WHERE order_key = ?", (order_key,)).fetchone()
+            self._conn.execute("DELETE FROM sales WHERE order_key = ?", (order_key,))
+        if row is not None:
+            user_id, payload = row
+            lines = [(product_id, quantity, Decimal(price)) for product_id, quantity, price in json.loads(payload)["lines"]]
+            # yung checkout na yung nagbawas sa catalog cache, hold lang yung bibitawan
+            self._release([JournalEntry(order_key, user_id, None, lines, None, None)])
+
+    def pending(self, limit=None):
+        with self._lock:
+            in_flight = tuple(self._in_flight)
+            rows = self._conn.execute(
+                "SELECT order_key, user_id, created_at, payload FROM sales WHERE status = 'pending' "
+                f"AND order_key NOT IN ({', '.join('?' for _ in in_flight)}) ORDER BY rowid LIMIT ?",
+                (*in_flight, limit or -1)
+            ).fetchall()
+        entries = []
+        for order_key, user_id, created_at, payload in rows:
+            data = json.loads(payload)
+            entries.append(JournalEntry(
+                order_key, user_id, datetime.fromisoformat(created_at),
+                [(product_id, quantity, Decimal(price)) for product_id, quantity, price in data["lines"]],
+                Decimal(data["total"]), Decimal(data["payment"]),
+            ))
+        return entries
+
+    def flush(self):
+        """Write one batch of pending sales to MariaDB and return how many entries were handled.
+
+        Transient errors (server down, timeouts) propagate and the batch stays
+        pending. A batch that fails permanently is retried one sale at a time
+        so that only the bad sale is marked failed.
+        """
+        entries = self.pending(self.batch_size)
+        if not entries:
+            return 0
+        try:
+            applied = self._apply(entries)
+        except PERMANENT_ERRORS:
+            applied = {}
+            for entry in entries:
+                try:
+                    applied.update(self._apply([entry]))
+                except PERMANENT_ERRORS as e:
+                    self._mark_failed(entry, e)
+        self._mark_flushed(entries, applied)
+        self.batches += 1
+        return len(entries)
+
+    def _apply(self, entries):
+        # isang transaction para sa buong batch, inuulit kapag deadlock; order_key -> orderId
+        applied, days, rejected = self.db.transaction(lambda cursor: self._write(cursor, entries))
+        for user_id, sales_date in days:
+            rollup.mark_changed(user_id, sales_date)
+        #kulang na stock o wala nang product: hindi isinulat, failed para ma-review ng operator
+        for entry in entries:
+            if entry.order_key in rejected:
+                self._mark_failed(entry, rejected[entry.order_key])
+        return applied
+
+    def _write(self, cursor, entries):
+        keys = [entry.order_key for entry in entries]
+        #idempotency: na-commit na dati pero hindi na-mark sa journal (e.g. nag-crash)
+        cursor.execute(
+            f"SELECT clientOrderKey, orderId FROM orders WHERE clientOrderKey IN ({', '.join('?' for _ in keys)})",
+            tuple(keys)
+        )
+        applied = dict(cursor.fetchall())
+        new = [entry for entry in entries if entry.order_key not in applied]
+        if not new:
+            return applied, {}, {}
+
+        #i-lock yung product rows (naka-sort, parehong order ng checkout) bago tingnan yung stock
+        product_ids = sorted({product_id for entry in new for product_id, _, _ in entry.lines})
+        cursor.execute(
+            f"SELECT productId, userId, purchasePrice, stock FROM products "
+            f"WHERE productId IN ({', '.join('?' for _ in product_ids)}) ORDER BY productId FOR UPDATE",
+            tuple(product_ids)
+        )
+        products = {}
+        available = {}
+        for product_id, user_id, purchase, stock in cursor.fetchall():
+            products[(product_id, user_id)] = Decimal(purchase)
+            available[(product_id, user_id)] = stock
+
+        #isa-isa ayon sa pagkakabenta; yung hindi na kasya sa stock ay hindi isusulat (walang negative stock)
+        rejected = {}  # order_key -> dahilan
+        accepted = []
+        for entry in new:
+            missing = [product_id for product_id, _, _ in entry.lines if (product_id, entry.user_id) not in products]
+            if missing:
+                rejected[entry.order_key] = f"Product with ID {missing[0]} has been removed or no longer exists."
+                continue
+            short = [
+                product_id for product_id, quantity, _ in entry.lines
+                if available[(product_id, entry.user_id)] < quantity
+            ]
+            if short:
+                rejected[entry.order_key] = (
+                    f"Not enough stock for product ID {', '.join(map(str, short))} when the sale reached the database."
+                )
+                continue
+            for product_id, quantity, _ in entry.lines:
+                available[(product_id, entry.user_id)] -= quantity
+            accepted.append(entry)
+        new = accepted
+        if not new:
+            return applied, {}, rejected
+
+        stock = defaultdict(int)
+        for entry in new:
+            for product_id, quantity, _ in entry.lines:
+                stock[(product_id, entry.user_id)] += quantity
+        rows = [(quantity, product_id, user_id, quantity) for (product_id, user_id), quantity in sorted(stock.items())]
+        cursor.executemany(
+            "UPDATE products SET stock = stock - ? WHERE productId = ? AND userId = ? AND stock >= ?", rows
+        )
+        if cursor.rowcount != len(rows):
+            raise CheckoutError("Stock changed while the journal was being flushed.")  # naka-lock, hindi dapat mangyari
+        cursor.executemany("""
+            INSERT INTO orders (userId, totalPrice, totalMoney, changeAmount, orderDateTime, clientOrderKey)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (entry.user_id, entry.total, entry.total, entry.payment - entry.total, entry.created_at, entry.order_key)
+            for entry in new
+        ])
+        cursor.execute(
+            f"SELECT clientOrderKey, orderId FROM orders WHERE clientOrderKey IN ({', '.join('?' for _ in new)})",
+            tuple(entry.order_key for entry in new)
+        )
+        order_ids = dict(cursor.fetchall())
+        cursor.executemany("""
+            INSERT INTO order_details (orderId, productId, quantity, totalPrice, unitCost)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (order_ids[entry.order_key], product_id, quantity, price * quantity, products[(product_id, entry.user_id)])
+            for entry in new for product_id, quantity, price in entry.lines
+        ])
+
+        # rollup: pinagsama per (user, araw, product) para isang upsert lang bawat isa
+        days = defaultdict(lambda: defaultdict(lambda: [0, Decimal("0.00"), Decimal("0.00")]))
+        for entry in new:
+            for product_id, quantity, price in entry.lines:
+                line = days[(entry.user_id, entry.created_at.date())][product_id]
+                line[0] += quantity
+                line[1] += price * quantity
+                line[2] += products[(product_id, entry.user_id)] * quantity
+        for (user_id, sales_date), lines in days.items():
+            rollup.add_sale(cursor, user_id, sales_date, [
+                (product_id, *totals) for product_id, totals in sorted(lines.items())
+            ])
+        applied.update(order_ids)
+        return applied, days, rejected
+
+    def _mark_flushed(self, entries, applied):
+        if not applied:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM sales WHERE order_key = ?", [(key,) for key in applied])
+        self.flushed += len(applied)
+
+        #bawas na sa database: ilipat yung bawas sa naka-cache na catalog bago bitawan yung hold
+        flushed = [entry for entry in entries if entry.order_key in applied]
+        deltas = defaultdict(lambda: defaultdict(int))
+        for entry in flushed:
+            for product_id, quantity, _ in entry.lines:
+                deltas[entry.user_id][product_id] -= quantity
+        for user_id, stock in deltas.items():
+            catalog_cache.adjust_stock(user_id, stock)
+        self._release(flushed)
+
+    def _mark_failed(self, entry, error):
+        self.last_failure = f"{entry.order_key[:8].upper()}: {error}"
+        with self._lock:
+            self._conn.execute(
+                "UPDATE sales SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE order_key = ?",
+                (str(error), entry.order_key)
+            )
+        self._release([entry])  # hindi na nakareserba habang nire-review
+
+    def start(self):
+        # may naiwang pending mula sa huling takbo (crash o offline)? ifa-flush agad
+        if self._thread is None:
+            self._stop.clear()
+            self._wake.set()
+            self._thread = threading.Thread(target=self._run, name="order-journal-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.backoff:
+                self._stop.wait(self.backoff)
+            else:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                while self.flush() and not self._stop.is_set():
+                    pass
+                self.backoff = 0
+            except Exception as e:
+                # offline o mabagal yung server: subukan ulit, padoble nang padoble yung hintay
+                self.retries += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.backoff = min(self.max_backoff, max(1, self.backoff * 2))
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+    def retry_failed(self):
+        # e.g. naibalik na yung product: subukan ulit yung mga failed
+        with self._lock:
+            count = self._conn.execute("UPDATE sales SET status = 'pending' WHERE status = 'failed'").rowcount
+        self._load_held()
+        return count
+
+    def failed_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sales WHERE status = 'failed'").fetchone()[0]
+
+    def failed(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT order_key, user_id, created_at, attempts, last_error FROM sales WHERE status = 'failed' ORDER BY rowid"
+            ).fetchall()
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM sales GROUP BY status").fetchall())
+        return {
+            "path": self.path,
+            "pending": counts.get("pending", 0),
+            "failed": counts.get("failed", 0),
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "retries": self.retries,
+            "backoff_s": self.backoff,
+            "last_error": self.last_error,
+            "last_failure": self.last_failure,
+        }
+
+
+#isang journal (at flusher) per database
+_journals = {}
+_journals_lock = threading.Lock()
+
+def get_order_journal(db):
+    with _journals_lock:
+        journal = _journals.get(id(db))
+        if journal is None:
+            config = order_journal_config
+            journal = OrderJournal(db, config["path"], batch_size=config["batch_size"],
+                                   flush_interval=config["flush_interval"], max_backoff=config["max_backoff"])
+            journal.start()
+            _journals[id(db)] = journal
+            atexit.register(journal.close)
+        return journal
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or flush the local order journal.")
+    parser.add_argument("command", choices=["status", "flush", "retry-failed"])
+    parser.add_argument("--path", default=order_journal_config["path"])
+    args = parser.parse_args(argv)
+
+    settings = {key: value for key, value in order_journal_config.items() if key not in ("enabled", "path")}
+    journal = OrderJournal(get_database(db_config), args.path, **settings)
+    try:
+        if args.command == "retry-failed":
+            print(f"{journal.retry_failed()} failed sales set back to pending.")
+        if args.command in ("flush", "retry-failed"):
+            while journal.flush():
+                pass
+        for order_key, user_id, created_at, attempts, error in journal.failed():
+            print(f"failed {order_key} user {user_id} at {created_at}: {error}")
+        print(json.dumps(journal.stats(), indent=2))
+    finally:
+        journal.close()
+
+if __name__ == "__main__":
+    main()
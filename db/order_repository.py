@@ -0,0 +1,94 @@
+import uuid
+from datetime import datetime, time
+from decimal import Decimal
+from typing import NamedTuple
+import mariadb
+from db import checkout
+from db.config import order_journal_config
+from db.db_functions import is_lock_conflict
+from db.product_repository import use_cursor
+
+# hindi maabot yung database (server down, naputol, puno yung pool): dito lang ginagamit yung journal
+OFFLINE_ERRORS = (mariadb.OperationalError, mariadb.InterfaceError, mariadb.PoolError)
+
+class OrderSummary(NamedTuple):
+    # isang row sa sales history: products at quantities na naka-join na ng ", "
+    order_id: int
+    products: str
+    quantities: str
+    total: Decimal
+    ordered_at: datetime
+
+
+def datetime_range(start_date, end_date):
+    # half-open [start_date, end_date) bilang datetimes para magamit yung idx_orders_user_datetime
+    return datetime.combine(start_date, time.min), datetime.combine(end_date, time.min)
+
+
+# orders at order_details; yung checkout transaction mismo ay nasa db/checkout.py
+class OrderRepository:
+    def __init__(self, db, journal=None):
+        self.db = db
+        self.journal = journal  # OrderJournal para sa offline; None = laging diretso sa database
+
+    def journal_first(self, catalog):
+        #may hindi pa na-flush: sa journal pa rin para sunod-sunod at hindi maagawan yung nakareserbang stock
+        return self.journal is not None and catalog is not None and self.journal.has_pending()
+
+    def can_journal(self, error, catalog):
+        # catalog (yung nakikita sa till) ang basehan ng presyo at stock habang offline
+        return (self.journal is not None and catalog is not None
+                and isinstance(error, OFFLINE_ERRORS) and not is_lock_conflict(error))
+
+    def new_order_key(self):
+        #iisang key sa database at sa journal: kung na-commit pala bago naputol, hindi madodoble sa flush
+        return uuid.uuid4().hex if self.journal is not None else None
+
+    def checkout(self, user_id, items, payment=None, order_key=None):
+        # may journal: maikling hintay sa connection, para mabilis lumipat sa journal kapag puno o down
+        acquire_timeout = order_journal_config["acquire_timeout"] if self.journal is not None else None
+        return checkout.checkout(self.db, user_id, items, payment, order_key=order_key, acquire_timeout=acquire_timeout)
+
+    def place(self, user_id, items, payment=None, catalog=None):
+        # items = (productId, quantity); nagbabalik ng checkout.Receipt
+        # sync na bersyon (CLI, benchmarks); yung till ay sa background thread, may deadline (controls/order.py)
+        if self.journal_first(catalog):
+            return self.journal.record(user_id, items, catalog, payment)
+        order_key = self.new_order_key()
+        try:
+            return self.checkout(user_id, items, payment, order_key)
+        except OFFLINE_ERRORS as e:
+            if not self.can_journal(e, catalog):
+                raise
+            return self.journal.record(user_id, items, catalog, payment, order_key=order_key)
+
+    def count_in_range(self, user_id, start_date, end_date, cursor=None):
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM orders WHERE userId = ? AND orderDateTime >= ? AND orderDateTime < ?",
+                (user_id, *datetime_range(start_date, end_date))
+            )
+            return cursor.fetchone()[0]
+
+    def summaries_in_range(self, user_id, start_date, end_date, limit, offset=0, cursor=None):
+        #isang page lang ng orders, tapos sa SQL na yung grouping ng products
+        start, end = datetime_range(start_date, end_date)
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.execute("""
+                SELECT o.orderId,
+                       GROUP_CONCAT(p.productName ORDER BY od.orderDetailId SEPARATOR ', '),
+                       GROUP_CONCAT(od.quantity ORDER BY od.orderDetailId SEPARATOR ', '),
+                       SUM(od.totalPrice),
+                       o.orderDateTime
+                FROM (
+                    SELECT orderId, orderDateTime FROM orders
+                    WHERE userId = ? AND orderDateTime >= ? AND orderDateTime < ?
+                    ORDER BY orderDateTime, orderId
+                    LIMIT ? OFFSET ?
+                ) o
+                JOIN order_details od ON od.orderId = o.orderId
+                JOIN products p ON od.productId = p.productId
+                GROUP BY o.orderId, o.orderDateTime
+                ORDER BY o.orderDateTime, o.orderId
+            """, (user_id, start, end, limit, offset))
+            return [OrderSummary(*row) for row in cursor.fetchall()]
@@ -0,0 +1,41 @@
+import hashlib
+import hmac
+import os
+
+ALGORITHM = "pbkdf2_sha256"
+LEGACY_ITERATIONS = 10000  # lumang format na "hash:salt", laging 10000 iterations
+SALT_BYTES = 16
+
+# stored format: pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>
+def hash_secret(secret, iterations):
+    salt = os.urandom(SALT_BYTES)
+    derived = hashlib.pbkdf2_hmac("sha256", secret.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${derived.hex()}"
+
+def parse(stored):
+    # (iterations, salt, hash) o None kapag hindi kilala yung format
+    if not stored:
+        return None
+    try:
+        if stored.startswith(ALGORITHM + "$"):
+            _, iterations, salt_hex, hash_hex = stored.split("$")
+            return int(iterations), bytes.fromhex(salt_hex), bytes.fromhex(hash_hex)
+        if ":" in stored:
+            hash_hex, salt_hex = stored.split(":")
+            return LEGACY_ITERATIONS, bytes.fromhex(salt_hex), bytes.fromhex(hash_hex)
+    except ValueError:
+        pass
+    return None
+
+def verify_secret(secret, stored):
+    parsed = parse(stored)
+    if parsed is None:
+        return False
+    iterations, salt, expected = parsed
+    derived = hashlib.pbkdf2_hmac("sha256", secret.encode("utf-8"), salt, iterations)
+    return hmac.compare_digest(derived, expected)
+
+def needs_rehash(stored, iterations):
+    # legacy format o iba na yung configured na cost
+    parsed = parse(stored)
+    return parsed is None or not stored.startswith(ALGORITHM + "$") or parsed[0] != iterations
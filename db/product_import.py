@@ -0,0 +1,201 @@
+import argparse
+import csv
+import os
+import sys
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+import mariadb
+from db.catalog_cache import catalog_cache
+from db.config import db_config
+from db.db_functions import get_database
+from db.product_repository import MAX_PRICE, ProductRepository
+
+# pangalan ng column sa file -> field; hindi case-sensitive
+COLUMNS = {
+    "name": "name", "productname": "name", "product": "name",
+    "price": "price", "retailprice": "price",
+    "purchaseprice": "purchase_price", "cost": "purchase_price",
+    "stock": "stock", "quantity": "stock", "qty": "stock",
+    "sku": "sku", "barcode": "sku",
+}
+REQUIRED = ("name", "price", "stock")
+
+class ImportFileError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class RowError:
+    line: int
+    message: str
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    imported: int = 0
+    without_sku: int = 0  # laging bagong product, kaya nadodoble kapag in-import ulit
+    errors: list = field(default_factory=list)
+
+
+def _header_fields(header):
+    fields = [COLUMNS.get(str(name or "").strip().lower().replace(" ", "").replace("_", "")) for name in header]
+    missing = [name for name in REQUIRED if name not in fields]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}.")
+    return fields
+
+def read_rows(path):
+    # (line number, {field: value}), isa-isa lang para hindi buong file yung nasa memory
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            fields = _header_fields(next(reader, []))
+            for values in reader:
+                if any(values):
+                    yield reader.line_num, dict(zip(fields, values))
+    elif extension == ".xlsx":
+        from openpyxl import load_workbook  # lazy, mabigat i-import
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            fields = _header_fields(next(rows, ()))
+            for line, values in enumerate(rows, start=2):
+                if any(value not in (None, "") for value in values):
+                    yield line, dict(zip(fields, values))
+        finally:
+            workbook.close()
+    else:
+        raise ImportFileError("Only .csv and .xlsx files can be imported.")
+
+def _money(value, label):
+    try:
+        amount = Decimal(str(value).replace(",", "").strip())
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite():
+        raise ValueError(f"{label} '{value}' is not a number.")
+    amount = amount.quantize(Decimal("0.01"))
+    if not 0 <= amount <= MAX_PRICE:
+        raise ValueError(f"{label} must be between 0 and {MAX_PRICE}.")
+    return amount
+
+def parse_row(values):
+    """Validate one row and return (name, price, purchase_price, stock, sku).
+
+    purchase_price is None when the file has no purchase price for the row,
+    so an existing product keeps its cost. Raises ValueError with a message meant for the user.
+    """
+    name = str(values.get("name") or "").strip()
+    if not name:
+        raise ValueError("Product name is empty.")
+    if len(name) > 100:
+        raise ValueError("Product name is longer than 100 characters.")
+
+    price = _money("" if values.get("price") is None else values["price"], "Price")
+    purchase = values.get("purchase_price")
+    purchase_price = None if purchase in (None, "") else _money(purchase, "Purchase price")
+
+    stock = values.get("stock")
+    try:
+        amount = Decimal(str(stock).strip())
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite() or amount != amount.to_integral_value():
+        raise ValueError(f"Stock '{stock}' is not a whole number.")
+    stock = int(amount)
+    if stock < 0:
+        raise ValueError("Stock cannot be negative.")
+
+    sku = str(values.get("sku") or "").strip() or None
+    if sku and len(sku) > 64:
+        raise ValueError("SKU is longer than 64 characters.")
+    return name, price, purchase_price, stock, sku
+
+def import_products(db, user_id, path, batch_size=5000, progress=None):
+    """Import products from a .csv or .xlsx file and return an ImportResult.
+
+    Valid rows are upserted by SKU in batches of batch_size, one executemany
+    and one transaction per batch. Rows without a SKU are always inserted as
+    new products, so importing the same file again adds them again; they
+    are counted in result.without_sku. Invalid rows are skipped and reported
+    with their line number. progress, if given, is called with the number
+    of rows read so far.
+    """
+    repository = ProductRepository(db)
+    result = ImportResult()
+    sku_lines = {}  # sku -> unang line, para sa duplicate sa loob ng file
+    batch = []
+
+    def write(batch):
+        try:
+            with db.cursor() as cursor:
+                repository.upsert_many(user_id, [row for _, row in batch], cursor=cursor)
+            result.imported += len(batch)
+        except (mariadb.IntegrityError, mariadb.DataError):
+            #may problemang row sa batch: isa-isa para malaman kung alin
+            with db.cursor() as cursor:
+                for line, row in batch:
+                    try:
+                        repository.upsert_many(user_id, [row], cursor=cursor)
+                        result.imported += 1
+                    except (mariadb.IntegrityError, mariadb.DataError) as e:
+                        result.errors.append(RowError(line, str(e)))
+
+    for line, values in read_rows(path):
+        result.rows += 1
+        try:
+            row = parse_row(values)
+            sku = row[4]
+            if sku in sku_lines:
+                raise ValueError(f"SKU {sku} is already used on line {sku_lines[sku]}.")
+            if sku:
+                sku_lines[sku] = line
+            else:
+                result.without_sku += 1
+            batch.append((line, row))
+        except ValueError as e:
+            result.errors.append(RowError(line, str(e)))
+
+        if len(batch) >= batch_size:
+            write(batch)
+            batch = []
+        if progress and result.rows % batch_size == 0:
+            progress(result.rows)
+
+    if batch:
+        write(batch)
+    if progress and result.rows % batch_size:
+        progress(result.rows)
+    if result.imported:
+        catalog_cache.invalidate(user_id)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import products from a .csv or .xlsx file.")
+    parser.add_argument("path")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--show-errors", type=int, default=50, help="how many row errors to print")
+    args = parser.parse_args(argv)
+
+    try:
+        result = import_products(
+            get_database(db_config), args.user_id, args.path, args.batch_size,
+            progress=lambda rows: print(f"{rows} rows read", file=sys.stderr)
+        )
+    except (ImportFileError, OSError) as e:
+        print(f"Import failed: {e}")
+        return 2
+
+    for error in result.errors[:args.show_errors]:
+        print(f"line {error.line}: {error.message}")
+    if len(result.errors) > args.show_errors:
+        print(f"... and {len(result.errors) - args.show_errors} more")
+    if result.without_sku:
+        print(f"{result.without_sku} rows had no SKU and were added as new products; importing them again adds them again.")
+    print(f"Imported {result.imported} of {result.rows} rows, {len(result.errors)} errors.")
+    return 1 if result.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
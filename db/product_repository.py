@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import NamedTuple
+
+MAX_PRICE = Decimal("99999999.99")  # decimal(10,2)
+MAX_STOCK = 2147483647  # int(11)
+
+class Product(NamedTuple):
+    # tuple pa rin (walang __dict__), kaya kasing liit ng dating rows at gumagana pa rin yung row[0]
+    product_id: int
+    name: str
+    price: Decimal
+    stock: int
+
+
+@contextmanager
+def use_cursor(db, cursor=None, **kwargs):
+    # gamitin yung binigay na cursor (parehong transaction/connection), o kumuha ng bago sa pool
+    if cursor is not None:
+        yield cursor
+        return
+    with db.cursor(**kwargs) as cursor:
+        yield cursor
+
+
+# lahat ng SQL para sa products table; walang Qt, kaya pwedeng i-benchmark at gamitin kahit saan
+class ProductRepository:
+    def __init__(self, db):
+        self.db = db
+
+    def catalog(self, user_id, chunk_size=5000):
+        """Return (products, skus) for the user, sorted by productId.
+
+        Streams with an unbuffered cursor. skus maps each barcode to the
+        product's position in products.
+        """
+        products = []
+        skus = {}
+        with self.db.cursor(buffered=False) as cursor:
+            cursor.execute(
+                "SELECT productId, productName, price, stock, sku FROM products WHERE userId = ? ORDER BY productId",
+                (user_id,)
+            )
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                for product_id, name, price, stock, sku in chunk:
+                    if sku:
+                        skus[sku] = len(products)
+                    products.append(Product(product_id, name, price, stock))
+        return products, skus
+
+    def page(self, user_id, after_id=0, limit=500, cursor=None):
+        #keyset pagination: unang view habang wala pang catalog, pare-pareho yung bilis kahit malayo na
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.execute(
+                "SELECT productId, productName, price, stock FROM products "
+                "WHERE userId = ? AND productId > ? ORDER BY productId LIMIT ?",
+                (user_id, after_id, limit)
+            )
+            return [Product(*row) for row in cursor.fetchall()]
+
+    def add(self, user_id, name, price, stock, sku=None, cursor=None):
+        # mariadb.IntegrityError kapag gamit na yung sku ng ibang product ng user
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.execute(
+                "INSERT INTO products (productName, price, stock, sku, userId) VALUES (?, ?, ?, ?, ?)",
+                (name, price, stock, sku, user_id)
+            )
+            return cursor.lastrowid
+
+    def upsert_many(self, user_id, rows, cursor=None):
+        """Insert rows of (name, price, purchase_price, stock, sku) in one executemany.
+
+        A row whose sku already belongs to one of the user's products updates
+        that product instead, keeping its purchase price when purchase_price
+        is None. Rows without a sku are always inserted, so the same rows
+        imported twice become two products.
+        """
+        #NOT NULL yung purchasePrice: 0 sa bagong product, yung dati sa update kung walang laman
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.executemany("""
+                INSERT INTO products (productName, price, purchasePrice, stock, sku, userId)
+                VALUES (?, ?, COALESCE(?, 0), ?, ?, ?)
+                ON DUPLICATE KEY UPDATE
+                    productName = VALUES(productName),
+                    price = VALUES(price),
+                    purchasePrice = IF(? IS NULL, purchasePrice, VALUES(purchasePrice)),
+                    stock = VALUES(stock)
+            """, [(*row, user_id, row[2]) for row in rows])
+
+    def update_price(self, user_id, product_id, price, cursor=None):
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.execute(
+                "UPDATE products SET price = ? WHERE productId = ? AND userId = ?", (price, product_id, user_id)
+            )
+
+    def update_stock(self, user_id, product_id, stock, cursor=None):
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.execute(
+                "UPDATE products SET stock = ? WHERE productId = ? AND userId = ?", (stock, product_id, user_id)
+            )
+
+    def update_many(self, user_id, prices=(), stocks=(), cursor=None):
+        """Apply (product_id, price) and (product_id, stock, loaded_stock) changes with one executemany each.
+
+        A stock is only written if the row still has loaded_stock, so a sale
+        committed after the edit was made is not overwritten. Returns
+        {product_id: current stock} for the stock changes that were skipped
+        (None if the product is gone). Pass the cursor of an open transaction
+        so both lists are committed together.
+        """
+        conflicts = {}
+        with use_cursor(self.db, cursor) as cursor:
+            if prices:
+                cursor.executemany(
+                    "UPDATE products SET price = ? WHERE productId = ? AND userId = ?",
+                    [(price, product_id, user_id) for product_id, price in prices]
+                )
+            if stocks:
+                cursor.executemany(
+                    "UPDATE products SET stock = ? WHERE productId = ? AND userId = ? AND stock = ?",
+                    [(stock, product_id, user_id, loaded) for product_id, stock, loaded in stocks]
+                )
+                #yung hindi tumugma (may benta o ibang edit habang naka-pending) ay hindi na-save
+                product_ids = [product_id for product_id, _, _ in stocks]
+                cursor.execute(
+                    f"SELECT productId, stock FROM products WHERE userId = ? "
+                    f"AND productId IN ({', '.join('?' for _ in product_ids)})",
+                    (user_id, *product_ids)
+                )
+                current = dict(cursor.fetchall())
+                conflicts = {
+                    product_id: current.get(product_id)
+                    for product_id, stock, _ in stocks if current.get(product_id) != stock
+                }
+        return conflicts
+
+    def remove(self, user_id, product_id, cursor=None):
+        with use_cursor(self.db, cursor) as cursor:
+            cursor.execute("DELETE FROM products WHERE productId = ? AND userId = ?", (product_id, user_id))
+            return cursor.rowcount > 0
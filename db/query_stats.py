@@ -0,0 +1,334 @@
+import json
+import logging
+import logging.handlers
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from db.config import query_stats_config
+
+# upper bound (ms) ng bawat bucket ng histogram; yung huli ay lahat ng mas mabagal pa
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+ITER_BATCH = 1000  # rows per fetchmany kapag ini-iterate yung cursor
+
+_IN_LIST = re.compile(r"IN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACES = re.compile(r"\s+")
+_DB_DIR = os.path.dirname(os.path.abspath(__file__))
+_CONTROLS_DIR = os.path.join(os.path.dirname(_DB_DIR), "controls")
+
+
+def rotating_logger(name, path, max_bytes=5 * 1024 * 1024, backups=3):
+    # log file na hindi lumalaki nang walang hangganan (path, path.1 ... path.N)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+def normalize(sql):
+    # iisang key para sa parehong statement: walang extra whitespace, IN (?, ?, ...) -> IN (...), numbers -> ?
+    sql = _SPACES.sub(" ", sql).strip()
+    return _NUMBER.sub("?", _IN_LIST.sub("IN (...)", sql))
+
+
+_file_kinds = {}  # co_filename -> CONTROLS, SKIP o OTHER, para hindi paulit-ulit yung startswith
+CONTROLS, SKIP, OTHER = 0, 1, 2
+
+def _file_kind(filename):
+    kind = _file_kinds.get(filename)
+    if kind is None:
+        if filename.startswith(_CONTROLS_DIR):
+            kind = CONTROLS
+        elif filename.startswith(_DB_DIR) or "contextlib" in filename:
+            kind = SKIP
+        else:
+            kind = OTHER
+        _file_kinds[filename] = kind
+    return kind
+
+_site_names = {}  # (class, code) -> "Window.method", para walang string formatting kada query
+
+def call_site():
+    """Return "Window.method" of the nearest caller in controls/, else "module:function" outside db/."""
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        code = frame.f_code
+        kind = _file_kind(code.co_filename)
+        if kind == CONTROLS:
+            owner = frame.f_locals.get("self")
+            key = (type(owner), code)
+            name = _site_names.get(key)
+            if name is None:
+                prefix = type(owner).__name__ if owner is not None else os.path.basename(code.co_filename)[:-3]
+                name = _site_names[key] = f"{prefix}.{code.co_name}"
+            return name
+        if kind == OTHER and fallback is None:
+            fallback = frame
+        frame = frame.f_back
+    if fallback is None:
+        return "?"
+    key = (None, fallback.f_code)
+    name = _site_names.get(key)
+    if name is None:
+        name = _site_names[key] = f"{fallback.f_globals.get('__name__', '?')}:{fallback.f_code.co_name}"
+    return name
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, pct):
+        # upper bound ng bucket kung saan tumama yung percentile (max kapag nasa huling bucket)
+        target = pct / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if count and seen >= target:
+                return round(min(bound, self.max), 3)
+        return round(self.max, 3)
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+            "buckets": {
+                ("inf" if bound == float("inf") else f"<={bound}"): count
+                for bound, count in zip(BUCKETS_MS, self.counts) if count
+            },
+        }
+
+
+class StatementStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.rows = 0
+        self.errors = 0
+        self.sites = {}  # call site -> ilang beses
+
+
+# process-wide na stats ng lahat ng dumaan sa Database.connection()/cursor()
+class QueryStats:
+    def __init__(self, enabled=True, slow_ms=200, slow_log=None, max_statements=500):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._statements = {}  # normalized sql -> StatementStats
+        self._sites = {}       # call site -> Histogram ng oras ng statements
+        self._acquire = {}     # call site -> Histogram ng paghihintay sa pool
+        self._normalized = {}  # raw sql -> normalized, para hindi paulit-ulit yung regex
+        self._dropped = 0
+        self._failed_calls = 0  # execute_query/execute_non_query na nag-error (kasama yung walang connection)
+        self._started = time.time()
+        self.slow_log = slow_log  # path ng slow-query log; None = walang log
+        self._slow_logger = None
+
+    def _slow_log(self):
+        # binubuksan lang sa unang mabagal na query, hindi sa import
+        if self._slow_logger is None:
+            self._slow_logger = rotating_logger("dailysales.slow_queries", self.slow_log)
+        return self._slow_logger
+
+    def _key(self, sql):
+        key = self._normalized.get(sql)
+        if key is None:
+            if len(self._normalized) > 4 * self.max_statements:
+                self._normalized.clear()  # e.g. sobrang daming f-string na queries
+            key = self._normalized[sql] = normalize(sql)
+        return key
+
+    def record(self, sql, seconds, rows, site, error=None):
+        ms = seconds * 1000
+        with self._lock:
+            key = self._normalized.get(sql) or self._key(sql)
+            stats = self._statements.get(key)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    self._dropped += 1
+                    return
+                stats = self._statements[key] = StatementStats()
+            stats.latency.add(ms)
+            stats.rows += rows
+            stats.sites[site] = stats.sites.get(site, 0) + 1
+            if error is not None:
+                stats.errors += 1
+            site_stats = self._sites.get(site)
+            if site_stats is None:
+                site_stats = self._sites[site] = Histogram()
+            site_stats.add(ms)
+        if self.slow_log is not None and (ms >= self.slow_ms or error is not None):
+            self._slow_log().warning(
+                "%.1f ms rows=%d site=%s%s sql=%s", ms, rows, site,
+                f" error={error!r}" if error is not None else "", key
+            )
+
+    def log_error(self, sql, error, site):
+        # error na sinalo ng caller (e.g. Database.execute_query), isinusulat sa parehong log ng slow queries
+        with self._lock:
+            self._failed_calls += 1
+            key = self._key(sql)
+        if self.slow_log is not None:
+            self._slow_log().error("failed site=%s error=%r sql=%s", site, error, key)
+
+    def add_rows(self, sql, rows):
+        # rows ng unbuffered na SELECT, na alam lang habang nagfe-fetch
+        with self._lock:
+            stats = self._statements.get(self._key(sql))
+            if stats is not None:
+                stats.rows += rows
+
+    def record_acquire(self, seconds, site):
+        with self._lock:
+            histogram = self._acquire.get(site)
+            if histogram is None:
+                histogram = self._acquire[site] = Histogram()
+            histogram.add(seconds * 1000)
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._sites.clear()
+            self._acquire.clear()
+            self._dropped = 0
+            self._failed_calls = 0
+            self._started = time.time()
+
+    def summary(self):
+        with self._lock:
+            statements = [
+                dict(sql=sql, rows=stats.rows, errors=stats.errors,
+                     sites=dict(sorted(stats.sites.items(), key=lambda item: -item[1])),
+                     **stats.latency.summary())
+                for sql, stats in self._statements.items()
+            ]
+            sites = {site: histogram.summary() for site, histogram in self._sites.items()}
+            acquire = {site: histogram.summary() for site, histogram in self._acquire.items()}
+            dropped = self._dropped
+            failed_calls = self._failed_calls
+            started = self._started
+        statements.sort(key=lambda item: -item["total_ms"])
+        return {
+            "enabled": self.enabled,
+            "since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)),
+            "slow_ms": self.slow_ms,
+            "statements": statements,
+            "dropped_statements": dropped,
+            "failed_calls": failed_calls,
+            "call_sites": dict(sorted(sites.items(), key=lambda item: -item[1]["total_ms"])),
+            "acquire": dict(sorted(acquire.items(), key=lambda item: -item[1]["total_ms"])),
+        }
+
+    def dump(self, path, **extra):
+        # JSON summary; extra = ibang stats (pool, caches, shell) na isasama sa file
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(dict(self.summary(), **extra), f, indent=2, default=str)
+
+
+# cursor na nagta-time ng bawat execute; lahat ng iba diretso sa totoong cursor
+class InstrumentedCursor:
+    __slots__ = ("_cursor", "_stats", "_site", "_sql", "_count_fetched")
+
+    def __init__(self, cursor, stats, site):
+        self._cursor = cursor
+        self._stats = stats
+        self._site = site
+        self._sql = None
+        self._count_fetched = False
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        #paisa-isang batch para tuloy pa rin yung streaming ng buffered=False, bilang pa rin yung rows
+        while True:
+            rows = self.fetchmany(ITER_BATCH)
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self._cursor.close()
+
+    def _timed(self, method, sql, params):
+        self._sql = sql
+        start = time.perf_counter()
+        try:
+            result = method(sql, params)
+        except Exception as e:
+            self._stats.record(sql, time.perf_counter() - start, 0, self._site, error=e)
+            raise
+        elapsed = time.perf_counter() - start
+        #buffered SELECT at DML: rowcount na agad; unbuffered (-1): bibilangin habang nagfe-fetch
+        rows = self._cursor.rowcount
+        self._count_fetched = rows < 0 and self._cursor.description is not None
+        self._stats.record(sql, elapsed, rows if rows > 0 else 0, self._site)
+        return result
+
+    def execute(self, sql, params=()):
+        return self._timed(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, params):
+        return self._timed(self._cursor.executemany, sql, params)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if self._count_fetched and row is not None:
+            self._stats.add_rows(self._sql, 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        if self._count_fetched and rows:
+            self._stats.add_rows(self._sql, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if self._count_fetched and rows:
+            self._stats.add_rows(self._sql, len(rows))
+        return rows
+
+
+class InstrumentedConnection:
+    __slots__ = ("_conn", "_stats", "_site")
+
+    def __init__(self, conn, stats, site):
+        self._conn = conn
+        self._stats = stats
+        self._site = site
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._stats, self._site)
+
+
+query_stats = QueryStats(**query_stats_config)
@@ -0,0 +1,168 @@
+import argparse
+import sys
+import threading
+from decimal import Decimal
+from db.config import db_config
+from db.db_functions import get_database
+
+# daily_sales_summary: isang row per (userId, salesDate, productId)
+UPSERT_SQL = """
+    INSERT INTO daily_sales_summary (userId, salesDate, productId, quantity, totalSales, totalPurchase)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON DUPLICATE KEY UPDATE
+        quantity = quantity + VALUES(quantity),
+        totalSales = totalSales + VALUES(totalSales),
+        totalPurchase = totalPurchase + VALUES(totalPurchase)
+"""
+
+RAW_SQL = """
+    SELECT o.userId, DATE(o.orderDateTime) AS salesDate, od.productId,
+           SUM(od.quantity) AS quantity,
+           SUM(od.totalPrice) AS totalSales,
+           SUM(od.quantity * od.unitCost) AS totalPurchase
+    FROM order_details od
+    JOIN orders o ON od.orderId = o.orderId
+    {where}
+    GROUP BY o.userId, DATE(o.orderDateTime), od.productId
+"""
+
+#data version ng sales per user (at per araw), para malaman ng mga window/cache na may bagong benta
+_versions = {}      # userId -> counter, tumataas sa kahit anong pagbabago
+_resets = {}        # userId -> counter, para sa pagbabagong hindi alam kung anong araw (e.g. rebuild)
+_day_versions = {}  # userId -> {salesDate: counter}
+_epoch = 0  # para sa rebuild ng lahat ng users
+_versions_lock = threading.Lock()
+
+def data_version(user_id):
+    with _versions_lock:
+        return _epoch, _versions.get(user_id, 0)
+
+def range_version(user_id, start_date, end_date):
+    # version ng [start_date, end_date) lang; hindi nagbabago kapag ibang araw yung may benta
+    with _versions_lock:
+        days = _day_versions.get(user_id, {})
+        changes = sum(n for day, n in days.items() if start_date <= day < end_date)
+        return _epoch, _resets.get(user_id, 0), changes
+
+def mark_changed(user_id=None, sales_date=None):
+    # tawagin pagkatapos ng commit (e.g. checkout); None = lahat ng users / lahat ng araw
+    global _epoch
+    with _versions_lock:
+        if user_id is None:
+            _epoch += 1
+            return
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+        if sales_date is None:
+            _resets[user_id] = _resets.get(user_id, 0) + 1
+        else:
+            days = _day_versions.setdefault(user_id, {})
+            days[sales_date] = days.get(sales_date, 0) + 1
+
+def add_sale(cursor, user_id, sales_date, lines):
+    # tinatawag ng checkout sa loob ng transaction niya; lines = (productId, quantity, totalSales, totalPurchase)
+    cursor.executemany(UPSERT_SQL, [
+        (user_id, sales_date, product_id, quantity, total_sales, total_purchase)
+        for product_id, quantity, total_sales, total_purchase in lines
+    ])
+
+def totals_for_range(cursor, user_id, start_date, end_date):
+    # (total purchase, total sales) para sa [start_date, end_date)
+    cursor.execute("""
+        SELECT COALESCE(SUM(totalPurchase), 0), COALESCE(SUM(totalSales), 0)
+        FROM daily_sales_summary
+        WHERE userId = ? AND salesDate >= ? AND salesDate < ?
+    """, (user_id, start_date, end_date))
+    total_purchase, total_sales = cursor.fetchone()
+    return Decimal(total_purchase), Decimal(total_sales)
+
+def daily_totals(cursor, user_id, start_date, end_date):
+    # {salesDate: total sales} para sa [start_date, end_date), para sa heatmap ng calendar
+    cursor.execute("""
+        SELECT salesDate, SUM(totalSales)
+        FROM daily_sales_summary
+        WHERE userId = ? AND salesDate >= ? AND salesDate < ?
+        GROUP BY salesDate
+    """, (user_id, start_date, end_date))
+    return {sales_date: Decimal(total) for sales_date, total in cursor.fetchall()}
+
+def _filters(user_id, column):
+    if user_id is None:
+        return "", ()
+    return f"WHERE {column} = ?", (user_id,)
+
+def rebuild(db, user_id=None):
+    # backfill/rebuild galing sa raw tables, isang transaction para walang half-built na rollup
+    where, params = _filters(user_id, "o.userId")
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            delete_where, delete_params = _filters(user_id, "userId")
+            cursor.execute(f"DELETE FROM daily_sales_summary {delete_where}", delete_params)
+            cursor.execute(
+                "INSERT INTO daily_sales_summary (userId, salesDate, productId, quantity, totalSales, totalPurchase) "
+                + RAW_SQL.format(where=where),
+                params
+            )
+            rows = cursor.rowcount
+        finally:
+            cursor.close()
+    mark_changed(user_id)
+    return rows
+
+def check_consistency(db, user_id=None):
+    """Compare the rollup against the raw tables and return the rows that differ.
+
+    Each mismatch is (userId, salesDate, productId, expected, actual) where
+    expected/actual are (quantity, totalSales, totalPurchase) or None.
+    """
+    where, params = _filters(user_id, "o.userId")
+    with db.cursor() as cursor:
+        cursor.execute(RAW_SQL.format(where=where), params)
+        expected = {row[:3]: tuple(row[3:]) for row in cursor.fetchall()}
+
+        summary_where, summary_params = _filters(user_id, "userId")
+        cursor.execute(
+            "SELECT userId, salesDate, productId, quantity, totalSales, totalPurchase "
+            f"FROM daily_sales_summary {summary_where}",
+            summary_params
+        )
+        actual = {row[:3]: tuple(row[3:]) for row in cursor.fetchall()}
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want = expected.get(key)
+        got = actual.get(key)
+        if _normalize(want) != _normalize(got):
+            mismatches.append((*key, want, got))
+    return mismatches
+
+def _normalize(values):
+    if values is None:
+        return None
+    quantity, total_sales, total_purchase = values
+    # walang laman na row sa rollup = parehong zero
+    if not quantity and not total_sales and not total_purchase:
+        return None
+    return int(quantity), Decimal(total_sales), Decimal(total_purchase)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the daily_sales_summary rollup.")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    db = get_database(db_config)
+    if args.command == "rebuild":
+        rows = rebuild(db, args.user_id)
+        print(f"Rebuilt daily_sales_summary: {rows} rows.")
+        return 0
+
+    mismatches = check_consistency(db, args.user_id)
+    for user_id, sales_date, product_id, expected, actual in mismatches:
+        print(f"user {user_id} {sales_date} product {product_id}: expected {expected}, rollup has {actual}")
+    print(f"{len(mismatches)} mismatched rows.")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
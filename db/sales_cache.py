@@ -0,0 +1,115 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from db.config import sales_cache_config
+
+def estimate_size(result):
+    # tantya ng memory ng isang page (sales_data, totals, total_orders), sa bytes
+    sales_data, totals, _ = result
+    size = sys.getsizeof(sales_data) + sys.getsizeof(totals)
+    for row in sales_data:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return size
+
+
+def is_live(end_date):
+    # range na umaabot hanggang ngayon: may benta pa galing sa ibang terminal (o sa journal flusher
+    # ng ibang process) na hindi makikita sa rollup.range_version ng process na ito
+    return end_date > date.today()
+
+
+# process-wide na LRU ng sales history pages; key = (userId, start, end, page),
+# valid lang kapag pareho pa yung rollup.range_version ng range (at hindi pa lampas sa live_ttl kapag live)
+class SalesCache:
+    def __init__(self, max_entries=256, max_mb=32, live_ttl=30):
+        if max_entries < 1:
+            raise ValueError("Invalid cache size: max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.live_ttl = live_ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (version, result, size, expires_at), pinaka-recent sa dulo
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evicted = 0
+        self._prefetched = 0
+
+    def _drop_locked(self, key):
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    @staticmethod
+    def _valid(entry, version):
+        return entry[0] == version and (entry[3] is None or time.monotonic() < entry[3])
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._valid(entry, version):
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[1]
+                #may bagong benta sa range na ito, o luma na yung page na kasama ngayong araw
+                self._drop_locked(key)
+                self._stale += 1
+            self._misses += 1
+            return None
+
+    def contains(self, key, version):
+        # para sa prefetch: walang epekto sa hit rate at sa LRU order
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and self._valid(entry, version)
+
+    def put(self, key, version, result, prefetched=False):
+        size = estimate_size(result)
+        expires_at = time.monotonic() + self.live_ttl if is_live(key[2]) else None
+        with self._lock:
+            if key in self._entries:
+                self._drop_locked(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (version, result, size, expires_at)
+            self._bytes += size
+            if prefetched:
+                self._prefetched += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop_locked(next(iter(self._entries)))
+                self._evicted += 1
+
+    def invalidate(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                self._drop_locked(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_mb": self._bytes / (1024 * 1024),
+                "max_mb": self.max_bytes / (1024 * 1024),
+                "live_ttl": self.live_ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "stale": self._stale,
+                "evicted": self._evicted,
+                "prefetched": self._prefetched,
+            }
+
+
+sales_cache = SalesCache(**sales_cache_config)
@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import NamedTuple
+from db import rollup
+from db.order_repository import OrderRepository
+from db.product_repository import use_cursor
+
+class SalesTotals(NamedTuple):
+    total_purchase: Decimal
+    total_sales: Decimal
+
+    @property
+    def income(self):
+        return self.total_sales - self.total_purchase
+
+
+class SalesPage(NamedTuple):
+    orders: list       # OrderSummary rows ng page na ito
+    totals: SalesTotals  # para sa buong range, hindi lang sa page
+    total_orders: int
+
+
+# sales history at reports: pages ng orders + totals galing sa daily_sales_summary
+class SalesReportRepository:
+    def __init__(self, db):
+        self.db = db
+        self.orders = OrderRepository(db)
+
+    def totals(self, user_id, start_date, end_date, cursor=None):
+        with use_cursor(self.db, cursor) as cursor:
+            return SalesTotals(*rollup.totals_for_range(cursor, user_id, start_date, end_date))
+
+    def daily_totals(self, user_id, start_date, end_date, cursor=None):
+        # {salesDate: total sales}, para sa heatmap ng calendar
+        with use_cursor(self.db, cursor) as cursor:
+            return rollup.daily_totals(cursor, user_id, start_date, end_date)
+
+    def sales_page(self, user_id, start_date, end_date, page, page_size, cursor=None):
+        """Return one SalesPage of [start_date, end_date) using a single connection."""
+        with use_cursor(self.db, cursor) as cursor:
+            total_orders = self.orders.count_in_range(user_id, start_date, end_date, cursor=cursor)
+            orders = self.orders.summaries_in_range(
+                user_id, start_date, end_date, page_size, page * page_size, cursor=cursor
+            )
+            return SalesPage(orders, self.totals(user_id, start_date, end_date, cursor=cursor), total_orders)
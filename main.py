@@ -1,67 +1,68 @@
-import hashlib
 import sys
-from PyQt6 import uic
+from controls.ui_loader import load_ui
+from controls.profiling import profiled, start_watchdog
 from PyQt6.QtWidgets import QMainWindow, QMessageBox, QLineEdit, QApplication
 from controls.register import RegisterWindow
-from db.db_functions import Database
+from db.db_functions import get_database
+from db.auth import AuthError, get_auth_service
+from controls.busy_task import BusyTask
 from db.config import db_config
 
 class LoginWindow(QMainWindow):
     def __init__(self, db, parent=None):
         super().__init__(parent)
-        uic.loadUi("ui/login.ui", self)
+        load_ui("ui/login.ui", self)
         self.db = db
         self.password.setEchoMode(QLineEdit.EchoMode.Password)
         self.loginBtn.clicked.connect(self.login_user)
         self.showPasswordCheck.stateChanged.connect(self.toggle_password_visibility)
         self.registerBtn.clicked.connect(self.open_register_window)
 
+    @profiled()
     def login_user(self):
         username = self.username.text()
         password = self.password.text()
         if not username or not password:
             QMessageBox.warning(self, "Missing Info", "Please enter both username and password.")
             return
-        try:
-            self.db.connect()
-            user = self.db.execute_query("SELECT userId, name, username, password, gender, accountDateCreated, favoriteFood FROM user WHERE username = %s", (username,))            
-            if not user:
-                QMessageBox.warning(self, "Error", f"Account '{username}' isn't registered.")
-                return
-            db_password = user[0]["password"]
-            
-            if ':' not in db_password:
-                QMessageBox.critical(self, "Error", "Invalid credentials. Please try again.")
-                return
-            encrypted_stored, salt_hex = db_password.split(":")
-            salt = bytes.fromhex(salt_hex)
-            encrypted_input = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 10000).hex()
 
-            #password verification
-            if encrypted_input == encrypted_stored:
-                from controls.dashboard_window import DashboardWindow
-                user_data = {
-                    "userId": user[0]["userId"],
-                    "name": user[0]["name"],
-                    "username": user[0]["username"],
-                    "password": user[0]["password"],
-                    "gender": user[0].get("gender", "N/A"),
-                    "accountDateCreated": user[0].get("accountDateCreated", "N/A"),
-                    "favoriteFood":user[0].get("favoriteFood", "N/A")
-                }
+        #PBKDF2 sa worker pool, hindi na nagfe-freeze yung window habang nagla-login
+        self.loginBtn.setEnabled(False)
+        future = get_auth_service(self.db).submit_login(username, password)
+        self.login_task = BusyTask(self, "Logging in...", future, self.on_login_finished)
 
-                self.dashboard = DashboardWindow(user_data, self.db.config)
-                self.dashboard.on_login_success(user_data)
-                self.dashboard.show()
-                self.close()
+    def on_login_finished(self, user, error):
+        self.loginBtn.setEnabled(True)
+        if isinstance(error, AuthError):
+            QMessageBox.warning(self, "Error", str(error))
+            return
+        if error is not None:
+            QMessageBox.critical(self, "Error", f"An error occurred: {str(error)}")
+            return
+
+        #password verification
+        if user:
+            from controls.shell_window import create_shell
+            user_data = {
+                "userId": user["userId"],
+                "name": user["name"],
+                "username": user["username"],
+                "password": user["password"],
+                "gender": user.get("gender", "N/A"),
+                "accountDateCreated": user.get("accountDateCreated", "N/A"),
+                "favoriteFood":user.get("favoriteFood", "N/A")
+            }
+
+            #isang window na lang (shell) para sa dashboard at lahat ng screens
+            self.dashboard = create_shell(user_data, self.db.config)
+            self.dashboard.show()
+            self.close()
 
-            else:
-                QMessageBox.warning(self, "Error", "Invalid credentials. Please try again.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
+        else:
+            QMessageBox.warning(self, "Error", "Invalid credentials. Please try again.")
 
     def show_dashboard(self, user_data):
-        from controls.dashboard_window import DashboardWindow
+        from controls.shell_window import create_shell
         user_data= {
             "userId": user_data.get("userId", "N/A"),
             "name": user_data["name"],
@@ -71,7 +72,7 @@ class LoginWindow(QMainWindow):
             "accountDateCreated": user_data.get("accountDateCreated", "N/A"),
             "favoriteFood":user_data.get("favoriteFood", "N/A")
         }
-        self.dashboard = DashboardWindow(user_data)
+        self.dashboard = create_shell(user_data, self.db.config)
         self.dashboard.show()
         self.close()
 
@@ -86,9 +87,9 @@ class LoginWindow(QMainWindow):
 if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
     import sys
-    from db.db_functions import Database
     app = QApplication(sys.argv)
-    db = Database(db_config)
+    start_watchdog(app)
+    db = get_database(db_config)
     window = LoginWindow(db)
     window.show()
     sys.exit(app.exec())
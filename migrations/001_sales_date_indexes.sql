@@ -0,0 +1,12 @@
+-- Composite indexes para sa sales history (SalesLoaderThread)
+-- orders(userId, orderDateTime): para sa half-open date range per user
+-- order_details(orderId, productId, quantity, totalPrice): covering para sa join, hindi na babalik sa table
+--
+-- Run on an existing database:
+--   mysql -u root dailysales < migrations/001_sales_date_indexes.sql
+
+CREATE INDEX IF NOT EXISTS `idx_orders_user_datetime`
+  ON `orders` (`userId`, `orderDateTime`);
+
+CREATE INDEX IF NOT EXISTS `idx_order_details_order_product`
+  ON `order_details` (`orderId`, `productId`, `quantity`, `totalPrice`);
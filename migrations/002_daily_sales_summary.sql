@@ -0,0 +1,21 @@
+-- Daily sales rollup (per user, per day, per product) para sa totals ng Sales History.
+-- Ina-update ng checkout sa parehong transaction; i-backfill pagkatapos i-apply:
+--   mysql -u root dailysales < migrations/002_daily_sales_summary.sql
+--   python -m db.rollup rebuild
+
+-- ginagamit na ng sales history yung purchasePrice pero wala pa sa lumang dump
+ALTER TABLE `products`
+  ADD COLUMN IF NOT EXISTS `purchasePrice` decimal(10,2) NOT NULL DEFAULT 0.00 AFTER `price`;
+
+CREATE TABLE IF NOT EXISTS `daily_sales_summary` (
+  `userId` int(11) NOT NULL,
+  `salesDate` date NOT NULL,
+  `productId` int(11) NOT NULL,
+  `quantity` int(11) NOT NULL DEFAULT 0,
+  `totalSales` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `totalPurchase` decimal(14,2) NOT NULL DEFAULT 0.00,
+  PRIMARY KEY (`userId`,`salesDate`,`productId`),
+  KEY `idx_daily_sales_summary_product` (`productId`),
+  CONSTRAINT `daily_sales_summary_ibfk_1` FOREIGN KEY (`userId`) REFERENCES `user` (`userId`) ON DELETE CASCADE,
+  CONSTRAINT `daily_sales_summary_ibfk_2` FOREIGN KEY (`productId`) REFERENCES `products` (`productId`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
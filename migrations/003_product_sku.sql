@@ -0,0 +1,8 @@
+-- Optional na SKU/barcode per product para sa scanner sa Make Order.
+-- Unique per user; pwedeng NULL sa maraming products (walang barcode).
+--   mysql -u root dailysales < migrations/003_product_sku.sql
+
+ALTER TABLE `products`
+  ADD COLUMN IF NOT EXISTS `sku` varchar(64) DEFAULT NULL AFTER `productName`;
+
+CREATE UNIQUE INDEX IF NOT EXISTS `uq_products_user_sku` ON `products` (`userId`, `sku`);
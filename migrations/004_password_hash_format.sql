@@ -0,0 +1,7 @@
+-- Bagong password hash format: pbkdf2_sha256$<iterations>$<salt>$<hash> (~120 chars).
+-- Gumagana pa rin yung lumang "hash:salt"; nire-rehash sa susunod na login.
+--   mysql -u root dailysales < migrations/004_password_hash_format.sql
+
+ALTER TABLE `user`
+  MODIFY `password` varchar(255) NOT NULL,
+  MODIFY `favoriteFood` varchar(255) DEFAULT NULL;
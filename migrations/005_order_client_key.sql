@@ -0,0 +1,8 @@
+-- Idempotency key ng mga benta galing sa lokal na order journal (db/order_journal.py).
+-- Kapag na-commit na pero nag-crash bago ma-mark sa journal, hindi na ito madodoble.
+--   mysql -u root dailysales < migrations/005_order_client_key.sql
+
+ALTER TABLE `orders`
+  ADD COLUMN IF NOT EXISTS `clientOrderKey` char(32) DEFAULT NULL AFTER `orderDateTime`;
+
+CREATE UNIQUE INDEX IF NOT EXISTS `uq_orders_client_key` ON `orders` (`clientOrderKey`);
@@ -0,0 +1,13 @@
+-- Purchase price ng product noong nabenta, para hindi magbago yung lumang cost/profit
+-- kapag binago yung purchasePrice ng product (edit, import). Ito na ang gamit ng rollup rebuild/check.
+--   mysql -u root dailysales < migrations/006_order_detail_unit_cost.sql
+--   python -m db.rollup rebuild
+
+ALTER TABLE `order_details`
+  ADD COLUMN IF NOT EXISTS `unitCost` decimal(10,2) NOT NULL DEFAULT 0.00 AFTER `totalPrice`;
+
+-- lumang benta: wala nang record ng dating cost, kaya yung kasalukuyang purchasePrice na lang
+UPDATE `order_details` od
+JOIN `products` p ON p.productId = od.productId
+SET od.unitCost = p.purchasePrice
+WHERE od.unitCost = 0.00;
@@ -0,0 +1,34 @@
+from openpyxl import Workbook
+from reports.sales_queries import ORDERS_SQL, DETAILS_SQL, range_params, stream_rows
+
+ORDER_HEADERS = ["Order ID", "Product Name", "Quantity", "Total Retail Sales", "Sales Date"]
+DETAIL_HEADERS = ["Order ID", "Order Date/Time", "Product Name", "Quantity", "Total Price"]
+
+def export_sales_excel(db, user_id, start_date, end_date, path, include_details=True,
+                       chunk_size=5000, progress=None):
+    """Stream the sales for [start_date, end_date) into an .xlsx file.
+
+    Uses openpyxl's write-only mode so memory stays flat however many rows
+    there are. progress, if given, is called with the number of rows written.
+    Returns the number of rows written across all sheets.
+    """
+    params = range_params(user_id, start_date, end_date)
+    workbook = Workbook(write_only=True)
+    written = 0
+
+    sheets = [("Orders", ORDER_HEADERS, ORDERS_SQL)]
+    if include_details:
+        sheets.append(("Line Items", DETAIL_HEADERS, DETAILS_SQL))
+
+    for title, headers, query in sheets:
+        sheet = workbook.create_sheet(title)
+        sheet.append(headers)
+        for rows in stream_rows(db, query, params, chunk_size):
+            for row in rows:
+                sheet.append(row)
+            written += len(rows)
+            if progress:
+                progress(written)
+
+    workbook.save(path)
+    return written
@@ -0,0 +1,164 @@
+from decimal import Decimal
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+from db import rollup
+from reports.sales_queries import ORDERS_SQL, range_params, stream_rows
+
+HEADERS = ["Order ID", "Product Name", "Quantity", "Total Retail Sales", "Sales Date"]
+COL_WIDTHS = [60, 213, 80, 90, 80]
+TABLE_WIDTH = sum(COL_WIDTHS)
+MARGIN = 36
+FONT = "Helvetica"
+BOLD_FONT = "Helvetica-Bold"
+FONT_SIZE = 9
+LEADING = 11
+FOOTER_HEIGHT = 30
+MAX_CELL_LINES = 20  # para hindi lumampas sa isang page yung isang row
+
+class SalesPdfReport:
+    """Multi-page sales report drawn row by row with the reportlab canvas.
+
+    Each page repeats the title and column headers and ends with a subtotal
+    of the orders on that page; finish() adds a grand-total summary page.
+    """
+
+    def __init__(self, path, title, subtitle):
+        self.canvas = canvas.Canvas(path, pagesize=A4)
+        self.width, self.height = A4
+        self.title = title
+        self.subtitle = subtitle
+        self.page_number = 0
+        self.page_open = False
+        self.y = 0
+        self.page_total = Decimal("0.00")
+        self.page_rows = 0
+        self.grand_total = Decimal("0.00")
+        self.row_count = 0
+
+    def _draw_title(self):
+        c = self.canvas
+        top = self.height - MARGIN
+        c.setFont(BOLD_FONT, 14)
+        c.drawString(MARGIN, top - 14, self.title)
+        c.setFont(FONT, FONT_SIZE)
+        c.drawString(MARGIN, top - 28, self.subtitle)
+        return top - 40
+
+    def _start_page(self):
+        self.page_number += 1
+        self.page_open = True
+        self.page_total = Decimal("0.00")
+        self.page_rows = 0
+
+        c = self.canvas
+        y = self._draw_title()
+        c.setFont(BOLD_FONT, FONT_SIZE)
+        x = MARGIN
+        for header, width in zip(HEADERS, COL_WIDTHS):
+            c.drawString(x + 2, y - LEADING, header)
+            x += width
+        y -= LEADING + 4
+        c.line(MARGIN, y, MARGIN + TABLE_WIDTH, y)
+        self.y = y - 2
+
+    def _finish_page(self):
+        c = self.canvas
+        footer_y = MARGIN + FOOTER_HEIGHT
+        c.line(MARGIN, footer_y, MARGIN + TABLE_WIDTH, footer_y)
+        c.setFont(BOLD_FONT, FONT_SIZE)
+        c.drawString(MARGIN + 2, footer_y - LEADING, f"Page subtotal ({self.page_rows} orders)")
+        c.drawRightString(MARGIN + sum(COL_WIDTHS[:4]) - 2, footer_y - LEADING, f"{self.page_total:.2f}")
+        c.setFont(FONT, 8)
+        c.drawRightString(MARGIN + TABLE_WIDTH, MARGIN - 12, f"Page {self.page_number}")
+        c.showPage()
+        self.page_open = False
+
+    def add_row(self, order_id, products, quantities, total, sales_date):
+        total = Decimal(total)
+        cells = [str(order_id), products or "", quantities or "", f"{total:.2f}", str(sales_date)]
+        wrapped = []
+        for text, width in zip(cells, COL_WIDTHS):
+            lines = simpleSplit(text, FONT, FONT_SIZE, width - 4) or [""]
+            if len(lines) > MAX_CELL_LINES:
+                lines = lines[:MAX_CELL_LINES - 1] + [lines[MAX_CELL_LINES - 1] + " ..."]
+            wrapped.append(lines)
+        row_height = max(len(lines) for lines in wrapped) * LEADING + 3
+
+        if not self.page_open:
+            self._start_page()
+        elif self.y - row_height < MARGIN + FOOTER_HEIGHT:
+            self._finish_page()
+            self._start_page()
+
+        c = self.canvas
+        c.setFont(FONT, FONT_SIZE)
+        x = MARGIN
+        for column, (lines, width) in enumerate(zip(wrapped, COL_WIDTHS)):
+            line_y = self.y - LEADING + 2
+            for line in lines:
+                if column == 3:
+                    c.drawRightString(x + width - 2, line_y, line)
+                else:
+                    c.drawString(x + 2, line_y, line)
+                line_y -= LEADING
+            x += width
+        self.y -= row_height
+
+        self.page_total += total
+        self.page_rows += 1
+        self.grand_total += total
+        self.row_count += 1
+
+    def finish(self, total_purchase=None):
+        if self.page_open:
+            self._finish_page()
+
+        #grand total summary sa huling page
+        self.page_number += 1
+        c = self.canvas
+        y = self._draw_title() - 10
+        lines = [
+            ("Orders", str(self.row_count)),
+            ("Total Sales", f"{self.grand_total:.2f}"),
+        ]
+        if total_purchase is not None:
+            lines += [
+                ("Total Purchase", f"{total_purchase:.2f}"),
+                ("Total Income", f"{(self.grand_total - total_purchase):.2f}"),
+            ]
+        c.setFont(BOLD_FONT, 12)
+        c.drawString(MARGIN, y, "Summary")
+        y -= 20
+        for label, value in lines:
+            c.setFont(FONT, 11)
+            c.drawString(MARGIN, y, label)
+            c.drawRightString(MARGIN + 250, y, value)
+            y -= 16
+        c.setFont(FONT, 8)
+        c.drawRightString(MARGIN + TABLE_WIDTH, MARGIN - 12, f"Page {self.page_number}")
+        c.showPage()
+        c.save()
+
+
+def export_sales_pdf(db, user_id, start_date, end_date, path, title="Sales History",
+                     chunk_size=2000, progress=None):
+    """Stream the orders for [start_date, end_date) from the database into a PDF.
+
+    Returns the number of orders written. progress, if given, is called with
+    the running count after each chunk.
+    """
+    last_day = end_date.fromordinal(end_date.toordinal() - 1)
+    subtitle = str(start_date) if last_day == start_date else f"{start_date} to {last_day}"
+    report = SalesPdfReport(path, title, subtitle)
+
+    for rows in stream_rows(db, ORDERS_SQL, range_params(user_id, start_date, end_date), chunk_size):
+        for row in rows:
+            report.add_row(*row)
+        if progress:
+            progress(report.row_count)
+
+    with db.cursor() as cursor:
+        total_purchase, _ = rollup.totals_for_range(cursor, user_id, start_date, end_date)
+    report.finish(total_purchase)
+    return report.row_count
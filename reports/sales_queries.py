@@ -0,0 +1,38 @@
+from datetime import datetime, time
+
+# mga query na ginagamit ng Excel at PDF exports; parehong [start, end) range ng sales history
+ORDERS_SQL = """
+    SELECT o.orderId,
+           GROUP_CONCAT(p.productName ORDER BY od.orderDetailId SEPARATOR ', '),
+           GROUP_CONCAT(od.quantity ORDER BY od.orderDetailId SEPARATOR ', '),
+           SUM(od.totalPrice),
+           DATE(o.orderDateTime)
+    FROM orders o
+    JOIN order_details od ON od.orderId = o.orderId
+    JOIN products p ON od.productId = p.productId
+    WHERE o.userId = ? AND o.orderDateTime >= ? AND o.orderDateTime < ?
+    GROUP BY o.orderId, o.orderDateTime
+    ORDER BY o.orderDateTime, o.orderId
+"""
+
+DETAILS_SQL = """
+    SELECT o.orderId, o.orderDateTime, p.productName, od.quantity, od.totalPrice
+    FROM orders o
+    JOIN order_details od ON od.orderId = o.orderId
+    JOIN products p ON od.productId = p.productId
+    WHERE o.userId = ? AND o.orderDateTime >= ? AND o.orderDateTime < ?
+    ORDER BY o.orderDateTime, o.orderId, od.orderDetailId
+"""
+
+def range_params(user_id, start_date, end_date):
+    return user_id, datetime.combine(start_date, time.min), datetime.combine(end_date, time.min)
+
+def stream_rows(db, query, params, chunk_size):
+    # unbuffered cursor: server-side streaming, chunk_size rows lang yung nasa memory
+    with db.cursor(buffered=False) as cursor:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows